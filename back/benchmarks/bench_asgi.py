@@ -0,0 +1,103 @@
+"""
+Compares the sync endpoints served by a pool of WSGI workers with the async endpoints served
+by one ASGI event loop, with many clients that wait between their moves.
+
+A sync worker is held by a client for as long as its connection is open, so with WSGI the
+clients are served `--wsgi-workers` at a time. With ASGI a waiting client only costs a
+coroutine, and the moves run in the MINESWEEPER_ASYNC_WORKERS pool.
+
+Both sides run in this process through the Django test clients, so the numbers leave out the
+HTTP servers. Run from the back/ directory:
+    python -m benchmarks.bench_asgi
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'minesweeper.settings')
+
+
+def setup_database():
+    from django.conf import settings
+    settings.DATABASES['default']['NAME'] = os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+    settings.ALLOWED_HOSTS = ['*']
+    django.setup()
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+def create_games(clients, moves_per_client):
+    from game.minesweeper import MinesweeperGame
+    from game.models import Game
+    return [
+        Game.objects.create_from_minesweeper_game(MinesweeperGame.new_game(moves_per_client, 1, 1, seed=1)).id
+        for _ in range(clients)
+    ]
+
+
+def flag_data(x_position):
+    return {'x_position': x_position, 'y_position': 0, 'is_flagged': True}
+
+
+def run_wsgi(game_ids, moves_per_client, think_time, workers):
+    from django.db import connection
+    from django.test import Client
+
+    def play(game_id):
+        client = Client()
+        for x_position in range(moves_per_client):
+            time.sleep(think_time)
+            client.post(f'/api/minesweeper/{game_id}/flag_cell/', flag_data(x_position),
+                        content_type='application/json')
+        connection.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(play, game_ids))
+    return time.perf_counter() - start
+
+
+def run_asgi(game_ids, moves_per_client, think_time):
+    from django.test import AsyncClient
+
+    async def play(game_id):
+        client = AsyncClient()
+        for x_position in range(moves_per_client):
+            await asyncio.sleep(think_time)
+            await client.post(f'/api/async/minesweeper/{game_id}/flag_cell/', flag_data(x_position),
+                              content_type='application/json')
+
+    async def play_all():
+        await asyncio.gather(*(play(game_id) for game_id in game_ids))
+
+    start = time.perf_counter()
+    asyncio.run(play_all())
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--clients', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--moves-per-client', type=int, default=5)
+    parser.add_argument('--think-time', type=float, default=0.2, help='seconds a client waits before each move')
+    parser.add_argument('--wsgi-workers', type=int, default=8)
+    args = parser.parse_args()
+
+    setup_database()
+
+    print(f"{'clients':>8} {'wsgi s':>8} {'wsgi moves/s':>13} {'asgi s':>8} {'asgi moves/s':>13}")
+    for clients in args.clients:
+        moves = clients * args.moves_per_client
+        wsgi = run_wsgi(create_games(clients, args.moves_per_client), args.moves_per_client, args.think_time,
+                        args.wsgi_workers)
+        asgi = run_asgi(create_games(clients, args.moves_per_client), args.moves_per_client, args.think_time)
+        print(f"{clients:>8} {wsgi:>8.2f} {moves / wsgi:>13.1f} {asgi:>8.2f} {moves / asgi:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Compares memory use and construction time of the packed board against
+the previous board made of one object per cell linked to its neighbours.
+
+Run from the back/ directory:
+    python -m benchmarks.bench_board_memory
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from game.minesweeper import MinesweeperGame
+
+
+class LegacyCell:
+    def __init__(self, x_position, y_position):
+        self.x_position = x_position
+        self.y_position = y_position
+        self.has_mine = False
+        self.is_revealed = False
+        self.is_flagged = False
+        self.adjacent_cells = []
+
+
+def build_legacy_board(columns, rows, mines):
+    board = [[LegacyCell(x_position, y_position) for y_position in range(rows)] for x_position in range(columns)]
+    for index in range(mines):
+        x_position, y_position = divmod(index * 7919 % (columns * rows), rows)
+        board[x_position][y_position].has_mine = True
+    for x_position in range(columns):
+        for y_position in range(rows):
+            board[x_position][y_position].adjacent_cells = {
+                board[x][y]
+                for x in range(max(x_position - 1, 0), min(x_position + 2, columns))
+                for y in range(max(y_position - 1, 0), min(y_position + 2, rows))
+                if (x, y) != (x_position, y_position)
+            }
+    return board
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 300, 1000])
+    parser.add_argument('--mine-density', type=float, default=0.15)
+    args = parser.parse_args()
+
+    print(f"{'board':>10} {'backend':>8} {'seconds':>10} {'peak MB':>10}")
+    for size in args.sizes:
+        mines = int(size * size * args.mine_density)
+        for name, build in [('legacy', lambda: build_legacy_board(size, size, mines)),
+                            ('packed', lambda: MinesweeperGame.new_game(size, size, mines))]:
+            elapsed, peak = measure(build)
+            print(f"{f'{size}x{size}':>10} {name:>8} {elapsed:>10.3f} {peak / 2 ** 20:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Measures move throughput when several threads play on the same game at once,
+and how many moves had to be made again because another thread saved first.
+
+Run from the back/ directory:
+    python -m benchmarks.bench_concurrent_moves
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'minesweeper.settings')
+
+
+def setup_database():
+    from django.conf import settings
+    settings.DATABASES['default']['NAME'] = os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+    settings.ALLOWED_HOSTS = ['*']
+    django.setup()
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+def run(threads, moves_per_thread):
+    from django.db import connection
+    from rest_framework.test import APIClient
+
+    from game import models
+    from game.minesweeper import MinesweeperGame
+    from game.models import Game
+
+    game = Game.objects.create_from_minesweeper_game(
+        MinesweeperGame.new_game(threads, moves_per_thread, 1, seed=1))
+    conflicts = []
+    original_update = Game.update_from_minesweeper_game
+
+    def counting_update(self, minesweeper_game):
+        try:
+            return original_update(self, minesweeper_game)
+        except models.GameVersionConflict:
+            conflicts.append(1)
+            raise
+
+    def play(x_position):
+        client = APIClient()
+        for y_position in range(moves_per_thread):
+            client.post(f'/api/minesweeper/{game.id}/flag_cell/?response=changes',
+                        data={'x_position': x_position, 'y_position': y_position, 'is_flagged': True},
+                        format='json')
+        connection.close()
+
+    Game.update_from_minesweeper_game = counting_update
+    workers = [threading.Thread(target=play, args=(x_position,)) for x_position in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    Game.update_from_minesweeper_game = original_update
+
+    game.refresh_from_db()
+    return game.version, elapsed, len(conflicts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--moves-per-thread', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_database()
+    from django.conf import settings
+    settings.MINESWEEPER_MOVE_RETRIES = 1000
+
+    print(f"{'threads':>8} {'moves':>8} {'moves/s':>10} {'retries':>8}")
+    for threads in args.threads:
+        saved_moves, elapsed, retries = run(threads, args.moves_per_thread)
+        print(f"{threads:>8} {saved_moves:>8} {saved_moves / elapsed:>10.1f} {retries:>8}")
+
+
+if __name__ == '__main__':
+    main()
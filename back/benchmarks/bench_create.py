@@ -0,0 +1,36 @@
+"""
+Measures how long it takes to create a new game and encode it for storage.
+
+Run from the back/ directory:
+    python -m benchmarks.bench_create
+"""
+import argparse
+import time
+
+from game.board_encoding import encode_board
+from game.minesweeper import MinesweeperGame
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 500, 1000, 2000])
+    parser.add_argument('--mine-density', type=float, default=0.15)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'board':>10} {'new_game ms':>12} {'encode ms':>10}")
+    for size in args.sizes:
+        mines = int(size * size * args.mine_density)
+        create_time = encode_time = 0
+        for seed in range(args.repeat):
+            start = time.perf_counter()
+            game = MinesweeperGame.new_game(size, size, mines, seed=seed)
+            created = time.perf_counter()
+            encode_board(game.cells, 'zlib')
+            create_time += created - start
+            encode_time += time.perf_counter() - created
+        print(f"{f'{size}x{size}':>10} {create_time / args.repeat * 1000:>12.1f} {encode_time / args.repeat * 1000:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Times a single reveal that opens a big blank area of the board.
+
+Run from the back/ directory:
+    python -m benchmarks.bench_reveal [--engine numpy]
+"""
+import argparse
+import random
+import time
+
+from game.minesweeper import MinesweeperCell, MinesweeperGame
+
+
+def get_engine(name):
+    if name == 'numpy':
+        from game.numpy_engine import NumpyMinesweeperGame
+        return NumpyMinesweeperGame
+    return MinesweeperGame
+
+
+def build_game(engine, size, mines, seed):
+    board = [[MinesweeperCell(x_position, y_position) for y_position in range(size)] for x_position in range(size)]
+    rng = random.Random(seed)
+    for _ in range(mines):
+        board[rng.randrange(size)][rng.randrange(size)].add_mine()
+    return engine.from_board(board)
+
+
+def blank_cell(game):
+    for x_position in range(game.columns):
+        for y_position in range(game.rows):
+            cell = game.get_cell(x_position, y_position)
+            if not cell.has_mine and cell._adjacents_mine_count == 0:
+                return x_position, y_position
+    raise ValueError('The board has no blank cells')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 250, 500])
+    parser.add_argument('--mine-density', type=float, default=0.01)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--engine', choices=['reference', 'numpy'], default='reference')
+    args = parser.parse_args()
+
+    engine = get_engine(args.engine)
+    print(f"{'board':>10} {'revealed':>10} {'seconds':>10}")
+    for size in args.sizes:
+        game = build_game(engine, size, int(size * size * args.mine_density), args.seed)
+        x_position, y_position = blank_cell(game)
+        start = time.perf_counter()
+        game.reveal_cell_position(x_position, y_position)
+        elapsed = time.perf_counter() - start
+        print(f"{f'{size}x{size}':>10} {len(game.changed_positions):>10} {elapsed:>10.4f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""
+Measures how many cells per second each board serialization path handles.
+
+Run from the back/ directory:
+    python -m benchmarks.bench_serialization
+"""
+import argparse
+import time
+
+from game.minesweeper import MinesweeperGame
+
+
+def throughput(function, cells, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    elapsed = time.perf_counter() - start
+    return cells * repeat / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 200, 500])
+    parser.add_argument('--mine-density', type=float, default=0.15)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'board':>10} {'serialization':>24} {'cells/s':>12}")
+    for size in args.sizes:
+        game = MinesweeperGame.new_game(size, size, int(size * size * args.mine_density))
+        paths = [
+            ('count adjacent mines', game._count_adjacent_mines),
+            ('visible_board', lambda: game.visible_board),
+            ('get_board_as_json', game.get_board_as_json),
+        ]
+        for name, function in paths:
+            cells_per_second = throughput(function, size * size, args.repeat)
+            print(f"{f'{size}x{size}':>10} {name:>24} {cells_per_second:>12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
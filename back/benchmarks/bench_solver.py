@@ -0,0 +1,78 @@
+"""
+Plays games following the hints of game.solver and measures the time of each hint,
+on expert boards and on 500x500 boards, with a time budget per hint.
+
+Every safe cell and mine of a hint is played before asking for the next one, and the best guess
+is revealed when the hint has none. Games on big boards stop after --max-hints hints.
+
+Run from the back/ directory:
+    python -m benchmarks.bench_solver
+"""
+import argparse
+import statistics
+import time
+
+from game.minesweeper import MinesweeperGame, REVEALED
+from game.solver import solve_game
+
+BOARDS = {
+    'expert': (30, 16, 99),
+    '500x500': (500, 500, 37_500),
+}
+
+
+def play(columns, rows, mines, seed, time_budget, max_hints):
+    """
+    Returns whether the game was won, the seconds taken by each hint and how many hints were incomplete
+    """
+    game = MinesweeperGame.new_lazy_game(columns, rows, mines, seed=seed)
+    timings = []
+    incomplete = 0
+    while not game.is_over and len(timings) < max_hints:
+        start = time.perf_counter()
+        hint = solve_game(game, time_budget)
+        timings.append(time.perf_counter() - start)
+        incomplete += not hint.complete
+        for x_position, y_position in hint.mines:
+            game.set_flag_on_cell_position(x_position, y_position, True)
+        if hint.mines and not hint.safe_cells:
+            continue
+        for x_position, y_position in hint.safe_cells or [hint.best_guess[0]]:
+            if game.is_over:
+                break
+            if not game.cells[x_position * rows + y_position] & REVEALED:
+                game.reveal_cell_position(x_position, y_position)
+    return game.was_won, timings, incomplete
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--boards', nargs='+', choices=BOARDS, default=list(BOARDS))
+    parser.add_argument('--games', type=int, default=20)
+    parser.add_argument('--time-budget', type=float, default=1.0, help='seconds per hint')
+    parser.add_argument('--max-hints', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'board':>10} {'games':>6} {'won':>5} {'hints':>7} {'incomplete':>11} "
+          f"{'mean ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for name in args.boards:
+        columns, rows, mines = BOARDS[name]
+        games = args.games if name == 'expert' else max(args.games // 10, 1)
+        won = 0
+        incomplete = 0
+        timings = []
+        for seed in range(args.seed, args.seed + games):
+            game_won, game_timings, game_incomplete = play(columns, rows, mines, seed, args.time_budget,
+                                                           args.max_hints)
+            won += game_won
+            incomplete += game_incomplete
+            timings.extend(game_timings)
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95)]
+        print(f"{name:>10} {games:>6} {won:>5} {len(timings):>7} {incomplete:>11} "
+              f"{statistics.mean(timings) * 1000:>9.2f} {p95 * 1000:>9.2f} {timings[-1] * 1000:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
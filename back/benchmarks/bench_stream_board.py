@@ -0,0 +1,82 @@
+"""
+Compares rendering a stored game with GameSerializer against streaming it column by column:
+time to the first bytes, total time and peak memory traced while rendering.
+
+Run from the back/ directory:
+    python -m benchmarks.bench_stream_board
+"""
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'minesweeper.settings')
+
+
+def setup_database():
+    from django.conf import settings
+    settings.DATABASES['default']['NAME'] = os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+    django.setup()
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+def render_whole(game):
+    from rest_framework.renderers import JSONRenderer
+    from game.serializers import GameSerializer
+    yield JSONRenderer().render(GameSerializer(game).data)
+
+
+def render_streamed(game):
+    from game.streaming import stream_game_json
+    for chunk in stream_game_json(game):
+        yield chunk.encode()
+
+
+def measure(render, game_id):
+    from game.cache import game_cache
+    from game.models import Game
+
+    game_cache.clear()
+    game = Game.objects.defer('board').get(id=game_id)
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    chunks = render(game)
+    size = len(next(chunks))
+    first_bytes = time.perf_counter() - start
+    for chunk in chunks:
+        size += len(chunk)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first_bytes, elapsed, peak, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[300, 1000, 2000])
+    parser.add_argument('--mine-density', type=float, default=0.15)
+    args = parser.parse_args()
+
+    setup_database()
+    from game.minesweeper import MinesweeperGame
+    from game.models import Game
+
+    print(f"{'board':>10} {'render':>9} {'first s':>9} {'total s':>9} {'peak MB':>9} {'JSON MB':>9}")
+    for size in args.sizes:
+        minesweeper_game = MinesweeperGame.new_game(size, size, int(size * size * args.mine_density), seed=1)
+        game_id = Game.objects.create_from_minesweeper_game(minesweeper_game).id
+        del minesweeper_game
+        for name, render in [('whole', render_whole), ('streamed', render_streamed)]:
+            first_bytes, elapsed, peak, json_size = measure(render, game_id)
+            print(f"{f'{size}x{size}':>10} {name:>9} {first_bytes:>9.3f} {elapsed:>9.3f} "
+                  f"{peak / 2 ** 20:>9.1f} {json_size / 2 ** 20:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Measures the time and the memory allocated to build the visible board of a game
+with half of its cells revealed.
+
+Run from the back/ directory:
+    python -m benchmarks.bench_visible_board
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from game.minesweeper import MinesweeperGame, REVEALED, MINE
+
+
+def build_game(size, mine_density, seed):
+    game = MinesweeperGame.new_game(size, size, int(size * size * mine_density), seed=seed)
+    for index in range(0, len(game.cells), 2):
+        if not game.cells[index] & MINE:
+            game.cells[index] |= REVEALED
+    return game
+
+
+def measure(game):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    visible_board = game.visible_board
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del visible_board
+    return elapsed, current, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 300, 1000])
+    parser.add_argument('--mine-density', type=float, default=0.15)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'board':>10} {'seconds':>10} {'kept MB':>10} {'peak MB':>10}")
+    for size in args.sizes:
+        elapsed, current, peak = measure(build_game(size, args.mine_density, args.seed))
+        print(f"{f'{size}x{size}':>10} {elapsed:>10.3f} {current / 2 ** 20:>10.1f} {peak / 2 ** 20:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,20 @@
+"""
+pytest-benchmark suite of the engine, of the persistence of the games and of the API endpoints.
+
+It is not part of the test suite (pytest.ini only collects game/), run it from the back/ directory
+with pytest-benchmark installed. Save a baseline, then compare later runs with it, failing when
+a benchmark got slower than the given threshold:
+    python -m pytest benchmarks --benchmark-save=baseline
+    python -m pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:10%
+
+Runs are saved as JSON files under .benchmarks/. --benchmark-compare takes the last saved run,
+or the one whose number or name is given, e.g. --benchmark-compare=0001.
+"""
+import pytest
+
+from benchmarks.games import SIZES
+
+
+@pytest.fixture(params=SIZES, ids=lambda size: f'{size}x{size}')
+def size(request):
+    return request.param
@@ -0,0 +1,25 @@
+"""
+Games benchmarked by the pytest-benchmark suite
+"""
+from game.minesweeper import MINE
+from game.models import get_minesweeper_engine
+
+SIZES = [10, 100, 300]
+MINE_DENSITY = 0.15
+
+
+def new_game(size, seed=0):
+    """
+    Game of the MINESWEEPER_ENGINE on a size x size board
+    """
+    return get_minesweeper_engine().new_game(size, size, int(size * size * MINE_DENSITY), seed=seed)
+
+
+def find_cell(minesweeper_game, cascades):
+    """
+    Position of a cell without a mine that opens a blank area when revealed, or that only reveals itself
+    """
+    for index, adjacent_mines in enumerate(minesweeper_game.adjacent_mine_counts):
+        if not minesweeper_game.cells[index] & MINE and (adjacent_mines == 0) == cascades:
+            return divmod(index, minesweeper_game.rows)
+    raise ValueError('The board has no such cell')
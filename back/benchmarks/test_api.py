@@ -0,0 +1,38 @@
+import pytest
+from rest_framework.test import APIClient
+
+from benchmarks.games import new_game, find_cell
+from game.models import Game
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('response_mode', ['game', 'changes'])
+def test_reveal_cell(benchmark, size, response_mode):
+    client = APIClient()
+    x_position, y_position = find_cell(new_game(size), cascades=True)
+
+    def setup():
+        game = Game.objects.create_from_minesweeper_game(new_game(size))
+        return (f'/api/minesweeper/{game.id}/reveal_cell/?response={response_mode}',), {}
+
+    def reveal(url):
+        response = client.post(url, {'x_position': x_position, 'y_position': y_position}, format='json')
+        assert response.status_code == 200
+
+    benchmark.pedantic(reveal, setup=setup, rounds=10)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('response_mode', ['game', 'changes'])
+def test_flag_cell(benchmark, size, response_mode):
+    client = APIClient()
+    game = Game.objects.create_from_minesweeper_game(new_game(size))
+    url = f'/api/minesweeper/{game.id}/flag_cell/?response={response_mode}'
+    is_flagged = [False]
+
+    def flag():
+        is_flagged[0] = not is_flagged[0]
+        response = client.post(url, {'x_position': 0, 'y_position': 0, 'is_flagged': is_flagged[0]}, format='json')
+        assert response.status_code == 200
+
+    benchmark(flag)
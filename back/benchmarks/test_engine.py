@@ -0,0 +1,30 @@
+import pytest
+
+from benchmarks.games import MINE_DENSITY, new_game, find_cell
+from game.models import get_minesweeper_engine
+
+
+def test_new_game(benchmark, size):
+    benchmark(get_minesweeper_engine().new_game, size, size, int(size * size * MINE_DENSITY), seed=0)
+
+
+def test_from_board(benchmark, size):
+    board = new_game(size).board
+    benchmark(get_minesweeper_engine().from_board, board)
+
+
+@pytest.mark.parametrize('cascades', [False, True], ids=['single', 'cascading'])
+def test_reveal_cell_position(benchmark, size, cascades):
+    x_position, y_position = find_cell(new_game(size), cascades)
+
+    def setup():
+        return (new_game(size), x_position, y_position), {}
+
+    def reveal(minesweeper_game, x_position, y_position):
+        minesweeper_game.reveal_cell_position(x_position, y_position)
+
+    benchmark.pedantic(reveal, setup=setup, rounds=20)
+
+
+def test_get_board_as_json(benchmark, size):
+    benchmark(new_game(size).get_board_as_json)
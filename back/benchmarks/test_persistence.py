@@ -0,0 +1,41 @@
+import pytest
+
+from benchmarks.games import new_game
+from game.minesweeper import FLAGGED
+from game.models import Game
+
+
+@pytest.mark.django_db
+def test_to_minesweeper_game(benchmark, size):
+    game = Game.objects.create_from_minesweeper_game(new_game(size))
+    benchmark(game.to_minesweeper_game)
+
+
+@pytest.mark.django_db
+def test_update_from_minesweeper_game(benchmark, size):
+    """
+    Saves one flag put or taken away, as a move
+    """
+    game = Game.objects.create_from_minesweeper_game(new_game(size))
+    minesweeper_game = game.to_minesweeper_game()
+
+    def toggle_flag_and_save():
+        minesweeper_game.set_flag_on_cell_position(0, 0, not minesweeper_game.cells[0] & FLAGGED)
+        game.update_from_minesweeper_game(minesweeper_game)
+
+    benchmark(toggle_flag_and_save)
+
+
+@pytest.mark.django_db
+def test_round_trip(benchmark, size):
+    """
+    Loads the game from the database, puts or takes away a flag and saves it
+    """
+    game = Game.objects.create_from_minesweeper_game(new_game(size))
+
+    def round_trip():
+        minesweeper_game = game.to_minesweeper_game()
+        minesweeper_game.set_flag_on_cell_position(0, 0, not minesweeper_game.cells[0] & FLAGGED)
+        game.update_from_minesweeper_game(minesweeper_game)
+
+    benchmark(round_trip)
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class GameConfig(AppConfig):
     name = 'game'
+
+    def ready(self):
+        # Connects the receiver that publishes the changes of each saved move
+        from game import pubsub  # noqa: F401
@@ -0,0 +1,124 @@
+"""
+Async versions of the create, retrieve, reveal and flag endpoints, for when the project is served with ASGI.
+
+Django 3.1 has no async ORM, so the queries, the moves and the serialization of each request run in a
+bounded pool of MINESWEEPER_ASYNC_WORKERS threads. The event loop only parses requests and waits, so
+idle and slow clients do not hold a worker while a flood fill of another game runs.
+"""
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import Http404, JsonResponse
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+
+from game.minesweeper import MinesweeperException
+from game.models import Game, GameVersionConflict
+from game.serializers import GameSerializer, MoveSerializer, NoBoardReady
+from game.views import Conflict, apply_move
+
+_executor = ThreadPoolExecutor(max_workers=settings.MINESWEEPER_ASYNC_WORKERS,
+                               thread_name_prefix='minesweeper-async')
+
+
+async def run_in_worker(function, *args):
+    """
+    Runs function in the worker pool, closing the database connections of the worker
+    thread that can not be used anymore, as Django does around each sync request
+    """
+    def job():
+        close_old_connections()
+        try:
+            return function(*args)
+        finally:
+            close_old_connections()
+
+    return await asyncio.get_running_loop().run_in_executor(_executor, job)
+
+
+def async_api_view(*methods):
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                return JsonResponse({'detail': f'Method "{request.method}" not allowed.'},
+                                    status=status.HTTP_405_METHOD_NOT_ALLOWED)
+            try:
+                data = json.loads(request.body) if request.body else {}
+            except ValueError as e:
+                return JsonResponse({'detail': f'JSON parse error - {e}'}, status=status.HTTP_400_BAD_REQUEST)
+            if not isinstance(data, dict):
+                return JsonResponse({'detail': 'Expected a JSON object.'}, status=status.HTTP_400_BAD_REQUEST)
+            try:
+                return await view(request, data, *args, **kwargs)
+            except Http404:
+                return JsonResponse({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+            except ValidationError as e:
+                return JsonResponse(e.detail, status=status.HTTP_400_BAD_REQUEST, safe=False)
+            except GameVersionConflict:
+                return JsonResponse({'detail': Conflict.default_detail}, status=Conflict.status_code)
+            except NoBoardReady as e:
+                return JsonResponse({'detail': e.detail}, status=e.status_code)
+
+        # The csrf_exempt decorator of Django 3.1 would turn the view into a sync one
+        wrapper.csrf_exempt = True
+        return wrapper
+    return decorator
+
+
+def _get_game(game_id):
+    try:
+        return Game.objects.defer('board').get(id=game_id)
+    except Game.DoesNotExist:
+        raise Http404
+
+
+def _create_game(data):
+    serializer = GameSerializer(data=data)
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+    return serializer.data
+
+
+def _retrieve_game(game_id):
+    return GameSerializer(_get_game(game_id)).data
+
+
+def _make_move(game_id, move_data):
+    move_serializer = MoveSerializer(data=move_data)
+    move_serializer.is_valid(raise_exception=True)
+    move = move_serializer.validated_data
+    instance = _get_game(game_id)
+
+    def make_move(minesweeper_game):
+        try:
+            apply_move(minesweeper_game, move)
+        except (MinesweeperException, IndexError) as e:
+            raise ValidationError(e)
+
+    instance.make_move(make_move, settings.MINESWEEPER_MOVE_RETRIES)
+    return GameSerializer(instance).data
+
+
+@async_api_view('POST')
+async def games(request, data):
+    return JsonResponse(await run_in_worker(_create_game, data), status=status.HTTP_201_CREATED)
+
+
+@async_api_view('GET')
+async def game_detail(request, data, pk):
+    return JsonResponse(await run_in_worker(_retrieve_game, pk))
+
+
+@async_api_view('POST')
+async def reveal_cell(request, data, pk):
+    return JsonResponse(await run_in_worker(_make_move, pk, dict(data, type=MoveSerializer.REVEAL)))
+
+
+@async_api_view('POST')
+async def flag_cell(request, data, pk):
+    return JsonResponse(await run_in_worker(_make_move, pk, dict(data, type=MoveSerializer.FLAG)))
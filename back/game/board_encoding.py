@@ -0,0 +1,112 @@
+"""
+Binary encoding of the board cells stored in Game.board.
+
+The encoded board is:
+    byte 0: format version
+    byte 1: compression (NO_COMPRESSION, ZLIB or LZ4)
+    rest:   the mines, revealed and flagged bitmaps, one bit per cell in the same
+            column by column order as MinesweeperGame.cells, possibly compressed
+"""
+import struct
+import zlib
+
+try:
+    import lz4.frame
+except ImportError:  # lz4 is optional, boards are stored with zlib or without compression then
+    lz4 = None
+
+from game.minesweeper import MINE, REVEALED, FLAGGED
+
+FORMAT_VERSION = 1
+
+NO_COMPRESSION = 0
+ZLIB = 1
+LZ4 = 2
+
+COMPRESSIONS = {None: NO_COMPRESSION, 'zlib': ZLIB, 'lz4': LZ4}
+
+# Moves the lowest bit of each of 8 bytes into a single byte, byte n becoming bit n
+_GATHER_BITS = 0x0102040810204080
+_BIT_TABLES = {bit: bytes(1 if cell & bit else 0 for cell in range(256)) for bit in (MINE, REVEALED, FLAGGED)}
+_SPREAD_BITS = [bytes((byte >> bit) & 1 for bit in range(8)) for byte in range(256)]
+
+
+class BoardEncodingException(Exception):
+    pass
+
+
+def encode_board(cells, compression=None):
+    if compression not in COMPRESSIONS:
+        raise BoardEncodingException(f"Unknown board compression {compression}")
+    payload = b''.join(_pack_plane(cells.translate(_BIT_TABLES[bit])) for bit in (MINE, REVEALED, FLAGGED))
+    compression_id = COMPRESSIONS[compression]
+    if compression_id == ZLIB:
+        payload = zlib.compress(payload, 1)
+    elif compression_id == LZ4:
+        if lz4 is None:
+            raise BoardEncodingException("lz4 compression needs the lz4 package installed")
+        payload = lz4.frame.compress(payload)
+    return bytes([FORMAT_VERSION, compression_id]) + payload
+
+
+def decode_board(data, size):
+    """
+    Returns the cells bytearray of a board with `size` cells
+    """
+    return decode_board_range(data, size, 0, size)
+
+
+def decode_board_range(data, size, start, stop):
+    """
+    Returns the cells from start to stop of a board with `size` cells, only unpacking that part of the bitmaps
+    """
+    payload = _get_payload(data)
+    plane_size = (size + 7) // 8
+    first_byte = start // 8
+    last_byte = (stop + 7) // 8
+    offset = start - first_byte * 8
+    mines, revealed, flagged = (
+        int.from_bytes(
+            _unpack_plane(payload[plane_start + first_byte:plane_start + last_byte])[offset:offset + stop - start],
+            'little'
+        )
+        for plane_start in range(0, 3 * plane_size, plane_size)
+    )
+    # Each plane has a 0 or 1 byte per cell, so adding them up never carries into the next cell
+    return bytearray((mines * MINE + revealed * REVEALED + flagged * FLAGGED).to_bytes(stop - start, 'little'))
+
+
+def decompress_board(data):
+    """
+    Returns the encoded board without compression, so that many ranges of it can be decoded
+    without decompressing the whole board for each of them
+    """
+    return bytes([FORMAT_VERSION, NO_COMPRESSION]) + _get_payload(data)
+
+
+def _get_payload(data):
+    data = memoryview(data)
+    if data[0] != FORMAT_VERSION:
+        raise BoardEncodingException(f"Unknown board format version {data[0]}")
+    payload = data[2:]
+    if data[1] == ZLIB:
+        payload = zlib.decompress(payload)
+    elif data[1] == LZ4:
+        if lz4 is None:
+            raise BoardEncodingException("lz4 compressed boards need the lz4 package installed")
+        payload = lz4.frame.decompress(payload)
+    elif data[1] != NO_COMPRESSION:
+        raise BoardEncodingException(f"Unknown board compression {data[1]}")
+    return payload
+
+
+def _pack_plane(plane):
+    """
+    Turns a plane with a 0 or 1 byte per cell into a bitmap
+    """
+    plane = plane + bytes(-len(plane) % 8)
+    return bytes((chunk * _GATHER_BITS >> 56) & 0xFF for (chunk,) in struct.iter_unpack('<Q', plane))
+
+
+def _unpack_plane(bitmap):
+    return b''.join(map(_SPREAD_BITS.__getitem__, bitmap))
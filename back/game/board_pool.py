@@ -0,0 +1,89 @@
+"""
+Pool of no-guess boards generated ahead of time by worker processes.
+
+`manage.py fill_board_pool` tops up the pool of each size in MINESWEEPER_BOARD_POOL['SIZES'] to
+MINESWEEPER_BOARD_POOL['DEPTH'] boards, and new games created with `no_guess` take their board out of it.
+Workers only generate and encode the boards, they are saved by the process that runs the pool.
+"""
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+
+from game.board_encoding import encode_board
+from game.minesweeper import MinesweeperException
+from game.models import PooledBoard
+from game.no_guess import generate_no_guess_board
+
+
+def get_missing_boards():
+    """
+    Number of boards missing to reach the pool depth, by (columns, rows, mines)
+    """
+    pool_settings = settings.MINESWEEPER_BOARD_POOL
+    return {
+        (columns, rows, mines): max(pool_settings['DEPTH'] - PooledBoard.objects.for_size(columns, rows, mines).count(),
+                                    0)
+        for columns, rows, mines in pool_settings['SIZES']
+    }
+
+
+def fill_board_pool(columns, rows, mines, count, workers=None):
+    """
+    Generates `count` boards of the size in `workers` processes, adding them to the pool as they are ready.
+    Returns the number of boards added and of boards that could not be generated.
+    """
+    max_attempts = settings.MINESWEEPER_BOARD_POOL['MAX_ATTEMPTS']
+    compression = settings.MINESWEEPER_BOARD_COMPRESSION
+    added = 0
+    failed = 0
+    with ProcessPoolExecutor(workers) as executor:
+        futures = [
+            executor.submit(_generate_board, columns, rows, mines, random.getrandbits(63), max_attempts, compression)
+            for _ in range(count)
+        ]
+        for future in as_completed(futures):
+            try:
+                board, (start_x_position, start_y_position), attempts, generation_seconds = future.result()
+            except MinesweeperException:
+                failed += 1
+                continue
+            PooledBoard.objects.create(columns=columns, rows=rows, mines=mines, board=board,
+                                       start_x_position=start_x_position, start_y_position=start_y_position,
+                                       attempts=attempts, generation_seconds=generation_seconds)
+            added += 1
+    return added, failed
+
+
+def get_pool_stats():
+    """
+    Depth of the pool of each size, with the tries and seconds each of its boards took to generate
+    and the boards a worker generates per second
+    """
+    depths = {
+        (stats['columns'], stats['rows'], stats['mines']): stats for stats in PooledBoard.objects.depths()
+    }
+    sizes = [tuple(size) for size in settings.MINESWEEPER_BOARD_POOL['SIZES']]
+    sizes += sorted(size for size in depths if size not in sizes)
+    pool_stats = []
+    for columns, rows, mines in sizes:
+        stats = depths.get((columns, rows, mines), {})
+        generation_seconds = stats.get('generation_seconds')
+        pool_stats.append({
+            'columns': columns,
+            'rows': rows,
+            'mines': mines,
+            'depth': stats.get('depth', 0),
+            'target_depth': settings.MINESWEEPER_BOARD_POOL['DEPTH'],
+            'attempts': stats.get('attempts'),
+            'generation_seconds': generation_seconds,
+            'boards_per_second_per_worker': 1 / generation_seconds if generation_seconds else None,
+        })
+    return pool_stats
+
+
+def _generate_board(columns, rows, mines, seed, max_attempts, compression):
+    start = time.perf_counter()
+    cells, start_position, attempts = generate_no_guess_board(columns, rows, mines, seed, max_attempts)
+    return encode_board(cells, compression), start_position, attempts, time.perf_counter() - start
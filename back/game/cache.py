@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class GameCache:
+    """
+    In-process LRU cache of hydrated MinesweeperGame instances keyed by Game id.
+
+    A cached game is only handed out while its version matches the version of the row,
+    so games changed by another process are loaded again. Games are taken out of the cache
+    while a request uses them and put back once they are saved, so two requests never
+    share the same instance.
+    """
+    def __init__(self, max_cells: int, ttl: float):
+        self.max_cells = max_cells
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._cells = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls):
+        return cls(settings.MINESWEEPER_GAME_CACHE['MAX_CELLS'], settings.MINESWEEPER_GAME_CACHE['TTL'])
+
+    def take(self, game_id, version):
+        with self._lock:
+            entry = self._pop(game_id)
+            if entry is None or entry[0] != version or entry[1] < time.monotonic():
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[2]
+
+    def put(self, game_id, version, minesweeper_game):
+        size = minesweeper_game.columns * minesweeper_game.rows
+        with self._lock:
+            self._pop(game_id)
+            if size > self.max_cells:
+                return
+            self._entries[game_id] = (version, time.monotonic() + self.ttl, minesweeper_game)
+            self._cells += size
+            while self._cells > self.max_cells:
+                self._pop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, game_id):
+        with self._lock:
+            self._pop(game_id)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._cells = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'games': len(self._entries),
+                'cells': self._cells,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def _pop(self, game_id):
+        entry = self._entries.pop(game_id, None)
+        if entry is not None:
+            self._cells -= entry[2].columns * entry[2].rows
+        return entry
+
+
+game_cache = GameCache.from_settings()
@@ -0,0 +1,40 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from game.board_pool import fill_board_pool, get_missing_boards
+
+
+def parse_size(value):
+    try:
+        columns, rows, mines = (int(number) for number in value.lower().split('x'))
+    except ValueError:
+        raise CommandError(f"Sizes are given as COLUMNSxROWSxMINES, not {value}")
+    return columns, rows, mines
+
+
+class Command(BaseCommand):
+    help = ("Generates no-guess boards in worker processes until the pool of each size in "
+            "MINESWEEPER_BOARD_POOL has its depth")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', dest='sizes', action='append', type=parse_size,
+                            help='Fill only this size, given as COLUMNSxROWSxMINES. Can be repeated.')
+        parser.add_argument('--count', type=int,
+                            help='Boards to generate for each size, instead of the ones missing to reach the depth')
+        parser.add_argument('--workers', type=int, default=settings.MINESWEEPER_BOARD_POOL['WORKERS'],
+                            help='Worker processes, the number of CPUs by default')
+
+    def handle(self, *args, **options):
+        missing_boards = get_missing_boards()
+        for size in options['sizes'] or missing_boards:
+            count = options['count'] if options['count'] is not None else missing_boards.get(size, 0)
+            if not count:
+                continue
+            columns, rows, mines = size
+            start = time.perf_counter()
+            added, failed = fill_board_pool(columns, rows, mines, count, options['workers'])
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f"{columns}x{rows} with {mines} mines: {added} boards added in {elapsed:.1f}s "
+                              f"({added / elapsed:.2f} boards/s), {failed} failed")
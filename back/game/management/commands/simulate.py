@@ -0,0 +1,93 @@
+import json
+import platform
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from game.management.commands.fill_board_pool import parse_size
+from game.simulation import POLICIES, RANDOM, simulate
+
+
+class Command(BaseCommand):
+    help = ("Plays games with a random or a solver policy in worker processes and reports the throughput, "
+            "move latency and win rate of the engine on each board size")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', dest='sizes', action='append', type=parse_size,
+                            help='Board size given as COLUMNSxROWSxMINES, can be repeated. '
+                                 'The MINESWEEPER_BOARD_POOL sizes by default.')
+        parser.add_argument('--games', type=int, default=10_000, help='Games played on each size')
+        parser.add_argument('--policy', choices=POLICIES, default=RANDOM)
+        parser.add_argument('--engine', default=settings.MINESWEEPER_ENGINE,
+                            help='Dotted path of the MinesweeperGame class to simulate')
+        parser.add_argument('--workers', type=int, help='Worker processes, the number of CPUs by default')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Games played by a worker at a time')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Writes the results to this JSON file')
+        parser.add_argument('--compare', help='JSON file of a previous run to compare the results with')
+        parser.add_argument('--max-slowdown', type=float, default=0.1,
+                            help='Fails when --compare finds a size with this fraction fewer moves per second')
+
+    def handle(self, *args, **options):
+        sizes = options['sizes'] or [tuple(size) for size in settings.MINESWEEPER_BOARD_POOL['SIZES']]
+        results = simulate(sizes, options['games'], options['policy'], options['engine'], options['workers'],
+                           options['chunk_size'], options['seed'])
+        run = {
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'engine': options['engine'],
+            'policy': options['policy'],
+            'workers': options['workers'],
+            'seed': options['seed'],
+            'python': platform.python_version(),
+            'results': [result.to_json() for result in results],
+        }
+
+        self.stdout.write(f"{'board':>14} {'games':>9} {'win rate':>9} {'games/s':>10} {'moves/s':>11} "
+                          f"{'p50 us':>8} {'p99 us':>8}")
+        for result in run['results']:
+            board = f"{result['columns']}x{result['rows']}x{result['mines']}"
+            self.stdout.write(f"{board:>14} {result['games']:>9} {_format(result['win_rate'], '>9.3f')} "
+                              f"{_format(result['games_per_second'], '>10.1f')} "
+                              f"{_format(result['moves_per_second'], '>11.1f')} "
+                              f"{_format(result['move_latency_p50_us'], '>8.1f')} "
+                              f"{_format(result['move_latency_p99_us'], '>8.1f')}")
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(run, output, indent=2)
+        if options['compare']:
+            self._compare(run, options['compare'], options['max_slowdown'])
+
+    def _compare(self, run, baseline_path, max_slowdown):
+        with open(baseline_path) as baseline_file:
+            baseline = json.load(baseline_file)
+        for option in ('engine', 'policy'):
+            if baseline.get(option) != run[option]:
+                raise CommandError(f"The baseline was run with {option} {baseline.get(option)}, "
+                                   f"not {run[option]}")
+        baseline_results = {
+            (result['columns'], result['rows'], result['mines']): result for result in baseline['results']
+        }
+        slower = []
+        for result in run['results']:
+            size = (result['columns'], result['rows'], result['mines'])
+            baseline_result = baseline_results.get(size)
+            if baseline_result is None or not result['moves'] or not baseline_result['moves']:
+                continue
+            change = result['moves_per_second'] / baseline_result['moves_per_second'] - 1
+            self.stdout.write(f"{'x'.join(map(str, size))}: {change:+.1%} moves/s, p99 "
+                              f"{baseline_result['move_latency_p99_us']:.1f} -> {result['move_latency_p99_us']:.1f} us")
+            if change < -max_slowdown:
+                slower.append('x'.join(map(str, size)))
+        if slower:
+            raise CommandError(f"Moves per second dropped more than {max_slowdown:.0%} on {', '.join(slower)}")
+
+
+def _format(value, format_spec):
+    """
+    Formats a result, which is None when no games or moves were played
+    """
+    if value is None:
+        return format('-', format_spec.split('.')[0])
+    return format(value, format_spec)
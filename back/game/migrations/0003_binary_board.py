@@ -0,0 +1,135 @@
+import zlib
+
+from django.db import migrations, models
+
+try:
+    import lz4.frame
+except ImportError:  # lz4 is optional, boards are stored with zlib or without compression then
+    lz4 = None
+
+# The cell bits and the board encoding of game.minesweeper and game.board_encoding as they were when
+# this migration was written, so that changing those modules does not change what it does
+MINE = 1
+REVEALED = 2
+FLAGGED = 4
+
+FORMAT_VERSION = 1
+NO_COMPRESSION = 0
+ZLIB = 1
+LZ4 = 2
+
+
+def encode_board(cells):
+    """
+    Board with the mines, revealed and flagged bitmaps of the cells, one bit per cell, compressed with zlib
+    """
+    payload = bytearray()
+    for bit in (MINE, REVEALED, FLAGGED):
+        bitmap = bytearray((len(cells) + 7) // 8)
+        for index, cell in enumerate(cells):
+            if cell & bit:
+                bitmap[index // 8] |= 1 << index % 8
+        payload += bitmap
+    return bytes([FORMAT_VERSION, ZLIB]) + zlib.compress(bytes(payload), 1)
+
+
+def decode_board(data, size):
+    data = bytes(data)
+    if data[0] != FORMAT_VERSION:
+        raise ValueError(f"Unknown board format version {data[0]}")
+    payload = data[2:]
+    if data[1] == ZLIB:
+        payload = zlib.decompress(payload)
+    elif data[1] == LZ4:
+        if lz4 is None:
+            raise ValueError("lz4 compressed boards need the lz4 package installed")
+        payload = lz4.frame.decompress(payload)
+    elif data[1] != NO_COMPRESSION:
+        raise ValueError(f"Unknown board compression {data[1]}")
+    plane_size = (size + 7) // 8
+    return bytearray(
+        sum(bit for plane, bit in enumerate((MINE, REVEALED, FLAGGED))
+            if payload[plane * plane_size + index // 8] >> index % 8 & 1)
+        for index in range(size)
+    )
+
+
+def encode_json_boards(apps, schema_editor):
+    Game = apps.get_model('game', 'Game')
+    for game in Game.objects.iterator():
+        cells = bytearray(
+            json_cell['has_mine'] * MINE | json_cell['is_revealed'] * REVEALED | json_cell['is_flagged'] * FLAGGED
+            for column in game.board for json_cell in column
+        )
+        game.binary_board = encode_board(cells)
+        game.save(update_fields=['binary_board'])
+
+
+def decode_binary_boards(apps, schema_editor):
+    Game = apps.get_model('game', 'Game')
+    GameMove = apps.get_model('game', 'GameMove')
+    for game in Game.objects.iterator():
+        cells = decode_board(game.binary_board, game.columns * game.rows)
+        # The JSON board is a snapshot at the current version, so the moves after the binary one go in it
+        moves = GameMove.objects.filter(game=game, version__gt=game.snapshot_version).order_by('version')
+        for move in moves:
+            for x_position, y_position, is_revealed, is_flagged in move.changes:
+                index = x_position * game.rows + y_position
+                cells[index] = cells[index] & MINE | is_revealed * REVEALED | is_flagged * FLAGGED
+        game.board = [
+            [
+                {
+                    'x_position': x_position,
+                    'y_position': y_position,
+                    'has_mine': bool(cells[x_position * game.rows + y_position] & MINE),
+                    'is_revealed': bool(cells[x_position * game.rows + y_position] & REVEALED),
+                    'is_flagged': bool(cells[x_position * game.rows + y_position] & FLAGGED),
+                    'adjacent_mine_count': sum(
+                        bool(cells[x * game.rows + y] & MINE)
+                        for x in range(max(x_position - 1, 0), min(x_position + 2, game.columns))
+                        for y in range(max(y_position - 1, 0), min(y_position + 2, game.rows))
+                        if (x, y) != (x_position, y_position)
+                    ),
+                }
+                for y_position in range(game.rows)
+            ]
+            for x_position in range(game.columns)
+        ]
+        game.snapshot_version = game.version
+        game.save(update_fields=['board', 'snapshot_version'])
+        GameMove.objects.filter(game=game).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0002_game_moves'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='binary_board',
+            field=models.BinaryField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='game',
+            name='board',
+            field=models.JSONField(null=True),
+        ),
+        migrations.RunPython(encode_json_boards, decode_binary_boards),
+        migrations.RemoveField(
+            model_name='game',
+            name='board',
+        ),
+        migrations.RenameField(
+            model_name='game',
+            old_name='binary_board',
+            new_name='board',
+        ),
+        migrations.AlterField(
+            model_name='game',
+            name='board',
+            field=models.BinaryField(),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.1.5 on 2026-10-18 02:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0003_binary_board'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='mines_placed',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='seed',
+            field=models.BigIntegerField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='game',
+            name='board',
+            field=models.BinaryField(null=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.1.5 on 2026-10-18 02:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0004_lazy_boards'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['was_won', 'was_lost', 'id'], name='game_status_idx'),
+        ),
+    ]
@@ -0,0 +1,82 @@
+import zlib
+
+from django.db import migrations, models
+
+try:
+    import lz4.frame
+except ImportError:  # lz4 is optional, boards are stored with zlib or without compression then
+    lz4 = None
+
+# The cell bits and the board decoding of game.minesweeper and game.board_encoding as they were when
+# this migration was written, so that changing those modules does not change what it does
+MINE = 1
+REVEALED = 2
+FLAGGED = 4
+
+FORMAT_VERSION = 1
+NO_COMPRESSION = 0
+ZLIB = 1
+LZ4 = 2
+
+
+def decode_board(data, size):
+    data = bytes(data)
+    if data[0] != FORMAT_VERSION:
+        raise ValueError(f"Unknown board format version {data[0]}")
+    payload = data[2:]
+    if data[1] == ZLIB:
+        payload = zlib.decompress(payload)
+    elif data[1] == LZ4:
+        if lz4 is None:
+            raise ValueError("lz4 compressed boards need the lz4 package installed")
+        payload = lz4.frame.decompress(payload)
+    elif data[1] != NO_COMPRESSION:
+        raise ValueError(f"Unknown board compression {data[1]}")
+    plane_size = (size + 7) // 8
+    return bytearray(
+        sum(bit for plane, bit in enumerate((MINE, REVEALED, FLAGGED))
+            if payload[plane * plane_size + index // 8] >> index % 8 & 1)
+        for index in range(size)
+    )
+
+
+def count_cells(apps, schema_editor):
+    Game = apps.get_model('game', 'Game')
+    GameMove = apps.get_model('game', 'GameMove')
+    for game in Game.objects.iterator():
+        size = game.columns * game.rows
+        cells = decode_board(game.board, size) if game.mines_placed else bytearray(size)
+        for move in GameMove.objects.filter(game=game, version__gt=game.snapshot_version).order_by('version'):
+            for x_position, y_position, is_revealed, is_flagged in move.changes:
+                index = x_position * game.rows + y_position
+                cells[index] = cells[index] & MINE | is_revealed * REVEALED | is_flagged * FLAGGED
+        game.hidden_safe_count = cells.count(0) + cells.count(FLAGGED)
+        game.correct_flag_count = cells.count(FLAGGED | MINE)
+        game.flag_count = cells.count(FLAGGED) + game.correct_flag_count
+        game.save(update_fields=['hidden_safe_count', 'correct_flag_count', 'flag_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0005_game_status_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='correct_flag_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='flag_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='hidden_safe_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_cells, migrations.RunPython.noop),
+    ]
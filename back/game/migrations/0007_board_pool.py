@@ -0,0 +1,32 @@
+# Generated by Django 3.1.5 on 2026-10-18 03:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0006_game_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PooledBoard',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('columns', models.PositiveIntegerField()),
+                ('rows', models.PositiveIntegerField()),
+                ('mines', models.PositiveIntegerField()),
+                ('board', models.BinaryField()),
+                ('start_x_position', models.PositiveIntegerField()),
+                ('start_y_position', models.PositiveIntegerField()),
+                ('attempts', models.PositiveIntegerField()),
+                ('generation_seconds', models.FloatField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='pooledboard',
+            index=models.Index(fields=['columns', 'rows', 'mines', 'id'], name='pooled_board_size_idx'),
+        ),
+    ]
@@ -1,5 +1,20 @@
-import itertools
 import random
+import re
+import struct
+from bisect import bisect_right
+from collections import deque
+
+# Each cell of the board is stored as one byte with these bits
+MINE = 1
+REVEALED = 2
+FLAGGED = 4
+
+_MINE_BIT_TABLE = bytes(cell & MINE for cell in range(256))
+_REVEALED_BIT_TABLE = bytes(cell & REVEALED for cell in range(256))
+_IS_ZERO_TABLE = bytes([1]) + bytes(255)
+_BLANK_RUN = re.compile(b'\x01+')
+_PICKED_AS_MINE = bytes([0, MINE]) + bytes(254)
+_NOT_PICKED_AS_MINE = bytes([MINE, 0]) + bytes(254)
 
 
 class MinesweeperException(Exception):
@@ -7,27 +22,66 @@ class MinesweeperException(Exception):
 
 
 class MinesweeperGame:
-    def __init__(self, columns: int, rows: int, mines: int, board, was_won=False, was_lost=False):
+    def __init__(self, columns: int, rows: int, mines: int, cells: bytearray, was_won=False, was_lost=False,
+                 seed=None, mines_placed=True, counts=None):
+        """
+        Cells are stored column by column, the cell at (x, y) is cells[x * rows + y].
+        changed_positions has the cells changed by the last move and unsaved_positions
+        the ones changed since the game was last persisted.
+        Games without mines placed get them from the seed on the first reveal.
+
+        hidden_safe_count is the number of cells without mines left to reveal, correct_flag_count the
+        number of flagged mines and flag_count the number of flags. They are kept up to date by the
+        moves, and can be given as `counts` when they are already known to avoid counting the cells.
+        """
         self.rows = rows
         self.columns = columns
         self.mines = mines
         self.was_won = was_won
         self.was_lost = was_lost
-        self.board = board
-        self._set_adjacent_cells()
+        self.seed = seed
+        self.mines_placed = mines_placed
+        self.cells = cells
+        self.adjacent_mine_counts = self._count_adjacent_mines()
+        self.changed_positions = set()
+        self.unsaved_positions = set()
+        self._zero_regions = None
+        if counts is None:
+            self._count_hidden_and_flagged_cells()
+        else:
+            self.hidden_safe_count, self.correct_flag_count, self.flag_count = counts
+
+    @classmethod
+    def new_game(cls, columns, rows, mines, seed=None):
+        """
+        Games created with the same seed have the same mines
+        """
+        cls._validate_dimensions(columns, rows, mines)
+        cells = cls._create_board(columns, rows, mines, random.Random(seed))
+        return cls(columns, rows, mines, cells)
 
     @classmethod
-    def new_game(cls, columns, rows, mines):
+    def new_lazy_game(cls, columns, rows, mines, seed=None):
+        """
+        Mines are placed on the first reveal, avoiding the revealed cell
+        """
         cls._validate_dimensions(columns, rows, mines)
-        board = cls._create_board(columns, rows, mines)
-        return cls(columns, rows, mines, board)
+        if seed is None:
+            seed = random.getrandbits(63)
+        return cls(columns, rows, mines, bytearray(columns * rows), seed=seed, mines_placed=False)
 
     @classmethod
     def from_board(cls, board):
         columns = len(board)
         rows = len(board[0])
         mines = cls._get_mine_count(board)
-        return cls(columns, rows, mines, board)
+        cells = bytearray(columns * rows)
+        for x_position, column in enumerate(board):
+            for y_position, cell in enumerate(column):
+                cells[x_position * rows + y_position] = (
+                    cell.has_mine * MINE | cell.is_revealed * REVEALED | cell.is_flagged * FLAGGED
+                )
+        return cls(columns, rows, mines, cells)
 
     @classmethod
     def _validate_dimensions(cls, columns, rows, mines):
@@ -35,48 +89,130 @@ class MinesweeperGame:
             raise MinesweeperException("The board can not have more mines than cells")
 
     @classmethod
-    def _create_board(cls, columns, rows, mines):
+    def _create_board(cls, columns, rows, mines, rng):
         """
         Positions in the board look like:
         (0,0)  (1,0) (2,0)
         (0,1)  (1,1) (2,1)
         (0,2)  (1,2) (2,2)
         """
-        board = [
-            [MinesweeperCell(x_position, y_position) for y_position in range(rows)]
-            for x_position in range(columns)
-        ]
-        mine_positions = random.sample(list(itertools.product(range(columns), range(rows))), k=mines)
+        return cls._place_random_mines(columns * rows, mines, rng)
+
+    @classmethod
+    def _place_random_mines(cls, size, mines, rng):
+        if mines <= size // 2:
+            return cls._pick_random_cells(size, mines, rng).translate(_PICKED_AS_MINE)
+        return cls._pick_random_cells(size, size - mines, rng).translate(_NOT_PICKED_AS_MINE)
 
-        for x_position, y_position in mine_positions:
-            board[x_position][y_position].add_mine()
-        return board
+    @staticmethod
+    def _pick_random_cells(size, count, rng):
+        """
+        Returns a bytearray with `count` random cells set to 1. Random numbers are drawn in
+        bulk and scaled to the board size, drawing again only for the cells picked twice.
+        """
+        picked_cells = bytearray(size)
+        picked = 0
+        while picked < count:
+            missing = count - picked
+            draws = rng.getrandbits(64 * missing).to_bytes(8 * missing, 'little')
+            for (draw,) in struct.iter_unpack('<Q', draws):
+                index = draw * size >> 64
+                if not picked_cells[index]:
+                    picked_cells[index] = 1
+                    picked += 1
+        return picked_cells
 
     @property
     def is_over(self):
         return self.was_won or self.was_lost
 
+    @property
+    def board(self):
+        return [
+            [self.get_cell(x_position, y_position) for y_position in range(self.rows)]
+            for x_position in range(self.columns)
+        ]
+
     def get_cell(self, x_position: int, y_position: int):
-        return self.board[x_position][y_position]
+        return BoardCell(self, x_position, y_position)
 
     @property
     def visible_board(self):
+        if not self.rows:
+            return [[] for _ in range(self.columns)]
+        visible_states = list(map(_STATES_BY_CODE.__getitem__, self._get_visible_state_codes(0, len(self.cells))))
+        return [visible_states[start:start + self.rows] for start in range(0, len(visible_states), self.rows)]
+
+    def get_visible_region(self, x_position: int, y_position: int, width: int, height: int):
+        """
+        Visible board of the region, clipped to the board
+        """
+        first_row = max(y_position, 0)
+        last_row = min(y_position + height, self.rows)
         return [
-            [self.get_cell(x_position, y_position).visible_state for y_position in range(self.rows)]
-            for x_position in range(self.columns)
+            list(map(_STATES_BY_CODE.__getitem__,
+                     self._get_visible_state_codes(x * self.rows + first_row, x * self.rows + last_row)))
+            for x in range(max(x_position, 0), min(x_position + width, self.columns))
         ]
 
+    def get_changed_cells(self):
+        """
+        Positions and visible states of the cells changed by the last move
+        """
+        return self.get_cells(self.changed_positions)
+
+    def get_cells(self, positions):
+        """
+        Positions and visible states of the given cells, sorted by position
+        """
+        return [(x_position, y_position, self._get_visible_state(x_position * self.rows + y_position))
+                for x_position, y_position in sorted(positions)]
+
     def reveal_cell_position(self, x_position: int, y_position: int):
         if self.is_over:
             raise MinesweeperException("Can not reveal cell, the game is over.")
-        cell = self.get_cell(x_position, y_position)
-        return self._reveal_cell(cell)
+        index = self._get_index(x_position, y_position)
+        if not self.mines_placed and not self.cells[index] & FLAGGED:
+            self._place_mines(index)
+        return self._reveal_cell(index)
+
+    def chord_cell_position(self, x_position: int, y_position: int):
+        """
+        Reveals every hidden neighbour of a revealed cell with as many flags around it as adjacent mines,
+        as a single move. The blank areas of the neighbours are merged and revealed together.
+        """
+        if self.is_over:
+            raise MinesweeperException("Can not chord cell, the game is over.")
+        index = self._get_index(x_position, y_position)
+        cells = self.cells
+        if not cells[index] & REVEALED:
+            raise MinesweeperException("Can not chord cell, it is not revealed.")
+        adjacent_indexes = self._get_adjacent_indexes(index)
+        if sum(1 for adj_index in adjacent_indexes if cells[adj_index] & FLAGGED) != self.adjacent_mine_counts[index]:
+            raise MinesweeperException("Can not chord cell, the flags around it do not match its adjacent mines.")
+        clicked_indexes = [adj_index for adj_index in adjacent_indexes if not cells[adj_index] & (REVEALED | FLAGGED)]
+        to_reveal = set()
+        for clicked_index in clicked_indexes:
+            if clicked_index not in to_reveal:
+                to_reveal.update(self._get_reveal_area(clicked_index))
+        self._record_reveal(clicked_indexes, self._reveal_indexes(to_reveal))
 
     def set_flag_on_cell_position(self, x_position: int, y_position: int, is_flagged: bool):
         if self.is_over:
             raise MinesweeperException("Cant set flag on cell, the game is over.")
-        cell = self.get_cell(x_position, y_position)
-        cell.set_flag(is_flagged)
+        index = self._get_index(x_position, y_position)
+        cell = self.cells[index]
+        if cell & REVEALED:
+            raise MinesweeperException("Cant set flag on cell, the cell is already revealed.")
+        self.changed_positions = set()
+        if bool(cell & FLAGGED) != bool(is_flagged):
+            self.cells[index] = cell ^ FLAGGED
+            self.changed_positions.add((x_position, y_position))
+            self.unsaved_positions.add((x_position, y_position))
+            delta = 1 if is_flagged else -1
+            self.flag_count += delta
+            if cell & MINE:
+                self.correct_flag_count += delta
         self._set_if_game_won()
 
     @staticmethod
@@ -91,144 +227,350 @@ class MinesweeperGame:
         return mines
 
     def get_board_as_json(self):
-        return [
-            [self.get_cell(x_position, y_position).as_json() for y_position in range(self.rows)]
-            for x_position in range(self.columns)
-        ]
-
-    @staticmethod
-    def get_visible_board_state(json_board):
+        cells = self.cells
+        adjacent_mine_counts = self.adjacent_mine_counts
         return [
             [
-                str(MinesweeperCell.get_visible_state(
-                    cell['is_revealed'], cell['has_mine'],
-                    cell['is_flagged'], cell['adjacent_mine_count']))
-                for cell in column
+                {
+                    'x_position': x_position,
+                    'y_position': y_position,
+                    'has_mine': bool(cells[index] & MINE),
+                    'is_revealed': bool(cells[index] & REVEALED),
+                    'is_flagged': bool(cells[index] & FLAGGED),
+                    'adjacent_mine_count': adjacent_mine_counts[index]
+                }
+                for y_position, index in enumerate(range(x_position * self.rows, (x_position + 1) * self.rows))
             ]
-            for column in json_board
+            for x_position in range(self.columns)
         ]
 
-    def _reveal_cell(self, cell):
-        visible_state = cell.reveal()
-        if isinstance(visible_state, MineCellState):
+    def _get_index(self, x_position, y_position):
+        if not (0 <= x_position < self.columns and 0 <= y_position < self.rows):
+            raise IndexError("Cell position out of the board")
+        return x_position * self.rows + y_position
+
+    def _get_adjacent_indexes(self, index):
+        rows = self.rows
+        x_position, y_position = divmod(index, rows)
+        y_start = max(y_position - 1, 0)
+        y_stop = min(y_position + 2, rows)
+        return [x * rows + y
+                for x in range(max(x_position - 1, 0), min(x_position + 2, self.columns))
+                for y in range(y_start, y_stop)
+                if (x, y) != (x_position, y_position)]
+
+    def _get_visible_state(self, index):
+        cell = self.cells[index]
+        if _SHOWS_COUNT_TABLE[cell]:
+            return EMPTY_STATES[self.adjacent_mine_counts[index]]
+        return _STATES_BY_CODE[_CELL_CODE_TABLE[cell]]
+
+    def _get_visible_state_codes(self, start, stop):
+        """
+        Codes of the visible states of the cells from start to stop, worked out for all of them at once:
+        the adjacent mine count of the revealed cells without mines and a fixed code for the others
+        """
+        cells = self.cells[start:stop]
+        codes = int.from_bytes(cells.translate(_CELL_CODE_TABLE), 'little')
+        shown_counts = (int.from_bytes(cells.translate(_SHOWS_COUNT_TABLE), 'little') &
+                        int.from_bytes(self.adjacent_mine_counts[start:stop], 'little'))
+        return (codes | shown_counts).to_bytes(len(cells), 'little')
+
+    def _reveal_cell(self, index):
+        self._record_reveal([index], self._reveal_cells(index))
+        return self._get_visible_state(index)
+
+    def _record_reveal(self, clicked_indexes, changed_indexes):
+        """
+        Updates the game after revealing the clicked cells and their blank areas.
+        Only the clicked cells can be mines, blank areas never have mines.
+        """
+        cells = self.cells
+        revealed_mines = sum(1 for index in clicked_indexes if index in changed_indexes and cells[index] & MINE)
+        self.hidden_safe_count -= len(changed_indexes) - revealed_mines
+        self.changed_positions = {divmod(changed, self.rows) for changed in changed_indexes}
+        self.unsaved_positions |= self.changed_positions
+        if revealed_mines:
             self.was_lost = True
-        elif isinstance(visible_state, EmptyCellState) and visible_state.adjacent_mines == 0:
-            for adj_cell in cell.adjacent_cells:
-                if not adj_cell.is_revealed:
-                    self._reveal_cell(adj_cell)
         self._set_if_game_won()
-        return visible_state
+
+    def _reveal_cells(self, index):
+        """
+        Reveals the cell and, if it has no mines around it, the whole blank area connected to it.
+        Returns the set of indexes that changed.
+        """
+        return self._reveal_indexes(self._get_reveal_area(index))
+
+    def _get_reveal_area(self, index):
+        if self.cells[index] & FLAGGED:
+            raise MinesweeperException("Can not reveal cell, it is flagged.")
+        if self.cells[index] & MINE or self.adjacent_mine_counts[index] != 0:
+            return [index]
+        area = self._get_blank_area(index)
+        if area is None:
+            area = self._search_blank_area(index)
+        return area
+
+    def _reveal_indexes(self, to_reveal):
+        """
+        The cells are only revealed once all of them were checked, so a flagged cell among them
+        makes the move fail without leaving the board half revealed.
+        Returns the set of indexes that changed.
+        """
+        cells = self.cells
+        changed_indexes = set()
+        for revealed_index in to_reveal:
+            cell = cells[revealed_index]
+            if cell & FLAGGED:
+                raise MinesweeperException("Can not reveal cell, it is flagged.")
+            if not cell & REVEALED:
+                changed_indexes.add(revealed_index)
+        for revealed_index in changed_indexes:
+            cells[revealed_index] |= REVEALED
+        return changed_indexes
+
+    def _get_blank_area(self, index):
+        """
+        Indexes of the zero region of the blank cell at index and of its border, read from the zero region index.
+        Returns None when a blank cell of the region is already revealed, since the area then depends on
+        which cells are revealed and has to be searched.
+        """
+        rows = self.rows
+        column_runs, region_runs = self._get_zero_regions()
+        x_position, y_position = divmod(index, rows)
+        runs = column_runs[x_position]
+        region = runs[bisect_right(runs, (y_position, rows + 1)) - 1][2]
+        area = set()
+        for x, run_start, run_stop in region_runs[region]:
+            if self.cells[x * rows + run_start:x * rows + run_stop].translate(_REVEALED_BIT_TABLE).count(REVEALED):
+                return None
+            first_row = max(run_start - 1, 0)
+            last_row = min(run_stop + 1, rows)
+            for area_x in range(max(x - 1, 0), min(x + 2, self.columns)):
+                area.update(range(area_x * rows + first_row, area_x * rows + last_row))
+        return area
+
+    def _search_blank_area(self, index):
+        """
+        Indexes of the blank area connected to index going only through hidden blank cells, and of its border
+        """
+        cells = self.cells
+        adjacent_mine_counts = self.adjacent_mine_counts
+        to_reveal = [index]
+        seen = {index}
+        pending = deque([index])
+        while pending:
+            for adj_index in self._get_adjacent_indexes(pending.popleft()):
+                if adj_index in seen or cells[adj_index] & REVEALED:
+                    continue
+                seen.add(adj_index)
+                to_reveal.append(adj_index)
+                if adjacent_mine_counts[adj_index] == 0 and not cells[adj_index] & FLAGGED:
+                    pending.append(adj_index)
+        return to_reveal
+
+    def _get_zero_regions(self):
+        """
+        Zero region index of the board: the blank cells (no mine and no mines around them) connected to
+        each other, diagonals included, labeled with a union-find over the runs of blank cells of each
+        column. Two runs of neighbour columns are in the same region when they touch.
+
+        Returns the (start row, stop row, region) runs of each column and the (column, start row, stop row)
+        runs of each region. It is built on the first blank reveal and kept until the mines change.
+        """
+        if self._zero_regions is not None:
+            return self._zero_regions
+        rows = self.rows
+        zero_counts = int.from_bytes(self.adjacent_mine_counts.translate(_IS_ZERO_TABLE), 'little')
+        mines = int.from_bytes(self.cells.translate(_MINE_BIT_TABLE), 'little')
+        blank_cells = (zero_counts & ~mines).to_bytes(len(self.cells), 'little')
+
+        parents = []
+
+        def find(run):
+            while parents[run] != run:
+                parents[run] = parents[parents[run]]
+                run = parents[run]
+            return run
+
+        column_runs = []
+        previous_runs = []
+        for x_position in range(self.columns):
+            runs = [
+                (match.start() - x_position * rows, match.end() - x_position * rows, len(parents) + number)
+                for number, match in enumerate(_BLANK_RUN.finditer(blank_cells, x_position * rows,
+                                                                   (x_position + 1) * rows))
+            ]
+            parents.extend(run for _, _, run in runs)
+            previous, current = 0, 0
+            while previous < len(previous_runs) and current < len(runs):
+                previous_start, previous_stop, previous_run = previous_runs[previous]
+                start, stop, run = runs[current]
+                if previous_start <= stop and start <= previous_stop:
+                    parents[find(run)] = find(previous_run)
+                if previous_stop < stop:
+                    previous += 1
+                else:
+                    current += 1
+            column_runs.append(runs)
+            previous_runs = runs
+
+        region_runs = {}
+        for x_position, runs in enumerate(column_runs):
+            column_runs[x_position] = [(start, stop, find(run)) for start, stop, run in runs]
+            for start, stop, region in column_runs[x_position]:
+                region_runs.setdefault(region, []).append((x_position, start, stop))
+        self._zero_regions = column_runs, region_runs
+        return self._zero_regions
+
+    def _place_mines(self, safe_index):
+        """
+        Places the mines from the seed on every cell but safe_index, unless there is no room left
+        """
+        size = len(self.cells)
+        rng = random.Random(self.seed)
+        if self.mines < size:
+            mine_cells = self._place_random_mines(size - 1, self.mines, rng)
+            mine_cells.insert(safe_index, 0)
+        else:
+            mine_cells = self._place_random_mines(size, self.mines, rng)
+        # Mine bits are not set yet, so adding the planes keeps the flags of every cell
+        cells = int.from_bytes(self.cells, 'little') + int.from_bytes(mine_cells, 'little')
+        self.cells[:] = cells.to_bytes(size, 'little')
+        self.adjacent_mine_counts = self._count_adjacent_mines()
+        self._zero_regions = None
+        self.mines_placed = True
+        self._count_hidden_and_flagged_cells()
 
     def _set_if_game_won(self):
         """
         The game was won if visible boards only has empty cells and flags,
-        and the number of flags equals the number of mines
+        and the number of flags equals the number of mines.
+        That is the case when every cell without a mine is revealed and every mine, and only the mines, is flagged.
         """
-        flag_count = 0
-        for x_position in range(self.columns):
-            for y_position in range(self.rows):
-                visible_state = self.get_cell(x_position, y_position).visible_state
-                if not isinstance(visible_state, EmptyCellState) and not isinstance(visible_state, FlaggedCellState):
-                    return
-                if isinstance(visible_state, FlaggedCellState):
-                    flag_count += 1
-        if flag_count == self.mines:
+        if (not self.was_lost and self.hidden_safe_count == 0 and
+                self.correct_flag_count == self.flag_count == self.mines):
             self.was_won = True
 
-    def _set_adjacent_cells(self):
-        for x_position in range(self.columns):
-            for y_position in range(self.rows):
-                cell = self.get_cell(x_position, y_position)
-                cell.set_adjacent_cells(self._get_adjacent_cells(cell))
+    def _count_hidden_and_flagged_cells(self):
+        self.hidden_safe_count = self.cells.count(0) + self.cells.count(FLAGGED)
+        self.correct_flag_count = self.cells.count(FLAGGED | MINE)
+        self.flag_count = self.cells.count(FLAGGED) + self.correct_flag_count
 
-    def _get_adjacent_cells(self, cell):
-        x_position = cell.x_position
-        y_position = cell.y_position
-        return {self.get_cell(x, y)
-                for x in range(max(x_position-1, 0), min(x_position+2, self.columns))
-                for y in range(max(y_position-1, 0), min(y_position+2, self.rows))
-                if (x, y) != (x_position, y_position)}
+    def _count_adjacent_mines(self):
+        """
+        Adds up the mines of the 3x3 square around every cell in one pass over the whole board.
+        The mine plane is read as a big integer with one byte per cell, so shifting it by one byte
+        moves it one row and shifting it by `rows` bytes moves it one column. Counts are at most 9,
+        so adding the shifted planes never carries into the next cell.
+        """
+        size = len(self.cells)
+        if size == 0:
+            return bytearray()
+        byte_mask = (1 << (8 * size)) - 1
+        mines = int.from_bytes(self.cells.translate(_MINE_BIT_TABLE), 'little')
+        not_first_row = int.from_bytes((b'\x00' + b'\xff' * (self.rows - 1)) * self.columns, 'little')
+        not_last_row = int.from_bytes((b'\xff' * (self.rows - 1) + b'\x00') * self.columns, 'little')
+
+        vertical = mines + ((mines << 8) & not_first_row) + ((mines >> 8) & not_last_row)
+        square = vertical + ((vertical << (8 * self.rows)) & byte_mask) + (vertical >> (8 * self.rows))
+        return bytearray((square - mines).to_bytes(size, 'little'))
 
 
 class VisibleCellState:
-    pass
+    """
+    States are immutable and interned: building a state returns the one shared instance of it,
+    so states are compared by identity and hashed by it.
+    """
+    __slots__ = ()
+
+    def __new__(cls):
+        instance = cls.__dict__.get('_instance')
+        if instance is None:
+            instance = super().__new__(cls)
+            cls._instance = instance
+        return instance
+
+    def __reduce__(self):
+        return type(self), ()
 
 
 class HiddenCellState(VisibleCellState):
-    def __eq__(self, other):
-        return isinstance(other, HiddenCellState)
+    __slots__ = ()
 
     def __repr__(self):
         return 'hidden'
 
 
 class FlaggedCellState(VisibleCellState):
-    def __eq__(self, other):
-        return isinstance(other, FlaggedCellState)
+    __slots__ = ()
 
     def __repr__(self):
         return 'flag'
 
 
 class MineCellState(VisibleCellState):
-    def __eq__(self, other):
-        return isinstance(other, MineCellState)
+    __slots__ = ()
 
     def __repr__(self):
         return 'mine'
 
 
 class EmptyCellState(VisibleCellState):
-    def __init__(self, adjacent_mines: int):
-        self.adjacent_mines = adjacent_mines
-        super().__init__()
+    __slots__ = ('_adjacent_mines',)
+    _instances = {}
+
+    def __new__(cls, adjacent_mines: int):
+        instance = cls._instances.get(adjacent_mines)
+        if instance is None:
+            instance = object.__new__(cls)
+            instance._adjacent_mines = int(adjacent_mines)
+            cls._instances[adjacent_mines] = instance
+        return instance
+
+    @property
+    def adjacent_mines(self):
+        return self._adjacent_mines
 
     def __repr__(self):
-        return str(self.adjacent_mines)
+        return str(self._adjacent_mines)
+
+    def __reduce__(self):
+        return EmptyCellState, (self._adjacent_mines,)
+
 
-    def __eq__(self, other):
-        return isinstance(other, EmptyCellState) and self.adjacent_mines == other.adjacent_mines
+HIDDEN_STATE = HiddenCellState()
+FLAG_STATE = FlaggedCellState()
+MINE_STATE = MineCellState()
+EMPTY_STATES = tuple(EmptyCellState(adjacent_mines) for adjacent_mines in range(9))
+
+# Visible states by code: codes 0 to 8 are the empty cells with that many adjacent mines
+_MINE_CODE = 9
+_FLAG_CODE = 10
+_HIDDEN_CODE = 11
+_STATES_BY_CODE = EMPTY_STATES + (MINE_STATE, FLAG_STATE, HIDDEN_STATE)
+# Code of every cell but the revealed cells without mines, whose code is their adjacent mine count
+_CELL_CODE_TABLE = bytes(
+    (_MINE_CODE if cell & MINE else 0) if cell & REVEALED else _FLAG_CODE if cell & FLAGGED else _HIDDEN_CODE
+    for cell in range(256)
+)
+_SHOWS_COUNT_TABLE = bytes(0xFF if cell & REVEALED and not cell & MINE else 0 for cell in range(256))
 
 
 class MinesweeperCell:
+    """
+    A standalone cell, used to describe a board before building a game from it
+    """
     def __init__(self, x_position: int, y_position: int, has_mine=False, is_revealed=False, is_flagged=False):
         self.x_position = x_position
         self.y_position = y_position
         self.has_mine = has_mine
         self.is_revealed = is_revealed
         self.is_flagged = is_flagged
-        self.adjacent_cells = []
 
     def add_mine(self):
         self.has_mine = True
 
-    def set_adjacent_cells(self, cells):
-        self.adjacent_cells = cells
-
-    @property
-    def _adjacents_mine_count(self):
-        mine_count = 0
-        for cell in self.adjacent_cells:
-            if cell.has_mine:
-                mine_count += 1
-        return mine_count
-
-    def reveal(self):
-        if self.is_flagged:
-            raise MinesweeperException("Can not reveal cell, it is flagged.")
-        self.is_revealed = True
-        return self.visible_state
-
-    def set_flag(self, is_flagged: bool):
-        if self.is_revealed:
-            raise MinesweeperException("Cant set flag on cell, the cell is already revealed.")
-        self.is_flagged = is_flagged
-
-    @property
-    def visible_state(self):
-        return self.get_visible_state(self.is_revealed, self.has_mine,
-                                      self.is_flagged, self._adjacents_mine_count)
-
     @staticmethod
     def get_visible_state(is_revealed, has_mine, is_flagged, adjacent_mine_count):
         """
@@ -236,11 +578,47 @@ class MinesweeperCell:
         """
         if is_revealed:
             if has_mine:
-                return MineCellState()
-            return EmptyCellState(adjacent_mine_count)
+                return MINE_STATE
+            return EMPTY_STATES[adjacent_mine_count]
         if is_flagged:
-            return FlaggedCellState()
-        return HiddenCellState()
+            return FLAG_STATE
+        return HIDDEN_STATE
+
+
+class BoardCell:
+    """
+    View over one cell of a game board, it is only created when asked for
+    """
+    def __init__(self, game: MinesweeperGame, x_position: int, y_position: int):
+        self.game = game
+        self.x_position = x_position
+        self.y_position = y_position
+        self.index = game._get_index(x_position, y_position)
+
+    @property
+    def has_mine(self):
+        return bool(self.game.cells[self.index] & MINE)
+
+    @property
+    def is_revealed(self):
+        return bool(self.game.cells[self.index] & REVEALED)
+
+    @property
+    def is_flagged(self):
+        return bool(self.game.cells[self.index] & FLAGGED)
+
+    @property
+    def adjacent_cells(self):
+        return [self.game.get_cell(*divmod(adj_index, self.game.rows))
+                for adj_index in self.game._get_adjacent_indexes(self.index)]
+
+    @property
+    def _adjacents_mine_count(self):
+        return self.game.adjacent_mine_counts[self.index]
+
+    @property
+    def visible_state(self):
+        return self.game._get_visible_state(self.index)
 
     def as_json(self):
         return {
@@ -1,41 +1,293 @@
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
+from django.utils.module_loading import import_string
 
-from game.minesweeper import MinesweeperGame, MinesweeperCell
+from game.board_encoding import encode_board, decode_board, decode_board_range, decompress_board
+from game.cache import game_cache
+from game.minesweeper import MINE, REVEALED, FLAGGED
+from game.signals import game_changed
+
+
+class GameVersionConflict(Exception):
+    pass
+
+
+def get_minesweeper_engine():
+    """
+    MinesweeperGame class set as MINESWEEPER_ENGINE
+    """
+    return import_string(settings.MINESWEEPER_ENGINE)
+
+
+def get_counts(minesweeper_game):
+    return {
+        'hidden_safe_count': minesweeper_game.hidden_safe_count,
+        'correct_flag_count': minesweeper_game.correct_flag_count,
+        'flag_count': minesweeper_game.flag_count,
+    }
+
+
+def encode_minesweeper_board(minesweeper_game):
+    if not minesweeper_game.mines_placed:
+        return None
+    return encode_board(minesweeper_game.cells, settings.MINESWEEPER_BOARD_COMPRESSION)
 
 
 class GameQueryset(models.QuerySet):
     def create_from_minesweeper_game(self, minesweeper_game):
-        return self.create(columns=minesweeper_game.columns, rows=minesweeper_game.rows,
+        minesweeper_game.unsaved_positions.clear()
+        game = self.create(columns=minesweeper_game.columns, rows=minesweeper_game.rows,
                            mines=minesweeper_game.mines, was_lost=minesweeper_game.was_lost,
-                           was_won=minesweeper_game.was_won, board=minesweeper_game.get_board_as_json())
+                           was_won=minesweeper_game.was_won, board=encode_minesweeper_board(minesweeper_game),
+                           seed=minesweeper_game.seed, mines_placed=minesweeper_game.mines_placed,
+                           **get_counts(minesweeper_game))
+        game_cache.put(game.id, game.version, minesweeper_game)
+        return game
+
+    def with_status(self, status):
+        if status == Game.WON:
+            return self.filter(was_won=True)
+        if status == Game.LOST:
+            return self.filter(was_lost=True)
+        return self.filter(was_won=False, was_lost=False)
 
 
 class Game(models.Model):
+    """
+    The board is a board_encoding snapshot of the game after `snapshot_version` moves, moves made
+    after it are stored as deltas in GameMove until the next snapshot is taken.
+    Lazy games have no board until the first reveal places their mines from the seed.
+    The counts of the game are saved with every move, so loaded games do not count their cells again.
+    """
     rows = models.PositiveIntegerField()
     columns = models.PositiveIntegerField()
     mines = models.PositiveIntegerField()
     was_lost = models.BooleanField(default=False)
     was_won = models.BooleanField(default=False)
-    board = models.JSONField()
+    board = models.BinaryField(null=True)
+    seed = models.BigIntegerField(null=True)
+    mines_placed = models.BooleanField(default=True)
+    version = models.PositiveIntegerField(default=0)
+    snapshot_version = models.PositiveIntegerField(default=0)
+    hidden_safe_count = models.PositiveIntegerField(default=0)
+    correct_flag_count = models.PositiveIntegerField(default=0)
+    flag_count = models.PositiveIntegerField(default=0)
+
+    WON = 'won'
+    LOST = 'lost'
+    IN_PROGRESS = 'in_progress'
+    STATUSES = [WON, LOST, IN_PROGRESS]
 
     objects = GameQueryset.as_manager()
 
-    def to_minesweeper_game(self):
-        board = [
-            [
-                MinesweeperCell(json_cell['x_position'], json_cell['y_position'],
-                                json_cell['has_mine'], json_cell['is_revealed'],
-                                json_cell['is_flagged']) for json_cell in column
-            ] for column in self.board
+    class Meta:
+        indexes = [
+            models.Index(fields=['was_won', 'was_lost', 'id'], name='game_status_idx'),
         ]
-        return MinesweeperGame(self.columns, self.rows, self.mines, board, self.was_won, self.was_lost)
+
+    def to_minesweeper_game(self):
+        cells = self._load_cells(0, self.columns * self.rows)
+        return get_minesweeper_engine()(self.columns, self.rows, self.mines, cells, self.was_won, self.was_lost,
+                                        self.seed, self.mines_placed,
+                                        (self.hidden_safe_count, self.correct_flag_count, self.flag_count))
+
+    def get_visible_region(self, x_position, y_position, width, height):
+        """
+        Visible board of the region, without loading the whole game when it is not cached
+        """
+        minesweeper_game = game_cache.take(self.id, self.version)
+        if minesweeper_game is not None:
+            region = minesweeper_game.get_visible_region(x_position, y_position, width, height)
+            game_cache.put(self.id, self.version, minesweeper_game)
+        else:
+            region = self._load_visible_region(x_position, y_position, width, height, self.board, self._get_moves())
+        return [[str(state) for state in column] for column in region]
+
+    def iter_visible_columns(self, strip_cells=65536):
+        """
+        Visible board column by column. The stored board is decoded a strip of about `strip_cells` cells
+        at a time, so the whole board is never held as cells or states.
+        """
+        columns_per_strip = max(strip_cells // max(self.rows, 1), 1)
+        board = decompress_board(self.board) if self.mines_placed else None
+        moves = self._get_moves()
+        for first_column in range(0, self.columns, columns_per_strip):
+            strip = self._load_visible_region(first_column, 0, columns_per_strip, self.rows, board, moves)
+            for column in strip:
+                yield [str(state) for state in column]
+
+    def _load_visible_region(self, x_position, y_position, width, height, board, moves):
+        """
+        Only the columns of the region and the ones next to it are decoded, since the
+        adjacent mine counts of the region depend on them.
+        """
+        first_column = min(max(x_position - 1, 0), self.columns)
+        last_column = max(min(x_position + width + 1, self.columns), first_column)
+        cells = self._load_cells(first_column * self.rows, last_column * self.rows, board, moves)
+        strip = get_minesweeper_engine()(last_column - first_column, self.rows, self.mines, cells)
+        return strip.get_visible_region(x_position - first_column, y_position, width, height)
+
+    def _get_moves(self):
+        if self.version == self.snapshot_version:
+            return []
+        return list(self.moves.filter(version__gt=self.snapshot_version))
+
+    def _load_cells(self, start, stop, board=None, moves=None):
+        if self.mines_placed:
+            cells = decode_board_range(self.board if board is None else board, self.columns * self.rows, start, stop)
+        else:
+            cells = bytearray(stop - start)
+        for move in self._get_moves() if moves is None else moves:
+            move.apply(cells, self.rows, start)
+        return cells
+
+    def load_minesweeper_game(self):
+        """
+        Same as to_minesweeper_game but reuses the cached game when it is up to date.
+        The game is taken out of the cache, update_from_minesweeper_game puts it back.
+        """
+        minesweeper_game = game_cache.take(self.id, self.version)
+        if minesweeper_game is None:
+            minesweeper_game = self.to_minesweeper_game()
+        return minesweeper_game
+
+    def get_visible_board(self):
+        minesweeper_game = self.load_minesweeper_game()
+        visible_board = [[str(state) for state in column] for column in minesweeper_game.visible_board]
+        game_cache.put(self.id, self.version, minesweeper_game)
+        return visible_board
+
+    def make_move(self, move, retries):
+        """
+        Calls move with the loaded game and saves it. When another request saved the game in the
+        meantime, the game is loaded again and the move is made on top of the new state, up to
+        `retries` times before raising GameVersionConflict. Returns what the move returned.
+        """
+        for attempt in range(retries + 1):
+            minesweeper_game = self.load_minesweeper_game()
+            result = move(minesweeper_game)
+            try:
+                self.update_from_minesweeper_game(minesweeper_game)
+                return result
+            except GameVersionConflict:
+                if attempt == retries:
+                    raise
+                self.refresh_from_db()
 
     def update_from_minesweeper_game(self, minesweeper_game):
-        self.columns = minesweeper_game.columns
-        self.rows = minesweeper_game.rows
-        self.mines = minesweeper_game.mines
-        self.was_lost = minesweeper_game.was_lost
-        self.was_won = minesweeper_game.was_won
-        self.board = minesweeper_game.get_board_as_json()
-        self.save()
+        """
+        Stores the cells changed since the game was loaded as a new move, and every
+        MINESWEEPER_SNAPSHOT_INTERVAL moves rewrites the whole board and drops the old moves.
+        The board is also rewritten when the mines of a lazy game were just placed. Lazy games have
+        no board before that, so their moves are kept as deltas until then.
+
+        The row is only updated if its version is still the one the game was loaded with,
+        otherwise GameVersionConflict is raised and nothing is saved. Once saved, game_changed
+        is sent with the changed cells.
+        """
+        changes = [
+            [x_position, y_position, bool(cell & REVEALED), bool(cell & FLAGGED)]
+            for x_position, y_position in sorted(minesweeper_game.unsaved_positions)
+            for cell in [minesweeper_game.cells[x_position * self.rows + y_position]]
+        ]
+        if changes:
+            version = self.version + 1
+            fields = {'was_lost': minesweeper_game.was_lost, 'was_won': minesweeper_game.was_won, 'version': version,
+                      **get_counts(minesweeper_game)}
+            take_snapshot = (minesweeper_game.mines_placed != self.mines_placed or
+                             minesweeper_game.mines_placed and
+                             version - self.snapshot_version >= settings.MINESWEEPER_SNAPSHOT_INTERVAL)
+            if take_snapshot:
+                fields.update(board=encode_minesweeper_board(minesweeper_game), snapshot_version=version,
+                              mines_placed=minesweeper_game.mines_placed)
+            with transaction.atomic():
+                if not Game.objects.filter(id=self.id, version=self.version).update(**fields):
+                    raise GameVersionConflict(f"Game {self.id} was changed after version {self.version}")
+                if take_snapshot:
+                    self.moves.all().delete()
+                else:
+                    GameMove.objects.create(game=self, version=version, changes=changes)
+            for name, value in fields.items():
+                setattr(self, name, value)
+            game_changed.send(sender=Game, game=self,
+                              changed_cells=minesweeper_game.get_cells(minesweeper_game.unsaved_positions))
+        minesweeper_game.unsaved_positions.clear()
+        game_cache.put(self.id, self.version, minesweeper_game)
+
+
+class GameMove(models.Model):
+    """
+    Cells changed by a move, as [x_position, y_position, is_revealed, is_flagged] lists
+    """
+    game = models.ForeignKey(Game, related_name='moves', on_delete=models.CASCADE)
+    version = models.PositiveIntegerField()
+    changes = models.JSONField()
+
+    class Meta:
+        ordering = ['version']
+        unique_together = [['game', 'version']]
+
+    def apply(self, cells, rows, first_index=0):
+        """
+        Applies the changes to cells, which hold the board cells starting from first_index
+        """
+        for x_position, y_position, is_revealed, is_flagged in self.changes:
+            index = x_position * rows + y_position - first_index
+            if 0 <= index < len(cells):
+                cells[index] = cells[index] & MINE | is_revealed * REVEALED | is_flagged * FLAGGED
+
+
+class PooledBoardQueryset(models.QuerySet):
+    def for_size(self, columns, rows, mines):
+        return self.filter(columns=columns, rows=rows, mines=mines)
+
+    def pop(self, columns, rows, mines):
+        """
+        Takes the oldest board of the size out of the pool, None if there is none.
+        A board is only returned by the request that deleted it, so two requests never get the same one.
+        """
+        for board in self.for_size(columns, rows, mines).order_by('id')[:5]:
+            if self.filter(id=board.id).delete()[0]:
+                return board
+        return None
 
+    def depths(self):
+        """
+        Number of boards, tries per board and seconds spent generating each board, by size
+        """
+        return (self.values('columns', 'rows', 'mines')
+                .annotate(depth=models.Count('id'), attempts=models.Avg('attempts'),
+                          generation_seconds=models.Avg('generation_seconds'))
+                .order_by('columns', 'rows', 'mines'))
+
+
+class PooledBoard(models.Model):
+    """
+    Board generated ahead of time by game.board_pool, waiting to be used by a new game.
+    No-guess boards can be cleared without guessing once the start cell is revealed.
+    """
+    columns = models.PositiveIntegerField()
+    rows = models.PositiveIntegerField()
+    mines = models.PositiveIntegerField()
+    board = models.BinaryField()
+    start_x_position = models.PositiveIntegerField()
+    start_y_position = models.PositiveIntegerField()
+    attempts = models.PositiveIntegerField()
+    generation_seconds = models.FloatField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = PooledBoardQueryset.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['columns', 'rows', 'mines', 'id'], name='pooled_board_size_idx'),
+        ]
+
+    def to_minesweeper_game(self):
+        """
+        New game on this board with the start cell revealed
+        """
+        cells = decode_board(bytes(self.board), self.columns * self.rows)
+        minesweeper_game = get_minesweeper_engine()(self.columns, self.rows, self.mines, cells)
+        minesweeper_game.reveal_cell_position(self.start_x_position, self.start_y_position)
+        return minesweeper_game
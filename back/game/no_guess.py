@@ -0,0 +1,70 @@
+"""
+Generator of boards that can be cleared without guessing.
+
+Mines are placed at random away from a start cell and its neighbours, so revealing the start cell
+opens a blank area, and the board is kept if following the safe cells and mines found by game.solver
+from there wins the game. Boards are tried until one is kept, expert boards take several tries and
+bigger or denser boards many more, so games get them from the pool filled by game.board_pool.
+"""
+import random
+
+from game.minesweeper import MinesweeperGame, MinesweeperException
+from game.solver import solve_game
+
+# Seconds the solver can spend on each hint while checking a board
+HINT_TIME_BUDGET = 1.0
+
+
+def generate_no_guess_board(columns, rows, mines, seed=None, max_attempts=1000):
+    """
+    Returns the cells of a board that can be cleared without guessing starting from the returned
+    (x, y) start position, and the number of boards tried
+    """
+    MinesweeperGame._validate_dimensions(columns, rows, mines)
+    rng = random.Random(seed)
+    start_position = (columns // 2, rows // 2)
+    for attempt in range(1, max_attempts + 1):
+        cells = place_mines_around(columns, rows, mines, start_position, rng)
+        game = MinesweeperGame(columns, rows, mines, bytearray(cells))
+        if plays_without_guessing(game, start_position):
+            return cells, start_position, attempt
+    raise MinesweeperException(f"Could not generate a board that can be cleared without guessing "
+                               f"in {max_attempts} attempts")
+
+
+def place_mines_around(columns, rows, mines, start_position, rng):
+    """
+    Random cells with no mines on the start position and its neighbours, or only on the start
+    position when there is no room for the mines otherwise
+    """
+    x_start, y_start = start_position
+    safe_indexes = [
+        x_position * rows + y_position
+        for x_position in range(max(x_start - 1, 0), min(x_start + 2, columns))
+        for y_position in range(max(y_start - 1, 0), min(y_start + 2, rows))
+    ]
+    size = columns * rows
+    if mines > size - len(safe_indexes):
+        safe_indexes = [x_start * rows + y_start] if mines < size else []
+    cells = MinesweeperGame._place_random_mines(size - len(safe_indexes), mines, rng)
+    for index in safe_indexes:
+        cells.insert(index, 0)
+    return cells
+
+
+def plays_without_guessing(minesweeper_game, start_position):
+    """
+    Plays the game from the start position following the hints, returns whether it was won without a guess
+    """
+    minesweeper_game.reveal_cell_position(*start_position)
+    while not minesweeper_game.is_over:
+        hint = solve_game(minesweeper_game, HINT_TIME_BUDGET)
+        if not hint.complete or not (hint.safe_cells or hint.mines):
+            return False
+        for x_position, y_position in hint.mines:
+            minesweeper_game.set_flag_on_cell_position(x_position, y_position, True)
+        for x_position, y_position in hint.safe_cells:
+            if minesweeper_game.is_over:
+                break
+            minesweeper_game.reveal_cell_position(x_position, y_position)
+    return minesweeper_game.was_won
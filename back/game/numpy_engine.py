@@ -0,0 +1,112 @@
+"""
+MinesweeperGame backend that does the whole board work with NumPy arrays.
+
+Select it with MINESWEEPER_ENGINE = 'game.numpy_engine.NumpyMinesweeperGame', NumPy has to be installed.
+Cells are still kept in the same bytearray as the reference engine, the arrays are views over it,
+so games are persisted and cached the same way with either engine.
+"""
+import numpy as np
+
+from game.minesweeper import (MinesweeperGame, MinesweeperException, MINE, REVEALED, FLAGGED, _STATES_BY_CODE,
+                              _CELL_CODE_TABLE, _SHOWS_COUNT_TABLE)
+
+_VISIBLE_STATES = np.array(_STATES_BY_CODE, dtype=object)
+_CELL_CODES = np.frombuffer(_CELL_CODE_TABLE, dtype=np.uint8)
+_SHOWS_COUNT = np.frombuffer(_SHOWS_COUNT_TABLE, dtype=np.uint8).astype(bool)
+
+
+class NumpyMinesweeperGame(MinesweeperGame):
+    @property
+    def visible_board(self):
+        codes = self._get_visible_state_codes(0, len(self.cells))
+        return _VISIBLE_STATES[codes].reshape(self.columns, self.rows).tolist()
+
+    def get_board_as_json(self):
+        cells = self._cells_array().reshape(self.columns, self.rows)
+        has_mine = (cells & MINE).astype(bool).tolist()
+        is_revealed = (cells & REVEALED).astype(bool).tolist()
+        is_flagged = (cells & FLAGGED).astype(bool).tolist()
+        adjacent_mine_counts = self._adjacent_mine_counts_array().reshape(self.columns, self.rows).tolist()
+        return [
+            [
+                {
+                    'x_position': x_position,
+                    'y_position': y_position,
+                    'has_mine': has_mine[x_position][y_position],
+                    'is_revealed': is_revealed[x_position][y_position],
+                    'is_flagged': is_flagged[x_position][y_position],
+                    'adjacent_mine_count': adjacent_mine_counts[x_position][y_position]
+                }
+                for y_position in range(self.rows)
+            ]
+            for x_position in range(self.columns)
+        ]
+
+    def _cells_array(self):
+        return np.frombuffer(self.cells, dtype=np.uint8)
+
+    def _adjacent_mine_counts_array(self):
+        return np.frombuffer(self.adjacent_mine_counts, dtype=np.uint8)
+
+    def _get_visible_state_codes(self, start, stop):
+        cells = self._cells_array()[start:stop]
+        return np.where(_SHOWS_COUNT[cells], self._adjacent_mine_counts_array()[start:stop], _CELL_CODES[cells])
+
+    def _reveal_cells(self, index):
+        """
+        Same as the reference engine, but the blank area is grown one ring of neighbours at a time
+        over a board padded with a border, so the neighbours of a whole ring are found at once.
+        """
+        cells = self._cells_array()
+        if cells[index] & FLAGGED:
+            raise MinesweeperException("Can not reveal cell, it is flagged.")
+        to_reveal = np.array([index])
+        if not cells[index] & MINE and self.adjacent_mine_counts[index] == 0:
+            padded_rows = self.rows + 2
+            padded_cells = np.pad(cells.reshape(self.columns, self.rows), 1).ravel()
+            padded_counts = np.pad(self._adjacent_mine_counts_array().reshape(self.columns, self.rows), 1,
+                                   constant_values=1).ravel()
+            inside = np.pad(np.ones((self.columns, self.rows), dtype=bool), 1).ravel()
+            can_reveal = inside & (padded_cells & REVEALED == 0)
+            expands = can_reveal & (padded_counts == 0)
+            offsets = np.array([-padded_rows - 1, -padded_rows, -padded_rows + 1, -1, 1,
+                                padded_rows - 1, padded_rows, padded_rows + 1])
+
+            x_position, y_position = divmod(index, self.rows)
+            start = (x_position + 1) * padded_rows + y_position + 1
+            seen = np.zeros(len(padded_cells), dtype=bool)
+            seen[start] = True
+            ring = np.array([start])
+            while ring.size:
+                adjacent = np.unique((ring[:, None] + offsets).ravel())
+                adjacent = adjacent[can_reveal[adjacent] & ~seen[adjacent]]
+                seen[adjacent] = True
+                ring = adjacent[expands[adjacent]]
+            if (padded_cells[seen] & FLAGGED).any():
+                raise MinesweeperException("Can not reveal cell, it is flagged.")
+            area = np.flatnonzero(seen)
+            to_reveal = (area // padded_rows - 1) * self.rows + area % padded_rows - 1
+
+        changed_indexes = to_reveal[cells[to_reveal] & REVEALED == 0]
+        cells[changed_indexes] |= REVEALED
+        return set(changed_indexes.tolist())
+
+    def _count_hidden_and_flagged_cells(self):
+        counts = np.bincount(self._cells_array(), minlength=256)
+        self.hidden_safe_count = int(counts[0] + counts[FLAGGED])
+        self.correct_flag_count = int(counts[FLAGGED | MINE])
+        self.flag_count = int(counts[FLAGGED] + counts[FLAGGED | MINE])
+
+    def _count_adjacent_mines(self):
+        """
+        Convolves the mine plane with a 3x3 square by adding up the 9 shifted copies of the padded plane
+        """
+        if not self.cells:
+            return bytearray()
+        mines = np.pad((self._cells_array() & MINE).reshape(self.columns, self.rows), 1)
+        square = sum(
+            mines[x_offset:x_offset + self.columns, y_offset:y_offset + self.rows]
+            for x_offset in range(3)
+            for y_offset in range(3)
+        )
+        return bytearray((square - mines[1:-1, 1:-1]).astype(np.uint8).tobytes())
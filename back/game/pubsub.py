@@ -0,0 +1,65 @@
+"""
+Publish/subscribe layer that pushes the changes of each saved move to the websocket clients of the game.
+
+The backend is chosen with the MINESWEEPER_PUBSUB_BACKEND setting. InMemoryPubSub only reaches the
+subscribers of its own process, a backend shared by several processes (e.g. on Redis) has to provide
+the same subscribe, unsubscribe and publish methods.
+"""
+import asyncio
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from game.serializers import GameChangesSerializer
+from game.signals import game_changed
+
+
+class InMemoryPubSub:
+    """
+    Messages can be published from any thread, each subscriber gets them in an asyncio
+    queue of the event loop it subscribed from
+    """
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel):
+        queue = asyncio.Queue()
+        with self._lock:
+            self._subscribers[channel].add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, channel, queue):
+        with self._lock:
+            subscribers = self._subscribers[channel]
+            subscribers.difference_update({subscriber for subscriber in subscribers if subscriber[1] is queue})
+            if not subscribers:
+                del self._subscribers[channel]
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, message)
+            except RuntimeError:  # The loop of the subscriber was closed before it unsubscribed
+                self.unsubscribe(channel, queue)
+
+    def subscriber_count(self, channel):
+        with self._lock:
+            return len(self._subscribers.get(channel, ()))
+
+
+def game_channel(game_id):
+    return f'minesweeper.game.{game_id}'
+
+
+@receiver(game_changed)
+def publish_game_changes(sender, game, changed_cells, **kwargs):
+    pubsub.publish(game_channel(game.id), GameChangesSerializer(game, context={'changed_cells': changed_cells}).data)
+
+
+pubsub = import_string(settings.MINESWEEPER_PUBSUB_BACKEND)()
@@ -1,23 +1,36 @@
-from rest_framework import serializers
+from django.conf import settings
+from rest_framework import serializers, status
+from rest_framework.exceptions import APIException
 
-from game.minesweeper import MinesweeperGame
-from game.models import Game
+from game.models import Game, PooledBoard, get_minesweeper_engine
+
+
+class NoBoardReady(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'No no-guess board of this size is ready, try again later.'
+    default_code = 'no_board_ready'
 
 
 class GameSerializer(serializers.ModelSerializer):
     board = serializers.SerializerMethodField()
     is_over = serializers.SerializerMethodField()
+    no_guess = serializers.BooleanField(write_only=True, default=False)
 
     class Meta:
         model = Game
-        fields = ['id', 'rows', 'columns', 'mines', 'was_lost', 'was_won', 'board', 'is_over']
+        fields = ['id', 'rows', 'columns', 'mines', 'was_lost', 'was_won', 'board', 'is_over', 'version',
+                  'no_guess']
         extra_kwargs = {
             'was_lost': {'read_only': True},
-            'was_won': {'read_only': True}
+            'was_won': {'read_only': True},
+            'version': {'read_only': True}
         }
 
     def get_board(self, obj):
-        return MinesweeperGame.get_visible_board_state(obj.board)
+        region = self.context.get('region')
+        if region is not None:
+            return obj.get_visible_region(*region)
+        return obj.get_visible_board()
 
     def get_is_over(self, obj):
         return obj.was_won or obj.was_lost
@@ -26,5 +39,107 @@ class GameSerializer(serializers.ModelSerializer):
         columns = validated_data.get('columns')
         rows = validated_data.get('rows')
         mines = validated_data.get('mines')
-        game = MinesweeperGame.new_game(columns=columns, rows=rows, mines=mines)
+        if validated_data.get('no_guess'):
+            pooled_board = PooledBoard.objects.pop(columns, rows, mines)
+            if pooled_board is None:
+                raise NoBoardReady()
+            return Game.objects.create_from_minesweeper_game(pooled_board.to_minesweeper_game())
+        engine = get_minesweeper_engine()
+        if settings.MINESWEEPER_LAZY_BOARDS:
+            game = engine.new_lazy_game(columns=columns, rows=rows, mines=mines)
+        else:
+            game = engine.new_game(columns=columns, rows=rows, mines=mines)
         return Game.objects.create_from_minesweeper_game(game)
+
+
+class GameSummarySerializer(GameSerializer):
+    board = None
+    no_guess = None
+
+    class Meta(GameSerializer.Meta):
+        fields = ['id', 'rows', 'columns', 'mines', 'was_lost', 'was_won', 'is_over', 'version']
+
+
+class GameChangesSerializer(GameSerializer):
+    """
+    Game status with the cells changed by the last move, given as `changed_cells` in the context
+    """
+    board = None
+    no_guess = None
+    changed_cells = serializers.SerializerMethodField()
+
+    class Meta(GameSerializer.Meta):
+        fields = ['id', 'was_lost', 'was_won', 'is_over', 'version', 'changed_cells']
+
+    def get_changed_cells(self, obj):
+        return serialize_changed_cells(self.context['changed_cells'])
+
+
+class GameMovesSerializer(GameChangesSerializer):
+    """
+    Game status with the results of a batch of moves, given as `results` in the context
+    """
+    changed_cells = None
+    results = serializers.SerializerMethodField()
+
+    class Meta(GameSerializer.Meta):
+        fields = ['id', 'was_lost', 'was_won', 'is_over', 'version', 'results']
+
+    def get_results(self, obj):
+        return self.context['results']
+
+
+class MoveSerializer(serializers.Serializer):
+    REVEAL = 'reveal'
+    FLAG = 'flag'
+    CHORD = 'chord'
+
+    type = serializers.ChoiceField([REVEAL, FLAG, CHORD])
+    x_position = serializers.IntegerField(min_value=0)
+    y_position = serializers.IntegerField(min_value=0)
+    is_flagged = serializers.BooleanField(required=False)
+
+    def validate(self, attrs):
+        if attrs['type'] == self.FLAG and 'is_flagged' not in attrs:
+            raise serializers.ValidationError('is_flagged is required for flag moves')
+        return attrs
+
+
+class MovesSerializer(serializers.Serializer):
+    moves = MoveSerializer(many=True, allow_empty=False)
+
+
+class HintSerializer(serializers.Serializer):
+    """
+    Serializes a game.solver.Hint
+    """
+    safe_cells = serializers.SerializerMethodField()
+    mines = serializers.SerializerMethodField()
+    probabilities = serializers.SerializerMethodField()
+    best_guess = serializers.SerializerMethodField()
+    complete = serializers.BooleanField()
+
+    def get_safe_cells(self, obj):
+        return [{'x_position': x_position, 'y_position': y_position} for x_position, y_position in obj.safe_cells]
+
+    def get_mines(self, obj):
+        return [{'x_position': x_position, 'y_position': y_position} for x_position, y_position in obj.mines]
+
+    def get_probabilities(self, obj):
+        return [
+            {'x_position': x_position, 'y_position': y_position, 'probability': probability}
+            for (x_position, y_position), probability in sorted(obj.probabilities.items())
+        ]
+
+    def get_best_guess(self, obj):
+        if obj.best_guess is None:
+            return None
+        (x_position, y_position), probability = obj.best_guess
+        return {'x_position': x_position, 'y_position': y_position, 'probability': probability}
+
+
+def serialize_changed_cells(changed_cells):
+    return [
+        {'x_position': x_position, 'y_position': y_position, 'state': str(state)}
+        for x_position, y_position, state in changed_cells
+    ]
@@ -0,0 +1,4 @@
+from django.dispatch import Signal
+
+# Sent after a move is saved, with the `game` and its `changed_cells` as (x_position, y_position, state)
+game_changed = Signal()
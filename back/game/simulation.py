@@ -0,0 +1,164 @@
+"""
+Plays many games with a policy to measure the throughput of a MinesweeperGame engine.
+
+Games are played in chunks by worker processes, each chunk returns its counts and a histogram of
+the time taken by each move, so millions of games can be played without sending every timing back.
+Only the engine calls are timed, the time a policy spends choosing its moves is not.
+"""
+import math
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from django.utils.module_loading import import_string
+
+from game.minesweeper import REVEALED, FLAGGED
+from game.solver import solve_game
+
+RANDOM = 'random'
+SOLVER = 'solver'
+POLICIES = [RANDOM, SOLVER]
+
+# Move latencies are counted in buckets this many times wider than the previous one
+_LATENCY_BUCKET_RATIO = 1.02
+
+
+class SizeResult:
+    """
+    Counts of the games played on one board size, merged from the chunks played by the workers
+    """
+    def __init__(self, columns, rows, mines):
+        self.columns = columns
+        self.rows = rows
+        self.mines = mines
+        self.games = 0
+        self.wins = 0
+        self.moves = 0
+        self.latencies = Counter()
+        self.seconds = 0.0
+
+    def add_chunk(self, games, wins, moves, latencies):
+        self.games += games
+        self.wins += wins
+        self.moves += moves
+        self.latencies.update(latencies)
+
+    def get_latency_percentile(self, percentile):
+        """
+        Move latency in microseconds under which `percentile` percent of the moves are
+        """
+        rank = math.ceil(self.moves * percentile / 100)
+        seen = 0
+        for bucket in sorted(self.latencies):
+            seen += self.latencies[bucket]
+            if seen >= rank:
+                return _LATENCY_BUCKET_RATIO ** bucket / 1000
+        return None
+
+    def to_json(self):
+        return {
+            'columns': self.columns,
+            'rows': self.rows,
+            'mines': self.mines,
+            'games': self.games,
+            'wins': self.wins,
+            'moves': self.moves,
+            'seconds': self.seconds,
+            'win_rate': self.wins / self.games if self.games else None,
+            'games_per_second': self.games / self.seconds if self.seconds else None,
+            'moves_per_second': self.moves / self.seconds if self.seconds else None,
+            'move_latency_p50_us': self.get_latency_percentile(50),
+            'move_latency_p99_us': self.get_latency_percentile(99),
+        }
+
+
+def simulate(sizes, games, policy, engine, workers=None, chunk_size=1000, seed=0):
+    """
+    Plays `games` games of each (columns, rows, mines) size with the policy and the engine given as
+    a dotted path, in `workers` processes. Returns a SizeResult for each size.
+    """
+    results = []
+    with ProcessPoolExecutor(workers) as executor:
+        for columns, rows, mines in sizes:
+            result = SizeResult(columns, rows, mines)
+            start = time.perf_counter()
+            chunks = [
+                executor.submit(play_chunk, engine, columns, rows, mines, policy,
+                                range(first_game, min(first_game + chunk_size, games)), seed)
+                for first_game in range(0, games, chunk_size)
+            ]
+            for chunk in chunks:
+                result.add_chunk(*chunk.result())
+            result.seconds = time.perf_counter() - start
+            results.append(result)
+    return results
+
+
+def play_chunk(engine, columns, rows, mines, policy, game_numbers, seed):
+    """
+    Plays the games with the given numbers, returns how many were played and won, how many moves
+    were made and the histogram of the move latencies
+    """
+    engine = import_string(engine)
+    play = _play_with_solver if policy == SOLVER else _play_randomly
+    wins = 0
+    moves = 0
+    latencies = Counter()
+    for game_number in game_numbers:
+        game_seed = hash((seed, columns, rows, mines, game_number))
+        minesweeper_game = engine.new_lazy_game(columns, rows, mines, seed=game_seed)
+        moves += play(minesweeper_game, random.Random(game_seed), latencies)
+        wins += minesweeper_game.was_won
+    return len(game_numbers), wins, moves, latencies
+
+
+def _timed_move(move, latencies, *args):
+    start = time.perf_counter_ns()
+    move(*args)
+    latencies[round(math.log(max(time.perf_counter_ns() - start, 1), _LATENCY_BUCKET_RATIO))] += 1
+
+
+def _play_randomly(minesweeper_game, rng, latencies):
+    """
+    Reveals random hidden cells until the game is over, flagging the hidden cells once there are as
+    many of them as mines left. Returns the number of moves.
+    """
+    moves = 0
+    while not minesweeper_game.is_over:
+        if minesweeper_game.mines_placed and minesweeper_game.hidden_safe_count == 0:
+            # No flag was placed before, so every hidden cell left has a mine
+            for index, cell in enumerate(minesweeper_game.cells):
+                if not cell & (REVEALED | FLAGGED):
+                    _timed_move(minesweeper_game.set_flag_on_cell_position, latencies,
+                                *divmod(index, minesweeper_game.rows), True)
+                    moves += 1
+            break
+        index = rng.randrange(len(minesweeper_game.cells))
+        if minesweeper_game.cells[index] & (REVEALED | FLAGGED):
+            continue
+        _timed_move(minesweeper_game.reveal_cell_position, latencies, *divmod(index, minesweeper_game.rows))
+        moves += 1
+    return moves
+
+
+def _play_with_solver(minesweeper_game, rng, latencies):
+    """
+    Flags the mines and reveals the safe cells found by the solver, guessing when there are none.
+    Returns the number of moves.
+    """
+    moves = 0
+    while not minesweeper_game.is_over:
+        hint = solve_game(minesweeper_game)
+        for x_position, y_position in hint.mines:
+            _timed_move(minesweeper_game.set_flag_on_cell_position, latencies, x_position, y_position, True)
+            moves += 1
+        if hint.mines and not hint.safe_cells:
+            continue
+        for x_position, y_position in hint.safe_cells or [hint.best_guess[0]]:
+            if minesweeper_game.is_over:
+                break
+            if not minesweeper_game.cells[x_position * minesweeper_game.rows + y_position] & REVEALED:
+                _timed_move(minesweeper_game.reveal_cell_position, latencies, x_position, y_position)
+                moves += 1
+    return moves
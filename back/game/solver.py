@@ -0,0 +1,504 @@
+"""
+Solver that finds the safe cells and the mines of a game from what a player sees of it.
+
+It only looks at the visible board: the revealed numbers, the flags and the hidden cells, and takes
+the flags as mines. Each revealed number with hidden neighbours is a constraint on how many mines
+those neighbours have. The constraints are first combined two at a time, which finds most of the
+safe cells and mines, and what is left of the frontier is split into groups of constraints that do
+not share cells, whose mine arrangements are counted by number of mines. The arrangements of all the
+groups are then weighted by the ways of placing the mines left in the other hidden cells, which gives
+the probability of each cell to have a mine.
+"""
+import math
+import time
+from collections import OrderedDict, deque
+from threading import Lock
+
+from game.minesweeper import HIDDEN_STATE, FLAG_STATE, MINE_STATE
+
+# Solved groups of constraints kept for the next calls, the frontier of a game changes little between moves
+SOLVED_COMPONENTS_CACHE_SIZE = 4096
+
+_solved_components = OrderedDict()
+_solved_components_lock = Lock()
+
+
+class OutOfTime(Exception):
+    pass
+
+
+class Hint:
+    def __init__(self, safe_cells, mines, probabilities, best_guess, complete):
+        """
+        safe_cells and mines are sorted lists of the (x, y) positions of hidden cells known to be safe or
+        to have a mine. probabilities maps the other frontier cells to their probability of having a mine,
+        and best_guess is the (position, probability) of the hidden cell least likely to have a mine,
+        or None when no cell is hidden. complete is False when the time budget ran out before
+        looking at the whole frontier.
+        """
+        self.safe_cells = safe_cells
+        self.mines = mines
+        self.probabilities = probabilities
+        self.best_guess = best_guess
+        self.complete = complete
+
+
+def solve_game(minesweeper_game, time_budget=None):
+    """
+    Hint for a MinesweeperGame. The first reveal of games without mines placed is always safe.
+    """
+    if not minesweeper_game.mines_placed:
+        center = (minesweeper_game.columns // 2, minesweeper_game.rows // 2)
+        return Hint([], [], {}, (center, 0.0), True)
+    return solve(minesweeper_game.visible_board, minesweeper_game.mines, time_budget)
+
+
+def solve(visible_board, mines, time_budget=None):
+    """
+    Hint for a visible board, given as columns of visible cell states, with `mines` mines.
+    time_budget is the number of seconds the solver can take, once it runs out the frontier cells not
+    looked at yet are given the mine density of the cells away from the frontier.
+    """
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    hidden_count, flag_count = _count_cells(visible_board)
+    frontier = _Frontier()
+    complete = True
+    counted_components = []
+    try:
+        for cells, mine_count in _read_constraints(visible_board, deadline):
+            frontier.add(cells, mine_count)
+        frontier.propagate(deadline)
+        for component in sorted(frontier.components(), key=len):
+            counted_components.append(_count_component(component, deadline))
+    except OutOfTime:
+        complete = False
+
+    counted_components = [counts for counts in counted_components if counts[0]]
+    frontier_count = sum(len(cell_arrangements) for _, cell_arrangements in counted_components)
+    other_count = hidden_count - len(frontier.safe) - len(frontier.mines) - frontier_count
+    mines_left = mines - flag_count - len(frontier.mines)
+    if complete:
+        try:
+            cell_probabilities, other_probability = _weigh_components(
+                counted_components, other_count, mines_left, deadline)
+        except OutOfTime:
+            complete = False
+    if not complete:
+        cell_probabilities, other_probability = _weigh_components_apart(counted_components, other_count, mines_left)
+
+    probabilities = {}
+    for cell, probability in cell_probabilities.items():
+        if probability == 0:
+            frontier.safe.add(cell)
+        elif probability == 1:
+            frontier.mines.add(cell)
+        else:
+            probabilities[cell] = probability
+
+    if frontier.safe:
+        best_guess = (min(frontier.safe), 0.0)
+    else:
+        candidates = [(probability, cell) for cell, probability in probabilities.items()]
+        if other_count:
+            candidates.append((other_probability,
+                               _find_other_cell(visible_board, cell_probabilities, frontier.mines)))
+        best_guess = min(candidates, default=None)
+        if best_guess is not None:
+            best_guess = (best_guess[1], best_guess[0])
+    return Hint(sorted(frontier.safe), sorted(frontier.mines), probabilities, best_guess, complete)
+
+
+def _count_cells(visible_board):
+    """
+    Returns the number of hidden cells and the number of flagged cells
+    """
+    hidden_count = 0
+    flag_count = 0
+    for column in visible_board:
+        hidden_count += column.count(HIDDEN_STATE)
+        flag_count += column.count(FLAG_STATE) + column.count(MINE_STATE)
+    return hidden_count, flag_count
+
+
+def _read_constraints(visible_board, deadline):
+    """
+    Yields a constraint (hidden neighbours, mines among them) for each revealed number with hidden neighbours
+    """
+    columns = len(visible_board)
+    rows = len(visible_board[0]) if columns else 0
+    for x_position, column in enumerate(visible_board):
+        _check_deadline(deadline)
+        for y_position, state in enumerate(column):
+            if state is HIDDEN_STATE or state is FLAG_STATE or state is MINE_STATE or not state.adjacent_mines:
+                continue
+            hidden_neighbours = []
+            flagged_neighbours = 0
+            for neighbour_x in range(max(x_position - 1, 0), min(x_position + 2, columns)):
+                neighbour_column = visible_board[neighbour_x]
+                for neighbour_y in range(max(y_position - 1, 0), min(y_position + 2, rows)):
+                    neighbour = neighbour_column[neighbour_y]
+                    if neighbour is HIDDEN_STATE:
+                        hidden_neighbours.append((neighbour_x, neighbour_y))
+                    elif neighbour is FLAG_STATE or neighbour is MINE_STATE:
+                        flagged_neighbours += 1
+            if hidden_neighbours:
+                yield frozenset(hidden_neighbours), state.adjacent_mines - flagged_neighbours
+
+
+def _find_other_cell(visible_board, *frontier_cells):
+    """
+    First hidden cell that is not one of the given frontier cells
+    """
+    for x_position, column in enumerate(visible_board):
+        for y_position, state in enumerate(column):
+            if state is HIDDEN_STATE and not any((x_position, y_position) in cells for cells in frontier_cells):
+                return x_position, y_position
+    return None
+
+
+def _check_deadline(deadline):
+    if deadline is not None and time.perf_counter() > deadline:
+        raise OutOfTime()
+
+
+class _Frontier:
+    """
+    Constraints on the frontier cells, each one a frozenset of cells mapped to the number of mines among them
+    """
+    def __init__(self):
+        self.constraints = {}
+        self.constraints_by_cell = {}
+        self.safe = set()
+        self.mines = set()
+        self.pending = deque()
+
+    def propagate(self, deadline):
+        """
+        Finds safe cells and mines looking at each constraint alone and at each pair of constraints
+        that share cells, until no more are found
+        """
+        examined = 0
+        while self.pending:
+            examined += 1
+            if examined % 1024 == 0:
+                _check_deadline(deadline)
+            cells = self.pending.popleft()
+            mine_count = self.constraints.get(cells)
+            if mine_count is None:
+                continue
+            if mine_count == 0:
+                self._mark(cells, False)
+            elif mine_count == len(cells):
+                self._mark(cells, True)
+            else:
+                self._combine(cells, mine_count)
+
+    def components(self):
+        """
+        Splits the constraints in groups that do not share cells, each given as a frozenset of constraints
+        """
+        seen = set()
+        for cells in self.constraints:
+            if cells in seen:
+                continue
+            seen.add(cells)
+            component = []
+            stack = [cells]
+            while stack:
+                current = stack.pop()
+                component.append((current, self.constraints[current]))
+                for cell in current:
+                    for other in self.constraints_by_cell[cell]:
+                        if other not in seen:
+                            seen.add(other)
+                            stack.append(other)
+            yield frozenset(component)
+
+    def _combine(self, cells, mine_count):
+        """
+        A constraint inside another one leaves the rest of the bigger one with the difference of mines.
+        Otherwise, when the cells only in the other constraint must all be mines to reach its mines,
+        the cells only in this one are safe.
+        """
+        others = {other for cell in cells for other in self.constraints_by_cell[cell]}
+        others.discard(cells)
+        for other in others:
+            if cells not in self.constraints:
+                return
+            other_mine_count = self.constraints.get(other)
+            if other_mine_count is None:
+                continue
+            if cells < other:
+                self.add(other - cells, other_mine_count - mine_count)
+            elif other < cells:
+                self.add(cells - other, mine_count - other_mine_count)
+            elif other_mine_count - mine_count == len(other - cells):
+                self._mark(other - cells, True)
+                self._mark(cells - other, False)
+            elif mine_count - other_mine_count == len(cells - other):
+                self._mark(cells - other, True)
+                self._mark(other - cells, False)
+
+    def add(self, cells, mine_count):
+        if not cells or cells in self.constraints or not 0 <= mine_count <= len(cells):
+            return
+        self.constraints[cells] = mine_count
+        for cell in cells:
+            self.constraints_by_cell.setdefault(cell, set()).add(cells)
+        self.pending.append(cells)
+
+    def _remove(self, cells):
+        mine_count = self.constraints.pop(cells)
+        for cell in cells:
+            self.constraints_by_cell[cell].discard(cells)
+        return mine_count
+
+    def _mark(self, cells, has_mine):
+        """
+        Records the cells as mines or safe cells and takes them out of the constraints they are in
+        """
+        for cell in cells:
+            if cell in self.safe or cell in self.mines:
+                continue
+            (self.mines if has_mine else self.safe).add(cell)
+            for constraint in list(self.constraints_by_cell.get(cell, ())):
+                mine_count = self._remove(constraint)
+                self.add(constraint - {cell}, mine_count - has_mine)
+            self.constraints_by_cell.pop(cell, None)
+
+
+def _count_component(component, deadline):
+    """
+    Number of mine arrangements that meet a group of constraints for each number of mines in it, and
+    for each cell the number of them with a mine in the cell, see _ComponentCounter.count
+    """
+    with _solved_components_lock:
+        counts = _solved_components.get(component)
+        if counts is not None:
+            _solved_components.move_to_end(component)
+            return counts
+
+    counts = _ComponentCounter(component, deadline).count()
+    with _solved_components_lock:
+        _solved_components[component] = counts
+        if len(_solved_components) > SOLVED_COMPONENTS_CACHE_SIZE:
+            _solved_components.popitem(last=False)
+    return counts
+
+
+def _weigh_components(counted_components, other_count, mines_left, deadline):
+    """
+    Probability of each counted frontier cell and of each of the other hidden cells to have a mine.
+
+    Every way of placing the mines left in the hidden cells that meets the constraints is as likely,
+    so the arrangements of the groups with t mines in total are weighted by the C(other_count, mines_left - t)
+    ways of placing the rest of the mines in the other cells. The groups that always have the same number
+    of mines only add to t, the others are combined by the mines they have over their fewest, with their
+    counts scaled down to floats as only their ratios matter.
+    """
+    fewest_mines = sum(min(arrangements) for arrangements, _ in counted_components)
+    varying = []
+    for arrangements, _ in counted_components:
+        if len(arrangements) > 1:
+            fewest = min(arrangements)
+            most = max(arrangements.values())
+            varying.append({mines - fewest: ways / most for mines, ways in arrangements.items()})
+    weights = _weigh_totals(fewest_mines, sum(max(arrangements) for arrangements in varying),
+                            other_count, mines_left)
+
+    # ways_before[i][extra] is the weight of the arrangements of the varying groups before the i-th one
+    # with extra mines over their fewest, and weighted_after[i][extra] the weight of the arrangements of
+    # the i-th group and the ones after it, with the mines left in the other cells, when the groups
+    # before it have extra mines
+    ways_before = [[1.0]]
+    for arrangements in varying:
+        _check_deadline(deadline)
+        before = ways_before[-1]
+        reached = [0.0] * (len(before) + max(arrangements))
+        for extra, ways in enumerate(before):
+            for mines, component_ways in arrangements.items():
+                reached[extra + mines] += ways * component_ways
+        ways_before.append(reached)
+    weighted_after = [weights]
+    for index in reversed(range(len(varying))):
+        _check_deadline(deadline)
+        after = weighted_after[-1]
+        weighted_after.append([
+            sum(ways * after[extra + mines] for mines, ways in varying[index].items())
+            for extra in range(len(ways_before[index]))
+        ])
+    weighted_after.reverse()
+
+    total_weight = sum(ways * weight for ways, weight in zip(ways_before[-1], weights))
+    if not total_weight:
+        return _weigh_components_apart(counted_components, other_count, mines_left)
+
+    probabilities = {}
+    index = 0
+    for arrangements, cell_arrangements in counted_components:
+        if len(arrangements) == 1:
+            [(mines, ways)] = arrangements.items()
+            for cell, mine_arrangements in cell_arrangements.items():
+                probabilities[cell] = mine_arrangements.get(mines, 0) / ways
+            continue
+        _check_deadline(deadline)
+        fewest = min(arrangements)
+        most = max(arrangements.values())
+        # Weight of the arrangements of the other groups when this one has the given mines
+        others_weight = {
+            mines: sum(ways * weighted_after[index + 1][extra + mines - fewest]
+                       for extra, ways in enumerate(ways_before[index]))
+            for mines in arrangements
+        }
+        weight = sum(ways / most * others_weight[mines] for mines, ways in arrangements.items())
+        for cell, mine_arrangements in cell_arrangements.items():
+            probabilities[cell] = sum(ways / most * others_weight[mines]
+                                      for mines, ways in mine_arrangements.items()) / weight
+        index += 1
+
+    if not other_count:
+        return probabilities, 1.0
+    other_mines = sum(ways * weight * (mines_left - fewest_mines - extra)
+                      for extra, (ways, weight) in enumerate(zip(ways_before[-1], weights)))
+    return probabilities, other_mines / total_weight / other_count
+
+
+def _weigh_totals(fewest_mines, extra_mines, other_count, mines_left):
+    """
+    C(other_count, mines_left - fewest_mines - extra) for each extra from 0 to extra_mines,
+    scaled so the biggest is 1
+    """
+    log_weights = []
+    for extra in range(extra_mines + 1):
+        other_mines = mines_left - fewest_mines - extra
+        log_weights.append(
+            math.lgamma(other_count + 1) - math.lgamma(other_mines + 1) - math.lgamma(other_count - other_mines + 1)
+            if 0 <= other_mines <= other_count else None
+        )
+    most = max((log_weight for log_weight in log_weights if log_weight is not None), default=None)
+    return [0.0 if log_weight is None else math.exp(log_weight - most) for log_weight in log_weights]
+
+
+def _weigh_components_apart(counted_components, other_count, mines_left):
+    """
+    Probabilities of the cells of each group taking its arrangements as equally likely whatever the mines
+    left, and the mine density of the other cells. Used when the groups can not be weighed together in
+    time, or when the mines left can not be placed in any of their arrangements.
+    """
+    probabilities = {}
+    expected_mines = 0.0
+    for arrangements, cell_arrangements in counted_components:
+        total = sum(arrangements.values())
+        expected_mines += sum(mines * ways for mines, ways in arrangements.items()) / total
+        for cell, mine_arrangements in cell_arrangements.items():
+            probabilities[cell] = sum(mine_arrangements.values()) / total
+    if not other_count:
+        return probabilities, 1.0
+    return probabilities, min(max((mines_left - expected_mines) / other_count, 0.0), 1.0)
+
+
+class _ComponentCounter:
+    """
+    Counts the mine arrangements of a group of constraints deciding its cells one at a time.
+
+    Cells are visited in breadth first order so that each constraint is only open (with some of its
+    cells decided and some not) for a few steps. What can still be decided after the first cells only
+    depends on the mines still needed by the open constraints, so the partial arrangements are merged
+    on them: a first pass counts the ways to reach each of these states, and a second one the ways
+    to finish from each of them.
+    """
+    def __init__(self, component, deadline):
+        self.deadline = deadline
+        constraints = list(component)
+        self.cells = self._order_cells(constraints)
+        cell_indexes = {cell: index for index, cell in enumerate(self.cells)}
+
+        self.mine_counts = [mine_count for _, mine_count in constraints]
+        # For each cell, the constraints it is in and how many of their cells come after it
+        self.constraints_by_cell = [[] for _ in self.cells]
+        self.open_constraints = [[] for _ in range(len(self.cells) + 1)]
+        for constraint, (cells, _) in enumerate(constraints):
+            indexes = sorted(cell_indexes[cell] for cell in cells)
+            for position, index in enumerate(indexes):
+                self.constraints_by_cell[index].append((constraint, len(indexes) - 1 - position))
+            for index in range(indexes[0] + 1, indexes[-1] + 1):
+                self.open_constraints[index].append(constraint)
+
+    @staticmethod
+    def _order_cells(constraints):
+        constraints_by_cell = {}
+        for cells, _ in constraints:
+            for cell in cells:
+                constraints_by_cell.setdefault(cell, []).append(cells)
+        first_cell = min(constraints_by_cell)
+        ordered = [first_cell]
+        seen = {first_cell}
+        queue = deque(ordered)
+        while queue:
+            cell = queue.popleft()
+            for cells in constraints_by_cell[cell]:
+                for other in sorted(cells - seen):
+                    seen.add(other)
+                    ordered.append(other)
+                    queue.append(other)
+        return ordered
+
+    def count(self):
+        """
+        Returns the number of arrangements for each number of mines in the group, and for each cell
+        the number of arrangements with a mine in it for each number of mines, both as dicts
+        """
+        # ways_to_reach[index] maps the mines needed by the constraints open before deciding the cell at
+        # index to the number of ways to decide the previous cells that get there, by mines placed in them
+        ways_to_reach = [{(): {0: 1}}]
+        for index in range(len(self.cells)):
+            _check_deadline(self.deadline)
+            reached = {}
+            for state, ways_by_mines in ways_to_reach[index].items():
+                for has_mine in (0, 1):
+                    next_state = self._decide(index, state, has_mine)
+                    if next_state is not None:
+                        reached_by_mines = reached.setdefault(next_state, {})
+                        for mines, ways in ways_by_mines.items():
+                            reached_by_mines[mines + has_mine] = reached_by_mines.get(mines + has_mine, 0) + ways
+            ways_to_reach.append(reached)
+
+        # Going backwards, ways_to_finish maps the states before deciding the cell at index to the
+        # number of ways to decide the rest of the cells, by mines placed in them
+        ways_to_finish = {(): {0: 1}} if () in ways_to_reach[-1] else {}
+        mine_arrangements = [{} for _ in self.cells]
+        for index in reversed(range(len(self.cells))):
+            _check_deadline(self.deadline)
+            finishing = {}
+            for state, ways_by_mines in ways_to_reach[index].items():
+                for has_mine in (0, 1):
+                    rest_by_mines = ways_to_finish.get(self._decide(index, state, has_mine))
+                    if not rest_by_mines:
+                        continue
+                    finishing_by_mines = finishing.setdefault(state, {})
+                    for rest_mines, rest in rest_by_mines.items():
+                        finishing_by_mines[rest_mines + has_mine] = finishing_by_mines.get(rest_mines + has_mine, 0) + rest
+                        if has_mine:
+                            cell_arrangements = mine_arrangements[index]
+                            for mines, ways in ways_by_mines.items():
+                                total = mines + 1 + rest_mines
+                                cell_arrangements[total] = cell_arrangements.get(total, 0) + ways * rest
+            ways_to_finish = finishing
+
+        # Empty when the flags do not match the numbers, nothing can be said about these cells then
+        arrangements = ways_to_finish.get((), {})
+        if not arrangements:
+            return {}, {}
+        return arrangements, dict(zip(self.cells, mine_arrangements))
+
+    def _decide(self, index, state, has_mine):
+        """
+        State after deciding whether the cell at index has a mine, None if a constraint can not be met anymore
+        """
+        needed_mines = dict(zip(self.open_constraints[index], state))
+        for constraint, cells_left in self.constraints_by_cell[index]:
+            needed = needed_mines.get(constraint, self.mine_counts[constraint]) - has_mine
+            if not 0 <= needed <= cells_left:
+                return None
+            needed_mines[constraint] = needed
+        return tuple(needed_mines[constraint] for constraint in self.open_constraints[index + 1])
@@ -0,0 +1,19 @@
+"""
+Streaming JSON rendering of games, for boards too big to build and render in one piece.
+"""
+import json
+
+from game.serializers import GameSummarySerializer
+
+_SEPARATORS = (',', ':')
+
+
+def stream_game_json(game):
+    """
+    Yields the same JSON object as GameSerializer, writing the board one column at a time
+    """
+    summary = json.dumps(GameSummarySerializer(game).data, separators=_SEPARATORS)
+    yield summary[:-1] + ',"board":['
+    for x_position, column in enumerate(game.iter_visible_columns()):
+        yield (',' if x_position else '') + json.dumps(column, separators=_SEPARATORS)
+    yield ']}'
@@ -1,8 +1,16 @@
 import pytest
 
+from game.cache import game_cache
 from game.minesweeper import MinesweeperCell
 
 
+@pytest.fixture(autouse=True)
+def empty_game_cache():
+    game_cache.clear()
+    yield
+    game_cache.clear()
+
+
 @pytest.fixture
 def board_5_by_5():
     return [
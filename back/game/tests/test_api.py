@@ -1,7 +1,10 @@
+import json
+
 import pytest
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from game.cache import game_cache
 from game.minesweeper import MinesweeperGame
 from game.models import Game
 
@@ -51,9 +54,53 @@ def test_list_minesweeper_returns_all_games():
 
     response = client.get(f'/api/minesweeper/', format='json')
     assert response.status_code == status.HTTP_200_OK
-    assert len(response.data) == 11
-    for game in response.data:
-        assert_starting_game_status(game)
+    assert len(response.data['results']) == 11
+    assert response.data['next'] is None
+    for game in response.data['results']:
+        assert 'board' not in game
+        assert game['rows'] == 10
+        assert not game['is_over']
+
+
+@pytest.mark.django_db
+def test_list_minesweeper_is_paginated_with_a_cursor():
+    client = APIClient()
+    for _ in range(5):
+        client.post('/api/minesweeper/', {'rows': 10, 'columns': 10, 'mines': 10}, format='json')
+
+    response = client.get('/api/minesweeper/', {'page_size': 3}, format='json')
+    assert [game['id'] for game in response.data['results']] == [5, 4, 3]
+
+    response = client.get(response.data['next'], format='json')
+    assert [game['id'] for game in response.data['results']] == [2, 1]
+    assert response.data['next'] is None
+
+
+@pytest.mark.django_db
+def test_list_minesweeper_includes_the_boards_only_when_asked_for():
+    client = APIClient()
+    client.post('/api/minesweeper/', {'rows': 10, 'columns': 10, 'mines': 10}, format='json')
+
+    response = client.get('/api/minesweeper/', {'include_board': 'true'}, format='json')
+    assert_starting_game_status(response.data['results'][0])
+
+
+@pytest.mark.django_db
+def test_list_minesweeper_filters_games_by_status():
+    client = APIClient()
+    for _ in range(3):
+        client.post('/api/minesweeper/', {'rows': 2, 'columns': 2, 'mines': 4}, format='json')
+    client.post('/api/minesweeper/2/reveal_cell/', data={'x_position': 0, 'y_position': 0}, format='json')
+
+    response = client.get('/api/minesweeper/', {'status': 'lost'}, format='json')
+    assert [game['id'] for game in response.data['results']] == [2]
+    response = client.get('/api/minesweeper/', {'status': 'in_progress'}, format='json')
+    assert [game['id'] for game in response.data['results']] == [3, 1]
+    response = client.get('/api/minesweeper/', {'status': 'won'}, format='json')
+    assert response.data['results'] == []
+
+    response = client.get('/api/minesweeper/', {'status': 'paused'}, format='json')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
 
 
 @pytest.mark.django_db
@@ -144,3 +191,323 @@ def test_cant_reveal_cell_if_game_is_over():
                            data={'x_position': 1, 'y_position': 1}, format='json')
     assert response.status_code == status.HTTP_400_BAD_REQUEST
     assert str(response.data[0]) == 'Can not reveal cell, the game is over.'
+
+
+@pytest.mark.django_db
+def test_new_games_place_their_mines_on_the_first_reveal_which_is_safe():
+    client = APIClient()
+    response = client.post('/api/minesweeper/', {'rows': 5, 'columns': 5, 'mines': 24}, format='json')
+    assert response.status_code == status.HTTP_201_CREATED
+    game_id = response.data['id']
+    assert Game.objects.get(id=game_id).board is None
+
+    response = client.post(f'/api/minesweeper/{game_id}/reveal_cell/',
+                           data={'x_position': 2, 'y_position': 2}, format='json')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['board'][2][2] == '8'
+    assert not response.data['is_over']
+    assert Game.objects.get(id=game_id).board is not None
+
+
+@pytest.mark.django_db
+def test_board_region_returns_the_visible_state_of_the_region():
+    minesweeper_game = MinesweeperGame.new_game(20, 15, 40, seed=5)
+    minesweeper_game.reveal_cell_position(*next(
+        (x_position, y_position) for x_position in range(20) for y_position in range(15)
+        if not minesweeper_game.get_cell(x_position, y_position).has_mine
+    ))
+    game = Game.objects.create_from_minesweeper_game(minesweeper_game)
+    minesweeper_game.set_flag_on_cell_position(*next(
+        (x_position, y_position) for x_position in range(4, 8) for y_position in range(3, 12)
+        if not minesweeper_game.get_cell(x_position, y_position).is_revealed
+    ), is_flagged=True)
+    game.update_from_minesweeper_game(minesweeper_game)
+    board = [[str(state) for state in column] for column in minesweeper_game.visible_board]
+    client = APIClient()
+
+    for cached in (True, False):
+        if not cached:
+            game_cache.clear()
+        response = client.get(f'/api/minesweeper/{game.id}/board_region/',
+                              {'x0': 4, 'y0': 3, 'w': 4, 'h': 9}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['board'] == [column[3:12] for column in board[4:8]]
+        assert response.data['region'] == {'x0': 4, 'y0': 3, 'w': 4, 'h': 9}
+
+    response = client.get(f'/api/minesweeper/{game.id}/board_region/',
+                          {'x0': 18, 'y0': 10, 'w': 5, 'h': 10}, format='json')
+    assert response.data['board'] == [column[10:] for column in board[18:]]
+
+
+@pytest.mark.django_db
+def test_board_region_requires_a_valid_region():
+    client = APIClient()
+    response = client.post('/api/minesweeper/', {'rows': 5, 'columns': 5, 'mines': 5}, format='json')
+    game_id = response.data['id']
+
+    response = client.get(f'/api/minesweeper/{game_id}/board_region/', {'x0': 0, 'y0': 0}, format='json')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = client.get(f'/api/minesweeper/{game_id}/board_region/',
+                          {'x0': 0, 'y0': 0, 'w': 0, 'h': 2}, format='json')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_moves_can_return_only_a_region_of_the_board(board_5_by_5):
+    board_5_by_5[4][4].add_mine()
+    game = Game.objects.create_from_minesweeper_game(MinesweeperGame.from_board(board_5_by_5))
+
+    response = APIClient().post(f'/api/minesweeper/{game.id}/flag_cell/?x0=3&y0=3&w=2&h=2',
+                                data={'x_position': 4, 'y_position': 4, 'is_flagged': True}, format='json')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['board'] == [['hidden', 'hidden'], ['hidden', 'flag']]
+    assert response.data['region'] == {'x0': 3, 'y0': 3, 'w': 2, 'h': 2}
+
+
+@pytest.mark.django_db
+def test_moves_can_return_only_the_changed_cells(board_5_by_5):
+    board_5_by_5[2][0].add_mine()
+    board_5_by_5[2][1].add_mine()
+    board_5_by_5[2][2].add_mine()
+    board_5_by_5[1][2].add_mine()
+    board_5_by_5[0][2].add_mine()
+    game = Game.objects.create_from_minesweeper_game(MinesweeperGame.from_board(board_5_by_5))
+    client = APIClient()
+
+    response = client.post(f'/api/minesweeper/{game.id}/reveal_cell/?response=changes',
+                           data={'x_position': 0, 'y_position': 0}, format='json')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {
+        'id': game.id,
+        'was_lost': False,
+        'was_won': False,
+        'is_over': False,
+        'version': 1,
+        'changed_cells': [
+            {'x_position': 0, 'y_position': 0, 'state': '0'},
+            {'x_position': 0, 'y_position': 1, 'state': '2'},
+            {'x_position': 1, 'y_position': 0, 'state': '2'},
+            {'x_position': 1, 'y_position': 1, 'state': '5'},
+        ]
+    }
+
+    response = client.post(f'/api/minesweeper/{game.id}/flag_cell/?response=changes',
+                           data={'x_position': 2, 'y_position': 2, 'is_flagged': True}, format='json')
+    assert response.data['version'] == 2
+    assert response.data['changed_cells'] == [{'x_position': 2, 'y_position': 2, 'state': 'flag'}]
+
+
+@pytest.mark.django_db
+def test_moves_applies_all_the_moves_and_saves_the_game_once(board_5_by_5):
+    board_5_by_5[0][0].add_mine()
+    board_5_by_5[4][4].add_mine()
+    game = Game.objects.create_from_minesweeper_game(MinesweeperGame.from_board(board_5_by_5))
+    client = APIClient()
+
+    response = client.post(f'/api/minesweeper/{game.id}/moves/', data={'moves': [
+        {'type': 'flag', 'x_position': 0, 'y_position': 0, 'is_flagged': True},
+        {'type': 'reveal', 'x_position': 0, 'y_position': 0},
+        {'type': 'reveal', 'x_position': 1, 'y_position': 0},
+        {'type': 'flag', 'x_position': 4, 'y_position': 4, 'is_flagged': True},
+        {'type': 'reveal', 'x_position': 2, 'y_position': 2},
+        {'type': 'reveal', 'x_position': 3, 'y_position': 3},
+    ]}, format='json')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['was_won']
+    assert response.data['version'] == 1
+    results = response.data['results']
+    assert len(results) == 5
+    assert results[0]['changed_cells'] == [{'x_position': 0, 'y_position': 0, 'state': 'flag'}]
+    assert results[1]['error'] == 'Can not reveal cell, it is flagged.'
+    assert results[2]['changed_cells'] == [{'x_position': 1, 'y_position': 0, 'state': '1'}]
+    assert len(results[4]['changed_cells']) == 22
+
+    game.refresh_from_db()
+    assert game.version == 1
+    assert game.was_won
+    assert game.moves.count() == 1
+
+
+@pytest.mark.django_db
+def test_moves_validates_every_move():
+    client = APIClient()
+    response = client.post('/api/minesweeper/', {'rows': 5, 'columns': 5, 'mines': 5}, format='json')
+    game_id = response.data['id']
+
+    response = client.post(f'/api/minesweeper/{game_id}/moves/', data={'moves': [
+        {'type': 'reveal', 'x_position': 0, 'y_position': 0},
+        {'type': 'flag', 'x_position': 1, 'y_position': 1},
+    ]}, format='json')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = client.post(f'/api/minesweeper/{game_id}/moves/', data={'moves': [
+        {'type': 'jump', 'x_position': 0, 'y_position': 0},
+    ]}, format='json')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert Game.objects.get(id=game_id).version == 0
+
+
+@pytest.mark.django_db
+def test_retrieve_streams_big_boards_with_the_same_json(settings):
+    minesweeper_game = MinesweeperGame.new_game(37, 23, 60, seed=5)
+    game = Game.objects.create_from_minesweeper_game(minesweeper_game)
+    client = APIClient()
+    client.post(f'/api/minesweeper/{game.id}/reveal_cell/', {'x_position': 3, 'y_position': 4}, format='json')
+    client.post(f'/api/minesweeper/{game.id}/flag_cell/', {'x_position': 30, 'y_position': 20, 'is_flagged': True},
+                format='json')
+    expected = client.get(f'/api/minesweeper/{game.id}/').json()
+
+    settings.MINESWEEPER_STREAMED_BOARD_CELLS = 0
+    game_cache.clear()
+    response = client.get(f'/api/minesweeper/{game.id}/')
+
+    assert response.streaming
+    assert json.loads(b''.join(response.streaming_content)) == expected
+
+
+@pytest.mark.django_db
+def test_visible_columns_are_the_same_whatever_the_strip_size():
+    game = Game.objects.create_from_minesweeper_game(MinesweeperGame.new_lazy_game(9, 7, 10, seed=2))
+    minesweeper_game = game.to_minesweeper_game()
+    minesweeper_game.reveal_cell_position(4, 4)
+    game.update_from_minesweeper_game(minesweeper_game)
+    minesweeper_game.set_flag_on_cell_position(0, 0, is_flagged=True)
+    game.update_from_minesweeper_game(minesweeper_game)
+
+    expected = game.get_visible_board()
+    for strip_cells in (1, 7, 20, 63, 1000):
+        assert list(game.iter_visible_columns(strip_cells)) == expected
+
+
+@pytest.mark.django_db
+def test_chord_cell_reveals_the_neighbours_in_one_saved_move(board_5_by_5):
+    board_5_by_5[2][0].add_mine()
+    game = Game.objects.create_from_minesweeper_game(MinesweeperGame.from_board(board_5_by_5))
+    client = APIClient()
+    client.post(f'/api/minesweeper/{game.id}/moves/', data={'moves': [
+        {'type': 'reveal', 'x_position': 2, 'y_position': 1},
+        {'type': 'flag', 'x_position': 2, 'y_position': 0, 'is_flagged': True},
+    ]}, format='json')
+
+    response = client.post(f'/api/minesweeper/{game.id}/chord_cell/?response=changes',
+                           {'x_position': 2, 'y_position': 1}, format='json')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['was_won']
+    assert response.data['version'] == 2
+    assert len(response.data['changed_cells']) == 23
+
+
+@pytest.mark.django_db
+def test_chord_cell_of_a_hidden_cell_answers_bad_request(board_5_by_5):
+    game = Game.objects.create_from_minesweeper_game(MinesweeperGame.from_board(board_5_by_5))
+    client = APIClient()
+
+    response = client.post(f'/api/minesweeper/{game.id}/chord_cell/', {'x_position': 2, 'y_position': 1},
+                           format='json')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data == ['Can not chord cell, it is not revealed.']
+
+    response = client.post(f'/api/minesweeper/{game.id}/moves/', data={'moves': [
+        {'type': 'chord', 'x_position': 2, 'y_position': 1},
+    ]}, format='json')
+    assert response.data['results'][0]['error'] == 'Can not chord cell, it is not revealed.'
+
+
+@pytest.mark.django_db
+def test_hint_returns_the_safe_cells_and_mines_of_the_visible_board():
+    game = MinesweeperGame(3, 2, 2, bytearray([0, 1, 0, 0, 0, 1]))
+    for x_position in range(3):
+        game.reveal_cell_position(x_position, 0)
+    game = Game.objects.create_from_minesweeper_game(game)
+
+    response = APIClient().get(f'/api/minesweeper/{game.id}/hint/?time_budget=0.5')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {
+        'safe_cells': [{'x_position': 1, 'y_position': 1}],
+        'mines': [{'x_position': 0, 'y_position': 1}, {'x_position': 2, 'y_position': 1}],
+        'probabilities': [],
+        'best_guess': {'x_position': 1, 'y_position': 1, 'probability': 0.0},
+        'complete': True,
+    }
+
+
+@pytest.mark.django_db
+def test_hint_requires_a_positive_time_budget_and_a_game_in_progress(board_5_by_5):
+    board_5_by_5[0][0].add_mine()
+    minesweeper_game = MinesweeperGame.from_board(board_5_by_5)
+    game = Game.objects.create_from_minesweeper_game(minesweeper_game)
+    client = APIClient()
+
+    for time_budget in ('soon', '0'):
+        response = client.get(f'/api/minesweeper/{game.id}/hint/?time_budget={time_budget}')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    client.post(f'/api/minesweeper/{game.id}/reveal_cell/', {'x_position': 0, 'y_position': 0}, format='json')
+    response = client.get(f'/api/minesweeper/{game.id}/hint/')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data == ['Can not give a hint, the game is over.']
+
+
+@pytest.mark.django_db
+def test_create_game_without_rows_returns_empty_columns():
+    response = APIClient().post('/api/minesweeper/', {'rows': 0, 'columns': 5, 'mines': 0}, format='json')
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.data['board'] == [[], [], [], [], []]
+
+
+@pytest.mark.django_db
+def test_chord_cell_out_of_the_board_answers_bad_request(board_5_by_5):
+    game = Game.objects.create_from_minesweeper_game(MinesweeperGame.from_board(board_5_by_5))
+    client = APIClient()
+
+    for position in ({'x_position': 10, 'y_position': 0}, {'x_position': -1, 'y_position': 0},
+                     {'x_position': 'a', 'y_position': 0}, {'x_position': 0}):
+        response = client.post(f'/api/minesweeper/{game.id}/chord_cell/', position, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data == {'y_position': ['This field is required.']}
+    assert client.post(f'/api/minesweeper/{game.id}/chord_cell/', {'x_position': 10, 'y_position': 0},
+                       format='json').data == ['Cell position out of the board']
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('endpoint, extra_fields', [('reveal_cell', {}), ('flag_cell', {'is_flagged': True})])
+def test_moves_out_of_the_board_or_with_invalid_positions_answer_bad_request(board_5_by_5, endpoint, extra_fields):
+    game = Game.objects.create_from_minesweeper_game(MinesweeperGame.from_board(board_5_by_5))
+    client = APIClient()
+
+    for position in ({'x_position': 10, 'y_position': 0}, {'x_position': 0, 'y_position': -1},
+                     {'x_position': 'a', 'y_position': 0}, {'x_position': 0}):
+        response = client.post(f'/api/minesweeper/{game.id}/{endpoint}/', dict(position, **extra_fields),
+                               format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = client.post(f'/api/minesweeper/{game.id}/{endpoint}/',
+                           dict({'x_position': 10, 'y_position': 0}, **extra_fields), format='json')
+    assert response.data == ['Cell position out of the board']
+    assert Game.objects.get(id=game.id).version == 0
+
+
+@pytest.mark.django_db
+def test_flag_cell_requires_is_flagged(board_5_by_5):
+    game = Game.objects.create_from_minesweeper_game(MinesweeperGame.from_board(board_5_by_5))
+
+    response = APIClient().post(f'/api/minesweeper/{game.id}/flag_cell/', {'x_position': 0, 'y_position': 0},
+                                format='json')
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data == {'non_field_errors': ['is_flagged is required for flag moves']}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('endpoint', ['reveal_cell', 'flag_cell', 'chord_cell'])
+def test_moves_given_as_a_json_array_answer_bad_request(board_5_by_5, endpoint):
+    game = Game.objects.create_from_minesweeper_game(MinesweeperGame.from_board(board_5_by_5))
+
+    response = APIClient().post(f'/api/minesweeper/{game.id}/{endpoint}/', [0, 0], format='json')
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data == ['The move must be given as an object']
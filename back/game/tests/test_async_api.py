@@ -0,0 +1,86 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from rest_framework import status
+
+from game.minesweeper import MinesweeperGame
+from game.models import Game
+
+
+@async_to_sync
+async def post(path, data):
+    return await AsyncClient().post(path, data, content_type='application/json')
+
+
+@async_to_sync
+async def get(path):
+    return await AsyncClient().get(path)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_create_returns_the_new_hidden_game():
+    response = post('/api/async/minesweeper/', {'rows': 10, 'columns': 8, 'mines': 10})
+    assert response.status_code == status.HTTP_201_CREATED
+    data = response.json()
+    assert Game.objects.filter(id=data['id']).exists()
+    assert len(data['board']) == 8
+    assert all(cell == 'hidden' for column in data['board'] for cell in column)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_create_with_an_invalid_game_answers_bad_request():
+    response = post('/api/async/minesweeper/', {'rows': 10})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert 'columns' in response.json()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_retrieve_answers_the_same_as_the_sync_endpoint(board_5_by_5):
+    board_5_by_5[1][1].has_mine = True
+    game = Game.objects.create_from_minesweeper_game(MinesweeperGame.from_board(board_5_by_5))
+    response = get(f'/api/async/minesweeper/{game.id}/')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == get(f'/api/minesweeper/{game.id}/').json()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_retrieve_of_a_missing_game_answers_not_found():
+    assert get('/api/async/minesweeper/1234/').status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_reveal_and_flag_save_the_moves(board_5_by_5):
+    board_5_by_5[4][4].has_mine = True
+    game = Game.objects.create_from_minesweeper_game(MinesweeperGame.from_board(board_5_by_5))
+
+    response = post(f'/api/async/minesweeper/{game.id}/flag_cell/', {'x_position': 4, 'y_position': 4,
+                                                                      'is_flagged': True})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['board'][4][4] == 'flag'
+
+    response = post(f'/api/async/minesweeper/{game.id}/reveal_cell/', {'x_position': 0, 'y_position': 0})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['was_won']
+
+    game.refresh_from_db()
+    assert game.version == 2
+    assert game.was_won
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_moves_that_can_not_be_made_answer_bad_request(board_5_by_5):
+    game = Game.objects.create_from_minesweeper_game(MinesweeperGame.from_board(board_5_by_5))
+    post(f'/api/async/minesweeper/{game.id}/flag_cell/', {'x_position': 0, 'y_position': 0, 'is_flagged': True})
+
+    response = post(f'/api/async/minesweeper/{game.id}/reveal_cell/', {'x_position': 0, 'y_position': 0})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == ['Can not reveal cell, it is flagged.']
+
+    response = post(f'/api/async/minesweeper/{game.id}/reveal_cell/', {'x_position': 0})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert 'y_position' in response.json()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_endpoints_only_answer_their_methods():
+    assert get('/api/async/minesweeper/').status_code == status.HTTP_405_METHOD_NOT_ALLOWED
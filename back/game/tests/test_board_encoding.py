@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+from game.board_encoding import encode_board, decode_board, decode_board_range, BoardEncodingException, \
+    FORMAT_VERSION, lz4
+from game.minesweeper import MINE, REVEALED, FLAGGED
+
+compressions = [None, 'zlib', pytest.param('lz4', marks=pytest.mark.skipif(lz4 is None, reason='lz4 not installed'))]
+
+
+@pytest.mark.parametrize('compression', compressions)
+@pytest.mark.parametrize('size', [1, 7, 8, 9, 100, 1001])
+def test_decoding_an_encoded_board_gives_back_the_same_cells(size, compression):
+    rng = random.Random(size)
+    cells = bytearray(rng.choice([0, MINE, REVEALED, FLAGGED, MINE | REVEALED, MINE | FLAGGED]) for _ in range(size))
+
+    data = encode_board(cells, compression)
+
+    assert data[0] == FORMAT_VERSION
+    assert decode_board(data, size) == cells
+
+
+def test_encoded_board_uses_three_bits_per_cell_without_compression():
+    data = encode_board(bytearray(800))
+    assert len(data) == 2 + 3 * 100
+
+
+def test_cant_decode_a_board_with_an_unknown_format_version():
+    data = bytearray(encode_board(bytearray(10)))
+    data[0] = FORMAT_VERSION + 1
+
+    with pytest.raises(BoardEncodingException) as excinfo:
+        decode_board(data, 10)
+    assert str(excinfo.value) == f"Unknown board format version {FORMAT_VERSION + 1}"
+
+
+@pytest.mark.parametrize('start,stop', [(0, 1), (3, 17), (8, 16), (95, 100), (0, 100)])
+def test_decoding_a_range_of_the_board_gives_back_those_cells(start, stop):
+    rng = random.Random(start)
+    cells = bytearray(rng.choice([0, MINE, REVEALED, FLAGGED, MINE | FLAGGED]) for _ in range(100))
+
+    assert decode_board_range(encode_board(cells, 'zlib'), 100, start, stop) == cells[start:stop]
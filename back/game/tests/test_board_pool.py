@@ -0,0 +1,86 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from game.board_pool import fill_board_pool, get_pool_stats
+from game.minesweeper import MinesweeperGame, MINE
+from game.models import PooledBoard, Game
+from game.no_guess import generate_no_guess_board, plays_without_guessing
+
+
+def get_mine_plane(minesweeper_game):
+    return bytes(cell & MINE for cell in minesweeper_game.cells)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_generated_boards_are_cleared_from_the_start_cell_without_guessing(seed):
+    cells, start_position, attempts = generate_no_guess_board(16, 16, 40, seed=seed)
+
+    assert sum(cell & MINE for cell in cells) == 40
+    assert start_position == (8, 8)
+    assert attempts >= 1
+    assert not any(cells[x_position * 16 + y_position] & MINE for x_position in (7, 8, 9) for y_position in (7, 8, 9))
+    assert plays_without_guessing(MinesweeperGame(16, 16, 40, cells), start_position)
+
+
+def test_boards_that_need_a_guess_are_not_kept():
+    # The two cells left after the start reveal can not be told apart
+    game = MinesweeperGame(2, 2, 1, bytearray([0, MINE, 0, 0]))
+    assert not plays_without_guessing(game, (1, 0))
+
+
+def test_boards_without_room_around_the_start_cell_only_keep_it_safe():
+    cells, start_position, _ = generate_no_guess_board(3, 3, 8, seed=1)
+    assert cells[start_position[0] * 3 + start_position[1]] == 0
+    assert sum(cells) == 8
+
+
+@pytest.mark.django_db
+def test_pool_is_filled_by_workers_and_boards_are_popped_once(settings):
+    settings.MINESWEEPER_BOARD_POOL = dict(settings.MINESWEEPER_BOARD_POOL, SIZES=[(9, 9, 10)], DEPTH=5)
+
+    assert fill_board_pool(9, 9, 10, 3, workers=2) == (3, 0)
+
+    stats = get_pool_stats()
+    assert [(size['columns'], size['rows'], size['mines'], size['depth'], size['target_depth']) for size in stats] == [
+        (9, 9, 10, 3, 5)
+    ]
+    assert stats[0]['boards_per_second_per_worker'] > 0
+    popped = {PooledBoard.objects.pop(9, 9, 10).id for _ in range(3)}
+    assert len(popped) == 3
+    assert PooledBoard.objects.pop(9, 9, 10) is None
+
+
+@pytest.mark.django_db
+def test_fill_board_pool_command_tops_up_each_size(settings):
+    settings.MINESWEEPER_BOARD_POOL = dict(settings.MINESWEEPER_BOARD_POOL, SIZES=[(9, 9, 10), (8, 8, 10)], DEPTH=2)
+    fill_board_pool(9, 9, 10, 1, workers=1)
+    output = StringIO()
+
+    call_command('fill_board_pool', '--workers', '1', stdout=output)
+
+    assert PooledBoard.objects.for_size(9, 9, 10).count() == 2
+    assert PooledBoard.objects.for_size(8, 8, 10).count() == 2
+    assert '9x9 with 10 mines: 1 boards added' in output.getvalue()
+
+
+@pytest.mark.django_db
+def test_no_guess_games_start_from_a_pooled_board():
+    fill_board_pool(9, 9, 10, 1, workers=1)
+    pooled_board = PooledBoard.objects.get()
+    client = APIClient()
+    data = {'rows': 9, 'columns': 9, 'mines': 10, 'no_guess': True}
+
+    response = client.post('/api/minesweeper/', data, format='json')
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert 'no_guess' not in response.data
+    assert response.data['board'][pooled_board.start_x_position][pooled_board.start_y_position] == '0'
+    game = Game.objects.get(id=response.data['id'])
+    assert get_mine_plane(game.to_minesweeper_game()) == get_mine_plane(pooled_board.to_minesweeper_game())
+
+    response = client.post('/api/minesweeper/', data, format='json')
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
@@ -0,0 +1,76 @@
+from unittest import mock
+
+import pytest
+from rest_framework.test import APIClient
+
+from game.cache import GameCache, game_cache
+from game.minesweeper import MinesweeperGame
+from game.models import Game
+
+
+def test_cached_game_is_only_returned_for_the_same_version():
+    cache = GameCache(max_cells=100, ttl=60)
+    minesweeper_game = MinesweeperGame.new_game(5, 5, 5)
+    cache.put(1, 3, minesweeper_game)
+
+    assert cache.take(1, 4) is None
+    cache.put(1, 3, minesweeper_game)
+    assert cache.take(1, 3) is minesweeper_game
+    assert cache.take(1, 3) is None
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 2
+
+
+def test_least_recently_used_games_are_evicted_when_the_cells_do_not_fit():
+    cache = GameCache(max_cells=60, ttl=60)
+    first, second, third = (MinesweeperGame.new_game(5, 5, 5) for _ in range(3))
+    cache.put(1, 0, first)
+    cache.put(2, 0, second)
+    cache.put(1, 0, cache.take(1, 0))
+    cache.put(3, 0, third)
+
+    assert cache.take(2, 0) is None
+    assert cache.take(1, 0) is first
+    assert cache.take(3, 0) is third
+    assert cache.stats()['evictions'] == 1
+
+
+def test_expired_games_are_not_returned():
+    cache = GameCache(max_cells=100, ttl=60)
+    with mock.patch('game.cache.time.monotonic', return_value=1000):
+        cache.put(1, 0, MinesweeperGame.new_game(5, 5, 5))
+    with mock.patch('game.cache.time.monotonic', return_value=1061):
+        assert cache.take(1, 0) is None
+
+
+@pytest.mark.django_db
+def test_moves_on_a_hot_game_do_not_load_the_board_again(board_5_by_5):
+    board_5_by_5[4][4].add_mine()
+    game = Game.objects.create_from_minesweeper_game(MinesweeperGame.from_board(board_5_by_5))
+    client = APIClient()
+
+    with mock.patch.object(Game, 'to_minesweeper_game') as to_minesweeper_game:
+        response = client.post(f'/api/minesweeper/{game.id}/flag_cell/',
+                               data={'x_position': 4, 'y_position': 4, 'is_flagged': True}, format='json')
+        assert response.data['board'][4][4] == 'flag'
+        response = client.post(f'/api/minesweeper/{game.id}/reveal_cell/',
+                               data={'x_position': 0, 'y_position': 0}, format='json')
+        assert response.data['was_won']
+    to_minesweeper_game.assert_not_called()
+    assert game_cache.stats()['misses'] == 0
+
+
+@pytest.mark.django_db
+def test_games_changed_elsewhere_are_loaded_again(board_5_by_5):
+    minesweeper_game = MinesweeperGame.from_board(board_5_by_5)
+    game = Game.objects.create_from_minesweeper_game(minesweeper_game)
+
+    other_process_game = Game.objects.get(id=game.id).to_minesweeper_game()
+    other_process_game.set_flag_on_cell_position(0, 0, is_flagged=True)
+    Game.objects.get(id=game.id).update_from_minesweeper_game(other_process_game)
+    game_cache.invalidate(game.id)
+    game_cache.put(game.id, 0, minesweeper_game)
+
+    response = APIClient().get(f'/api/minesweeper/{game.id}/', format='json')
+    assert response.data['board'][0][0] == 'flag'
+    assert game_cache.stats()['misses'] == 1
@@ -0,0 +1,100 @@
+import threading
+
+import pytest
+from django.db import connection
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from game.cache import game_cache
+from game.minesweeper import MinesweeperGame
+from game.models import Game, GameVersionConflict
+
+
+@pytest.mark.django_db
+def test_saving_a_game_loaded_before_another_save_raises_a_conflict(board_5_by_5):
+    game = Game.objects.create_from_minesweeper_game(MinesweeperGame.from_board(board_5_by_5))
+    stale_game = Game.objects.get(id=game.id)
+
+    minesweeper_game = game.to_minesweeper_game()
+    minesweeper_game.set_flag_on_cell_position(0, 0, is_flagged=True)
+    game.update_from_minesweeper_game(minesweeper_game)
+
+    stale_minesweeper_game = stale_game.to_minesweeper_game()
+    stale_minesweeper_game.set_flag_on_cell_position(1, 1, is_flagged=True)
+    with pytest.raises(GameVersionConflict):
+        stale_game.update_from_minesweeper_game(stale_minesweeper_game)
+
+    game.refresh_from_db()
+    assert game.version == 1
+    assert [move.changes for move in game.moves.all()] == [[[0, 0, False, True]]]
+
+
+@pytest.mark.django_db
+def test_move_is_made_again_on_top_of_a_move_saved_by_another_request(board_5_by_5, monkeypatch):
+    game = Game.objects.create_from_minesweeper_game(MinesweeperGame.from_board(board_5_by_5))
+    original_update = Game.update_from_minesweeper_game
+
+    def update_after_another_request(self, minesweeper_game):
+        monkeypatch.setattr(Game, 'update_from_minesweeper_game', original_update)
+        other_request_game = Game.objects.get(id=self.id)
+        other_minesweeper_game = other_request_game.to_minesweeper_game()
+        other_minesweeper_game.set_flag_on_cell_position(4, 4, is_flagged=True)
+        other_request_game.update_from_minesweeper_game(other_minesweeper_game)
+        return original_update(self, minesweeper_game)
+
+    monkeypatch.setattr(Game, 'update_from_minesweeper_game', update_after_another_request)
+    response = APIClient().post(f'/api/minesweeper/{game.id}/flag_cell/',
+                                data={'x_position': 0, 'y_position': 0, 'is_flagged': True}, format='json')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['version'] == 2
+    assert response.data['board'][0][0] == 'flag'
+    assert response.data['board'][4][4] == 'flag'
+
+
+@pytest.mark.django_db
+def test_move_answers_conflict_when_the_game_keeps_changing(board_5_by_5, settings, monkeypatch):
+    settings.MINESWEEPER_MOVE_RETRIES = 2
+    game = Game.objects.create_from_minesweeper_game(MinesweeperGame.from_board(board_5_by_5))
+
+    def always_conflict(self, minesweeper_game):
+        raise GameVersionConflict()
+
+    monkeypatch.setattr(Game, 'update_from_minesweeper_game', always_conflict)
+    response = APIClient().post(f'/api/minesweeper/{game.id}/flag_cell/',
+                                data={'x_position': 0, 'y_position': 0, 'is_flagged': True}, format='json')
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+
+@pytest.mark.django_db(transaction=True)
+def test_parallel_moves_on_the_same_game_are_never_lost(settings):
+    settings.MINESWEEPER_MOVE_RETRIES = 100
+    columns, rows, threads = 8, 8, 8
+    game = Game.objects.create_from_minesweeper_game(MinesweeperGame.new_game(columns, rows, 1, seed=1))
+    errors = []
+
+    def flag_column(x_position):
+        client = APIClient()
+        try:
+            for y_position in range(rows):
+                response = client.post(f'/api/minesweeper/{game.id}/flag_cell/?response=changes',
+                                       data={'x_position': x_position, 'y_position': y_position,
+                                             'is_flagged': True}, format='json')
+                if response.status_code != status.HTTP_200_OK:
+                    errors.append(response.status_code)
+        finally:
+            connection.close()
+
+    workers = [threading.Thread(target=flag_column, args=(x_position,)) for x_position in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert errors == []
+    game_cache.clear()
+    game.refresh_from_db()
+    assert game.version == columns * rows
+    minesweeper_game = game.to_minesweeper_game()
+    assert all(cell.is_flagged for column in minesweeper_game.board for cell in column)
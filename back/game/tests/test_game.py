@@ -1,7 +1,10 @@
+import pickle
+import random
+
 import pytest
 
 from game.minesweeper import MinesweeperGame, MinesweeperException, VisibleCellState, MinesweeperCell, HiddenCellState, \
-    MineCellState, EmptyCellState, FlaggedCellState
+    MineCellState, EmptyCellState, FlaggedCellState, MINE
 
 
 def test_cant_create_game_with_more_mines_than_cells():
@@ -291,3 +294,288 @@ def test_player_wins_the_game_when_all_mines_are_flagged_and_no_other_cells_are_
     assert game.visible_board == expected_board
     assert game.is_over
     assert game.was_won
+
+
+def test_revealing_a_large_blank_area_does_not_hit_the_recursion_limit():
+    board = [
+        [MinesweeperCell(x_position, y_position) for y_position in range(300)] for x_position in range(300)
+    ]
+    game = MinesweeperGame.from_board(board)
+
+    cell_state = game.reveal_cell_position(150, 150)
+
+    assert cell_state == EmptyCellState(0)
+    assert len(game.changed_positions) == 300 * 300
+    assert game.was_won
+
+
+def test_revealing_a_cell_reports_the_positions_it_changed(board_5_by_5):
+    board_5_by_5[2][0].add_mine()
+    board_5_by_5[2][1].add_mine()
+    board_5_by_5[2][2].add_mine()
+    board_5_by_5[1][2].add_mine()
+    board_5_by_5[0][2].add_mine()
+    game = MinesweeperGame.from_board(board_5_by_5)
+
+    game.reveal_cell_position(0, 0)
+    assert game.changed_positions == {(0, 0), (0, 1), (1, 0), (1, 1)}
+
+    game.reveal_cell_position(0, 0)
+    assert game.changed_positions == set()
+
+    game.set_flag_on_cell_position(4, 4, is_flagged=True)
+    assert game.changed_positions == {(4, 4)}
+    game.set_flag_on_cell_position(4, 4, is_flagged=True)
+    assert game.changed_positions == set()
+
+
+def test_revealing_a_blank_area_with_a_flagged_cell_fails_without_revealing_anything(board_5_by_5):
+    board_5_by_5[4][4].add_mine()
+    game = MinesweeperGame.from_board(board_5_by_5)
+    game.set_flag_on_cell_position(2, 2, is_flagged=True)
+
+    with pytest.raises(MinesweeperException) as excinfo:
+        game.reveal_cell_position(0, 0)
+    assert str(excinfo.value) == "Can not reveal cell, it is flagged."
+
+    hidden = HiddenCellState()
+    assert all(state in (hidden, FlaggedCellState()) for column in game.visible_board for state in column)
+
+
+def test_flagged_mines_still_count_as_adjacent_mines(board_5_by_5):
+    board_5_by_5[0][0].add_mine()
+    board_5_by_5[0][0].is_flagged = True
+    board_5_by_5[2][0].add_mine()
+
+    game = MinesweeperGame.from_board(board_5_by_5)
+
+    cell_state = game.reveal_cell_position(1, 0)
+    assert cell_state == EmptyCellState(2)
+    assert game.get_cell(0, 0).visible_state == FlaggedCellState()
+    assert game.get_cell(0, 0).has_mine
+
+
+@pytest.mark.parametrize('columns,rows', [(1, 1), (1, 7), (7, 1), (2, 2), (9, 5), (5, 9), (30, 30)])
+def test_adjacent_mine_counts_match_counting_the_neighbours_of_each_cell(columns, rows):
+    game = MinesweeperGame.new_game(columns, rows, (columns * rows) // 3)
+
+    for x_position in range(columns):
+        for y_position in range(rows):
+            cell = game.get_cell(x_position, y_position)
+            expected_count = sum(adj_cell.has_mine for adj_cell in cell.adjacent_cells)
+            assert game.adjacent_mine_counts[x_position * rows + y_position] == expected_count
+            assert cell.as_json()['adjacent_mine_count'] == expected_count
+
+
+def test_games_created_with_the_same_seed_have_the_same_mines():
+    game = MinesweeperGame.new_game(30, 20, 100, seed=42)
+    same_seed_game = MinesweeperGame.new_game(30, 20, 100, seed=42)
+    other_seed_game = MinesweeperGame.new_game(30, 20, 100, seed=43)
+
+    assert game.cells == same_seed_game.cells
+    assert game.cells != other_seed_game.cells
+    assert sum(cell.has_mine for column in game.board for cell in column) == 100
+
+
+def test_lazy_game_places_its_mines_on_the_first_reveal_avoiding_the_revealed_cell():
+    for seed in range(20):
+        game = MinesweeperGame.new_lazy_game(5, 5, 24, seed=seed)
+        assert not game.mines_placed
+        assert not any(cell.has_mine for column in game.board for cell in column)
+
+        cell_state = game.reveal_cell_position(2, 3)
+
+        assert cell_state == EmptyCellState(8)
+        assert game.mines_placed
+        assert sum(cell.has_mine for column in game.board for cell in column) == 24
+        assert not game.is_over
+
+
+def test_lazy_game_keeps_the_flags_set_before_the_first_reveal():
+    game = MinesweeperGame.new_lazy_game(10, 10, 10, seed=1)
+    game.set_flag_on_cell_position(9, 9, is_flagged=True)
+
+    game.reveal_cell_position(0, 0)
+
+    assert game.get_cell(9, 9).visible_state == FlaggedCellState()
+
+
+def test_lazy_games_with_the_same_seed_and_first_reveal_have_the_same_mines():
+    game = MinesweeperGame.new_lazy_game(30, 20, 100, seed=7)
+    same_seed_game = MinesweeperGame.new_lazy_game(30, 20, 100, seed=7)
+
+    game.reveal_cell_position(3, 4)
+    same_seed_game.reveal_cell_position(3, 4)
+
+    assert game.cells == same_seed_game.cells
+
+
+def test_lazy_game_full_of_mines_loses_on_the_first_reveal():
+    game = MinesweeperGame.new_lazy_game(3, 3, 9, seed=1)
+
+    cell_state = game.reveal_cell_position(1, 1)
+
+    assert cell_state == MineCellState()
+    assert game.was_lost
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_zero_region_index_gives_the_same_blank_areas_as_searching_the_board(seed):
+    game = MinesweeperGame.new_game(25, 15, 40, seed=seed)
+    for index in range(len(game.cells)):
+        if not game.get_cell(*divmod(index, game.rows)).has_mine and game.adjacent_mine_counts[index] == 0:
+            assert game._get_blank_area(index) == set(game._search_blank_area(index))
+
+
+def test_zero_region_index_is_built_again_when_a_lazy_game_places_its_mines():
+    game = MinesweeperGame.new_lazy_game(20, 20, 40, seed=3)
+    empty_board_regions = game._get_zero_regions()
+
+    game.reveal_cell_position(10, 10)
+
+    assert game._get_zero_regions() is not empty_board_regions
+    assert game.get_cell(10, 10).is_revealed
+
+
+def test_revealing_a_blank_cell_next_to_revealed_blank_cells_only_goes_through_hidden_cells(board_5_by_5):
+    board_5_by_5[4][0].has_mine = True
+    board_5_by_5[0][2].is_revealed = True
+    board_5_by_5[1][2].is_revealed = True
+    board_5_by_5[2][2].is_revealed = True
+    board_5_by_5[3][2].is_revealed = True
+    board_5_by_5[4][2].is_revealed = True
+    game = MinesweeperGame.from_board(board_5_by_5)
+
+    game.reveal_cell_position(0, 4)
+
+    assert game.changed_positions == {(x_position, y_position) for x_position in range(5) for y_position in (3, 4)}
+
+
+def count_cells_by_scanning_the_board(game):
+    hidden_safe_count = correct_flag_count = flag_count = 0
+    for column in game.board:
+        for cell in column:
+            hidden_safe_count += not cell.has_mine and not cell.is_revealed
+            correct_flag_count += cell.has_mine and cell.is_flagged
+            flag_count += cell.is_flagged
+    return hidden_safe_count, correct_flag_count, flag_count
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_game_counts_match_scanning_the_board_after_every_move(seed):
+    rng = random.Random(seed)
+    columns, rows = rng.randint(1, 12), rng.randint(1, 12)
+    game = MinesweeperGame.new_lazy_game(columns, rows, rng.randint(0, columns * rows // 3), seed=seed)
+    while not game.is_over:
+        x_position, y_position = rng.randrange(columns), rng.randrange(rows)
+        try:
+            if rng.random() < 0.6:
+                game.reveal_cell_position(x_position, y_position)
+            else:
+                game.set_flag_on_cell_position(x_position, y_position, rng.random() < 0.7)
+        except MinesweeperException:
+            pass
+        assert (game.hidden_safe_count, game.correct_flag_count, game.flag_count) == \
+            count_cells_by_scanning_the_board(game)
+        visible_states = [state for column in game.visible_board for state in column]
+        assert game.was_won == (not game.was_lost and HiddenCellState() not in visible_states and
+                                visible_states.count(FlaggedCellState()) == game.mines)
+
+
+def test_game_does_not_count_its_cells_when_given_its_counts(board_5_by_5):
+    board_5_by_5[0][0].has_mine = True
+    cells = MinesweeperGame.from_board(board_5_by_5).cells
+
+    game = MinesweeperGame(5, 5, 1, cells, counts=(1, 0, 0))
+    game.set_flag_on_cell_position(0, 0, is_flagged=True)
+
+    assert (game.hidden_safe_count, game.correct_flag_count, game.flag_count) == (1, 1, 1)
+    assert not game.was_won
+
+
+def test_visible_states_are_shared_immutable_instances():
+    assert HiddenCellState() is HiddenCellState()
+    assert FlaggedCellState() is FlaggedCellState()
+    assert MineCellState() is MineCellState()
+    assert EmptyCellState(3) is EmptyCellState(3)
+    assert EmptyCellState(3) is not EmptyCellState(4)
+    assert len({HiddenCellState(), FlaggedCellState(), MineCellState(), EmptyCellState(0), EmptyCellState(0)}) == 4
+    with pytest.raises(AttributeError):
+        EmptyCellState(3).adjacent_mines = 4
+    with pytest.raises(AttributeError):
+        HiddenCellState().is_revealed = True
+    assert pickle.loads(pickle.dumps(EmptyCellState(2))) is EmptyCellState(2)
+    assert pickle.loads(pickle.dumps(MineCellState())) is MineCellState()
+
+
+def test_visible_board_reuses_the_same_state_instances():
+    game = MinesweeperGame.new_game(20, 20, 40, seed=1)
+    game.reveal_cell_position(*next(
+        divmod(index, game.rows) for index in range(len(game.cells)) if not game.cells[index] & MINE
+    ))
+    visible_states = [state for column in game.visible_board for state in column]
+    assert len({id(state) for state in visible_states}) <= 12
+    assert visible_states == [game.get_cell(*divmod(index, game.rows)).visible_state
+                              for index in range(len(game.cells))]
+
+
+def test_chord_reveals_the_hidden_neighbours_of_a_cell_with_all_its_mines_flagged(board_5_by_5):
+    board_5_by_5[0][0].has_mine = True
+    board_5_by_5[0][4].has_mine = True
+    board_5_by_5[4][4].has_mine = True
+    game = MinesweeperGame.from_board(board_5_by_5)
+    game.reveal_cell_position(1, 1)
+    game.set_flag_on_cell_position(0, 0, is_flagged=True)
+
+    game.chord_cell_position(1, 1)
+
+    assert game.get_cell(0, 0).visible_state == FlaggedCellState()
+    assert game.get_cell(0, 1).visible_state == EmptyCellState(1)
+    assert game.get_cell(2, 2).visible_state == EmptyCellState(0)
+    assert (2, 2) in game.changed_positions and (4, 0) in game.changed_positions
+    assert game.get_cell(0, 4).visible_state == HiddenCellState()
+    assert not game.is_over
+
+
+def test_chord_merges_the_blank_areas_of_the_neighbours_and_wins_in_one_move(board_5_by_5):
+    board_5_by_5[2][0].has_mine = True
+    game = MinesweeperGame.from_board(board_5_by_5)
+    game.reveal_cell_position(2, 1)
+    game.set_flag_on_cell_position(2, 0, is_flagged=True)
+
+    game.chord_cell_position(2, 1)
+
+    assert game.was_won
+    assert len(game.changed_positions) == 23
+    assert game.hidden_safe_count == 0
+
+
+def test_chord_with_a_wrong_flag_reveals_the_mine_and_loses():
+    game = MinesweeperGame(3, 2, 2, bytearray([MINE, 0, 0, 0, 0, MINE]))
+    game.reveal_cell_position(1, 0)
+    game.set_flag_on_cell_position(2, 1, is_flagged=True)
+    game.set_flag_on_cell_position(0, 1, is_flagged=True)
+
+    game.chord_cell_position(1, 0)
+
+    assert game.was_lost
+    assert game.get_cell(0, 0).visible_state == MineCellState()
+    assert game.changed_positions == {(0, 0), (1, 1), (2, 0)}
+
+
+def test_cant_chord_hidden_cells_or_cells_without_their_flags(board_5_by_5):
+    board_5_by_5[0][0].has_mine = True
+    game = MinesweeperGame.from_board(board_5_by_5)
+    with pytest.raises(MinesweeperException) as excinfo:
+        game.chord_cell_position(1, 1)
+    assert str(excinfo.value) == "Can not chord cell, it is not revealed."
+
+    game.reveal_cell_position(1, 1)
+    with pytest.raises(MinesweeperException) as excinfo:
+        game.chord_cell_position(1, 1)
+    assert str(excinfo.value) == "Can not chord cell, the flags around it do not match its adjacent mines."
+    assert game.unsaved_positions == {(1, 1)}
+
+
+def test_visible_board_of_a_board_without_rows_has_empty_columns():
+    assert MinesweeperGame.new_game(5, 0, 0).visible_board == [[], [], [], [], []]
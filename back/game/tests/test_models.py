@@ -0,0 +1,134 @@
+import pytest
+
+from game.board_encoding import decode_board
+from game.minesweeper import MinesweeperGame, FLAGGED
+from game.models import Game
+
+
+def assert_same_board(game, other_game):
+    assert game.get_board_as_json() == other_game.get_board_as_json()
+    assert game.was_won == other_game.was_won
+    assert game.was_lost == other_game.was_lost
+
+
+@pytest.mark.django_db
+def test_moves_are_stored_as_deltas_without_rewriting_the_board(board_5_by_5):
+    board_5_by_5[4][4].add_mine()
+    minesweeper_game = MinesweeperGame.from_board(board_5_by_5)
+    game = Game.objects.create_from_minesweeper_game(minesweeper_game)
+    snapshot = game.board
+
+    minesweeper_game.set_flag_on_cell_position(4, 4, is_flagged=True)
+    game.update_from_minesweeper_game(minesweeper_game)
+    minesweeper_game.reveal_cell_position(0, 0)
+    game.update_from_minesweeper_game(minesweeper_game)
+
+    game.refresh_from_db()
+    assert game.board == snapshot
+    assert game.version == 2
+    assert [move.changes for move in game.moves.all()] == [
+        [[4, 4, False, True]],
+        [[x_position, y_position, True, False]
+         for x_position in range(5) for y_position in range(5) if (x_position, y_position) != (4, 4)],
+    ]
+    assert_same_board(game.to_minesweeper_game(), minesweeper_game)
+    assert game.was_won
+
+
+@pytest.mark.django_db
+def test_moves_that_change_nothing_are_not_stored(board_5_by_5):
+    minesweeper_game = MinesweeperGame.from_board(board_5_by_5)
+    game = Game.objects.create_from_minesweeper_game(minesweeper_game)
+
+    minesweeper_game.set_flag_on_cell_position(1, 1, is_flagged=False)
+    game.update_from_minesweeper_game(minesweeper_game)
+
+    game.refresh_from_db()
+    assert game.version == 0
+    assert not game.moves.exists()
+
+
+@pytest.mark.django_db
+def test_board_snapshot_is_rewritten_every_snapshot_interval_moves(settings, board_5_by_5):
+    settings.MINESWEEPER_SNAPSHOT_INTERVAL = 3
+    board_5_by_5[0][0].add_mine()
+    minesweeper_game = MinesweeperGame.from_board(board_5_by_5)
+    game = Game.objects.create_from_minesweeper_game(minesweeper_game)
+
+    for y_position in range(4):
+        minesweeper_game.set_flag_on_cell_position(4, y_position, is_flagged=True)
+        game.update_from_minesweeper_game(minesweeper_game)
+
+    game.refresh_from_db()
+    assert game.version == 4
+    assert game.snapshot_version == 3
+    assert [move.version for move in game.moves.all()] == [4]
+    assert decode_board(game.board, 25).count(FLAGGED) == 3
+    assert_same_board(game.to_minesweeper_game(), minesweeper_game)
+
+
+@pytest.mark.django_db
+def test_lazy_game_is_stored_without_a_board_until_its_first_reveal():
+    minesweeper_game = MinesweeperGame.new_lazy_game(10, 10, 60, seed=3)
+    game = Game.objects.create_from_minesweeper_game(minesweeper_game)
+
+    minesweeper_game.set_flag_on_cell_position(9, 9, is_flagged=True)
+    game.update_from_minesweeper_game(minesweeper_game)
+    game.refresh_from_db()
+    assert game.board is None
+    assert game.seed == 3
+    assert not game.mines_placed
+    assert_same_board(game.to_minesweeper_game(), minesweeper_game)
+
+    minesweeper_game.reveal_cell_position(0, 0)
+    game.update_from_minesweeper_game(minesweeper_game)
+    game.refresh_from_db()
+    assert game.board is not None
+    assert game.mines_placed
+    assert not game.moves.exists()
+    assert_same_board(game.to_minesweeper_game(), minesweeper_game)
+
+
+@pytest.mark.django_db
+def test_lazy_game_keeps_its_moves_past_the_snapshot_interval_until_its_first_reveal(settings):
+    settings.MINESWEEPER_SNAPSHOT_INTERVAL = 2
+    minesweeper_game = MinesweeperGame.new_lazy_game(10, 10, 60, seed=3)
+    game = Game.objects.create_from_minesweeper_game(minesweeper_game)
+
+    for is_flagged in (True, False, True, True):
+        minesweeper_game.set_flag_on_cell_position(9, 9, is_flagged=is_flagged)
+        game.update_from_minesweeper_game(minesweeper_game)
+    minesweeper_game.set_flag_on_cell_position(8, 9, is_flagged=True)
+    game.update_from_minesweeper_game(minesweeper_game)
+
+    game = Game.objects.get(id=game.id)
+    assert game.board is None
+    assert game.snapshot_version == 0
+    assert game.flag_count == 2
+    assert_same_board(game.to_minesweeper_game(), minesweeper_game)
+    assert game.to_minesweeper_game().flag_count == 2
+
+    minesweeper_game.reveal_cell_position(0, 0)
+    game.update_from_minesweeper_game(minesweeper_game)
+    game = Game.objects.get(id=game.id)
+    assert game.mines_placed
+    assert not game.moves.exists()
+    assert_same_board(game.to_minesweeper_game(), minesweeper_game)
+
+
+@pytest.mark.django_db
+def test_game_counts_are_saved_with_every_move_and_used_when_loading(board_5_by_5):
+    board_5_by_5[0][0].has_mine = True
+    game = Game.objects.create_from_minesweeper_game(MinesweeperGame.from_board(board_5_by_5))
+    assert (game.hidden_safe_count, game.correct_flag_count, game.flag_count) == (24, 0, 0)
+
+    minesweeper_game = game.to_minesweeper_game()
+    minesweeper_game.set_flag_on_cell_position(0, 0, is_flagged=True)
+    minesweeper_game.reveal_cell_position(4, 4)
+    game.update_from_minesweeper_game(minesweeper_game)
+
+    game = Game.objects.get(id=game.id)
+    assert (game.hidden_safe_count, game.correct_flag_count, game.flag_count) == (0, 1, 1)
+    assert game.was_won
+    loaded_game = game.to_minesweeper_game()
+    assert (loaded_game.hidden_safe_count, loaded_game.correct_flag_count, loaded_game.flag_count) == (0, 1, 1)
@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from game.minesweeper import MinesweeperGame, MinesweeperException, REVEALED, FLAGGED  # noqa: E402
+from game.models import Game  # noqa: E402
+from game.numpy_engine import NumpyMinesweeperGame  # noqa: E402
+
+
+def make_move(game, move):
+    """
+    Returns what the move returned or the error it raised, as something both engines can be compared on
+    """
+    try:
+        if move[0] == 'reveal':
+            return str(game.reveal_cell_position(move[1], move[2]))
+        if move[0] == 'chord':
+            return game.chord_cell_position(move[1], move[2])
+        return game.set_flag_on_cell_position(move[1], move[2], move[3])
+    except (MinesweeperException, IndexError) as e:
+        return type(e), str(e)
+
+
+def assert_same_game(game, numpy_game):
+    assert numpy_game.cells == game.cells
+    assert numpy_game.adjacent_mine_counts == game.adjacent_mine_counts
+    assert numpy_game.visible_board == game.visible_board
+    assert numpy_game.get_board_as_json() == game.get_board_as_json()
+    assert (numpy_game.was_won, numpy_game.was_lost) == (game.was_won, game.was_lost)
+    assert ((numpy_game.hidden_safe_count, numpy_game.correct_flag_count, numpy_game.flag_count) ==
+            (game.hidden_safe_count, game.correct_flag_count, game.flag_count))
+
+
+def random_moves(rng, columns, rows):
+    while True:
+        x_position, y_position = rng.randrange(columns), rng.randrange(rows)
+        move_kind = rng.random()
+        if move_kind < 0.55:
+            yield 'reveal', x_position, y_position
+        elif move_kind < 0.7:
+            yield 'chord', x_position, y_position
+        else:
+            yield 'flag', x_position, y_position, rng.random() < 0.8
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_numpy_engine_plays_the_same_random_games_as_the_reference_engine(seed):
+    rng = random.Random(seed)
+    columns, rows = rng.randint(1, 20), rng.randint(1, 20)
+    mines = rng.randint(0, columns * rows // 4)
+    game = MinesweeperGame.new_lazy_game(columns, rows, mines, seed=seed)
+    numpy_game = NumpyMinesweeperGame.new_lazy_game(columns, rows, mines, seed=seed)
+
+    for move, _ in zip(random_moves(rng, columns, rows), range(200)):
+        assert make_move(numpy_game, move) == make_move(game, move)
+        assert numpy_game.changed_positions == game.changed_positions
+        assert_same_game(game, numpy_game)
+        if game.is_over:
+            break
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_numpy_engine_reveals_the_same_cells_on_any_board_state(seed):
+    rng = random.Random(seed)
+    columns, rows = rng.randint(1, 15), rng.randint(1, 15)
+    cells = bytearray(rng.choice([0, 0, 0, 1, REVEALED, FLAGGED, 1 | FLAGGED]) for _ in range(columns * rows))
+    mines = sum(cell & 1 for cell in cells)
+    assert_same_game(MinesweeperGame(columns, rows, mines, bytearray(cells)),
+                     NumpyMinesweeperGame(columns, rows, mines, bytearray(cells)))
+
+    for x_position in range(columns):
+        for y_position in range(rows):
+            game = MinesweeperGame(columns, rows, mines, bytearray(cells))
+            numpy_game = NumpyMinesweeperGame(columns, rows, mines, bytearray(cells))
+            move = ('reveal', x_position, y_position)
+            assert make_move(numpy_game, move) == make_move(game, move)
+            assert numpy_game.changed_positions == game.changed_positions
+            assert_same_game(game, numpy_game)
+
+
+def test_numpy_engine_builds_the_same_game_from_a_board(board_5_by_5):
+    board_5_by_5[0][0].has_mine = True
+    board_5_by_5[3][2].has_mine = True
+    board_5_by_5[4][4].is_flagged = True
+    assert_same_game(MinesweeperGame.from_board(board_5_by_5), NumpyMinesweeperGame.from_board(board_5_by_5))
+
+
+@pytest.mark.django_db
+def test_games_are_played_with_the_engine_set_in_the_settings(settings):
+    settings.MINESWEEPER_ENGINE = 'game.numpy_engine.NumpyMinesweeperGame'
+    game = Game.objects.create_from_minesweeper_game(NumpyMinesweeperGame.new_game(10, 10, 10, seed=3))
+    minesweeper_game = Game.objects.get(id=game.id).to_minesweeper_game()
+    assert isinstance(minesweeper_game, NumpyMinesweeperGame)
+    assert minesweeper_game.cells == MinesweeperGame.new_game(10, 10, 10, seed=3).cells
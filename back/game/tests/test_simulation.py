@@ -0,0 +1,81 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from game.simulation import RANDOM, SOLVER, SizeResult, play_chunk
+
+ENGINE = 'game.minesweeper.MinesweeperGame'
+
+
+@pytest.mark.parametrize('policy', [RANDOM, SOLVER])
+def test_chunks_play_the_same_games_for_the_same_seed(policy):
+    games, wins, moves, latencies = play_chunk(ENGINE, 9, 9, 10, policy, range(20), 7)
+
+    assert games == 20
+    assert moves >= 20
+    assert sum(latencies.values()) == moves
+    assert (wins, moves) == play_chunk(ENGINE, 9, 9, 10, policy, range(20), 7)[1:3]
+
+
+def test_the_solver_wins_more_games_than_random_moves():
+    assert play_chunk(ENGINE, 9, 9, 10, SOLVER, range(50), 0)[1] > play_chunk(ENGINE, 9, 9, 10, RANDOM, range(50), 0)[1]
+
+
+def test_random_moves_win_by_flagging_the_last_hidden_cells():
+    games, wins, moves, _ = play_chunk(ENGINE, 3, 3, 1, RANDOM, range(20), 0)
+
+    assert 0 < wins < games
+
+
+def test_latency_percentiles_come_from_the_merged_histograms():
+    result = SizeResult(9, 9, 10)
+    result.add_chunk(2, 1, 3, {100: 2, 200: 1})
+    result.add_chunk(1, 0, 1, {300: 1})
+
+    assert (result.games, result.wins, result.moves) == (3, 1, 4)
+    assert result.get_latency_percentile(50) == pytest.approx(1.02 ** 100 / 1000)
+    assert result.get_latency_percentile(99) == pytest.approx(1.02 ** 300 / 1000)
+
+
+def test_simulate_writes_the_results_and_fails_when_slower_than_the_baseline(tmp_path):
+    output = tmp_path / 'run.json'
+    call_command('simulate', '--size', '9x9x10', '--size', '5x5x3', '--games', '40', '--chunk-size', '10',
+                 '--workers', '2', '--output', str(output), stdout=StringIO())
+
+    run = json.loads(output.read_text())
+    assert run['policy'] == RANDOM
+    assert [(result['columns'], result['games']) for result in run['results']] == [(9, 40), (5, 40)]
+    assert all(result['moves_per_second'] > 0 for result in run['results'])
+
+    for result in run['results']:
+        result['moves_per_second'] *= 100
+    baseline = tmp_path / 'baseline.json'
+    baseline.write_text(json.dumps(run))
+    with pytest.raises(CommandError, match='9x9x10, 5x5x3'):
+        call_command('simulate', '--size', '9x9x10', '--size', '5x5x3', '--games', '40', '--workers', '1',
+                     '--compare', str(baseline), stdout=StringIO())
+
+
+def test_simulate_refuses_a_baseline_of_another_policy(tmp_path):
+    baseline = tmp_path / 'baseline.json'
+    call_command('simulate', '--size', '5x5x3', '--games', '10', '--workers', '1', '--output', str(baseline),
+                 stdout=StringIO())
+
+    with pytest.raises(CommandError, match='policy random, not solver'):
+        call_command('simulate', '--size', '5x5x3', '--games', '10', '--workers', '1', '--policy', SOLVER,
+                     '--compare', str(baseline), stdout=StringIO())
+
+
+def test_simulate_reports_sizes_without_games(tmp_path):
+    output = tmp_path / 'run.json'
+    stdout = StringIO()
+    call_command('simulate', '--size', '5x5x3', '--games', '0', '--workers', '1', '--output', str(output),
+                 stdout=stdout)
+
+    assert '5x5x3' in stdout.getvalue()
+    assert json.loads(output.read_text())['results'][0]['win_rate'] is None
+    call_command('simulate', '--size', '5x5x3', '--games', '0', '--workers', '1', '--compare', str(output),
+                 stdout=StringIO())
@@ -0,0 +1,136 @@
+import itertools
+import random
+
+import pytest
+
+from game import solver
+from game.minesweeper import MinesweeperGame, MINE, HIDDEN_STATE
+from game.solver import solve, solve_game
+
+
+@pytest.fixture(autouse=True)
+def empty_solved_components():
+    solver._solved_components.clear()
+
+
+def test_finds_mines_and_safe_cells_combining_constraints():
+    # 1 2 1 over three hidden cells: the middle one is safe and the others are mines
+    game = MinesweeperGame(3, 2, 2, bytearray([0, MINE, 0, 0, 0, MINE]))
+    for x_position in range(3):
+        game.reveal_cell_position(x_position, 0)
+
+    hint = solve_game(game)
+
+    assert hint.safe_cells == [(1, 1)]
+    assert hint.mines == [(0, 1), (2, 1)]
+    assert hint.probabilities == {}
+    assert hint.best_guess == ((1, 1), 0.0)
+    assert hint.complete
+
+
+def test_gives_the_probabilities_of_cells_that_can_not_be_told_apart():
+    game = MinesweeperGame(2, 2, 1, bytearray([0, MINE, 0, 0]))
+    game.reveal_cell_position(0, 0)
+    game.reveal_cell_position(1, 0)
+
+    hint = solve_game(game)
+
+    assert hint.safe_cells == []
+    assert hint.mines == []
+    assert hint.probabilities == {(0, 1): 0.5, (1, 1): 0.5}
+    assert hint.best_guess == ((0, 1), 0.5)
+
+
+def test_takes_flags_as_mines():
+    game = MinesweeperGame(3, 2, 2, bytearray([0, MINE, 0, 0, 0, MINE]))
+    game.reveal_cell_position(0, 0)
+    game.set_flag_on_cell_position(0, 1, True)
+
+    hint = solve_game(game)
+
+    assert hint.safe_cells == [(1, 0), (1, 1)]
+    assert hint.mines == []
+
+
+def test_weighs_the_arrangements_by_the_mines_left():
+    # The numbers leave the mine either in the middle hidden cell or in both of the others,
+    # but only one mine is left
+    game = MinesweeperGame(3, 2, 2, bytearray([0, 0, MINE, MINE, 0, 0]))
+    game.reveal_cell_position(0, 0)
+    game.reveal_cell_position(2, 0)
+    game.set_flag_on_cell_position(1, 0, True)
+
+    hint = solve_game(game)
+
+    assert hint.safe_cells == [(0, 1), (2, 1)]
+    assert hint.mines == [(1, 1)]
+    assert hint.probabilities == {}
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_probabilities_are_the_share_of_the_mine_placements_that_match_the_board(seed):
+    rng = random.Random(seed)
+    game = MinesweeperGame.new_lazy_game(5, 4, 5, seed=seed)
+    game.reveal_cell_position(rng.randrange(5), rng.randrange(4))
+    visible_board = game.visible_board
+    hidden = [(x, y) for x in range(5) for y in range(4) if visible_board[x][y] is HIDDEN_STATE]
+    placements = []
+    for mines in itertools.combinations(hidden, game.mines):
+        mines = set(mines)
+        if all(state is HIDDEN_STATE or state.adjacent_mines == sum(
+                (x + dx, y + dy) in mines for dx in (-1, 0, 1) for dy in (-1, 0, 1))
+               for x, column in enumerate(visible_board) for y, state in enumerate(column)):
+            placements.append(mines)
+
+    hint = solve(visible_board, game.mines)
+
+    for cell in hidden:
+        share = sum(cell in mines for mines in placements) / len(placements)
+        if cell in hint.safe_cells:
+            assert share == 0
+        elif cell in hint.mines:
+            assert share == 1
+        elif cell in hint.probabilities:
+            assert hint.probabilities[cell] == pytest.approx(share)
+    assert hint.best_guess[1] == pytest.approx(min(
+        sum(cell in mines for mines in placements) / len(placements) for cell in hidden))
+
+
+def test_first_reveal_of_lazy_games_is_a_safe_guess():
+    game = MinesweeperGame.new_lazy_game(9, 7, 10, seed=1)
+    assert solve_game(game).best_guess == ((4, 3), 0.0)
+
+
+def test_running_out_of_time_leaves_the_hint_incomplete():
+    game = MinesweeperGame(2, 2, 1, bytearray([0, MINE, 0, 0]))
+    game.reveal_cell_position(0, 0)
+    game.reveal_cell_position(1, 0)
+
+    hint = solve(game.visible_board, game.mines, time_budget=0)
+
+    assert not hint.complete
+    assert hint.probabilities == {}
+    assert hint.best_guess == ((0, 1), 0.5)
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_hints_are_never_wrong(seed):
+    rng = random.Random(seed)
+    columns, rows = rng.randint(5, 16), rng.randint(5, 16)
+    game = MinesweeperGame.new_lazy_game(columns, rows, columns * rows // 6, seed=seed)
+    game.reveal_cell_position(rng.randrange(columns), rng.randrange(rows))
+
+    while not game.is_over:
+        hint = solve_game(game)
+        for x_position, y_position in hint.mines:
+            assert game.cells[x_position * rows + y_position] & MINE
+        for x_position, y_position in hint.safe_cells:
+            assert not game.cells[x_position * rows + y_position] & MINE
+        assert all(0 < probability < 1 for probability in hint.probabilities.values())
+        for x_position, y_position in hint.mines:
+            game.set_flag_on_cell_position(x_position, y_position, True)
+        if hint.mines and not hint.safe_cells:
+            continue
+        for x_position, y_position in hint.safe_cells or [hint.best_guess[0]]:
+            if not game.is_over:
+                game.reveal_cell_position(x_position, y_position)
@@ -0,0 +1,92 @@
+import asyncio
+import json
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from rest_framework.test import APIClient
+
+from game.minesweeper import MinesweeperGame
+from game.models import Game
+from game.pubsub import InMemoryPubSub, pubsub, game_channel
+from game.websocket import NOT_FOUND
+from minesweeper.asgi import application
+
+
+class WebsocketConnection:
+    def __init__(self, path):
+        self.incoming = asyncio.Queue()
+        self.outgoing = asyncio.Queue()
+        self.task = asyncio.ensure_future(application({'type': 'websocket', 'path': path},
+                                                      self.incoming.get, self.outgoing.put))
+
+    async def connect(self):
+        await self.incoming.put({'type': 'websocket.connect'})
+        return await asyncio.wait_for(self.outgoing.get(), 5)
+
+    async def receive_json(self):
+        message = await asyncio.wait_for(self.outgoing.get(), 5)
+        return json.loads(message['text'])
+
+    async def disconnect(self):
+        await self.incoming.put({'type': 'websocket.disconnect', 'code': 1000})
+        await asyncio.wait_for(self.task, 5)
+
+
+def flag_cell(game_id, x_position, y_position):
+    return APIClient().post(f'/api/minesweeper/{game_id}/flag_cell/',
+                            {'x_position': x_position, 'y_position': y_position, 'is_flagged': True}, format='json')
+
+
+@pytest.mark.django_db(transaction=True)
+def test_subscribers_get_the_changed_cells_of_each_move(board_5_by_5):
+    board_5_by_5[4][4].has_mine = True
+    game = Game.objects.create_from_minesweeper_game(MinesweeperGame.from_board(board_5_by_5))
+
+    @async_to_sync
+    async def play():
+        connection = WebsocketConnection(f'/ws/minesweeper/{game.id}/')
+        assert await connection.connect() == {'type': 'websocket.accept'}
+
+        await sync_to_async(flag_cell)(game.id, 4, 4)
+        first_changes = await connection.receive_json()
+        await sync_to_async(APIClient().post)(f'/api/minesweeper/{game.id}/reveal_cell/',
+                                              {'x_position': 0, 'y_position': 0}, format='json')
+        second_changes = await connection.receive_json()
+
+        await connection.disconnect()
+        return first_changes, second_changes
+
+    first_changes, second_changes = play()
+    assert first_changes == {'id': game.id, 'was_lost': False, 'was_won': False, 'is_over': False, 'version': 1,
+                             'changed_cells': [{'x_position': 4, 'y_position': 4, 'state': 'flag'}]}
+    assert second_changes['version'] == 2
+    assert second_changes['was_won']
+    assert len(second_changes['changed_cells']) == 24
+    assert pubsub.subscriber_count(game_channel(game.id)) == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_connections_to_missing_games_are_closed():
+    @async_to_sync
+    async def connect():
+        return await WebsocketConnection('/ws/minesweeper/1234/').connect()
+
+    assert connect() == {'type': 'websocket.close', 'code': NOT_FOUND}
+
+
+def test_in_memory_pubsub_only_delivers_to_the_subscribers_of_the_channel():
+    in_memory_pubsub = InMemoryPubSub()
+
+    @async_to_sync
+    async def publish():
+        queue = in_memory_pubsub.subscribe('game-1')
+        other_queue = in_memory_pubsub.subscribe('game-2')
+        await sync_to_async(in_memory_pubsub.publish)('game-1', {'version': 1})
+        message = await asyncio.wait_for(queue.get(), 5)
+        in_memory_pubsub.unsubscribe('game-1', queue)
+        in_memory_pubsub.publish('game-1', {'version': 2})
+        return message, other_queue.empty()
+
+    assert publish() == ({'version': 1}, True)
+    assert in_memory_pubsub.subscriber_count('game-1') == 0
+    assert in_memory_pubsub.subscriber_count('game-2') == 1
@@ -1,53 +1,227 @@
-from rest_framework import viewsets, mixins
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework import viewsets, mixins, status
 from rest_framework.decorators import action
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import ValidationError, APIException
 from rest_framework.response import Response
 
+from game.board_pool import get_pool_stats
+from game.cache import game_cache
 from game.minesweeper import MinesweeperException
-from game.models import Game
-from game.serializers import GameSerializer
+from game.models import Game, GameVersionConflict
+from game.pagination import GameCursorPagination
+from game.serializers import GameSerializer, GameSummarySerializer, GameChangesSerializer, GameMovesSerializer, \
+    MovesSerializer, MoveSerializer, HintSerializer, serialize_changed_cells
+from game.solver import solve_game
+from game.streaming import stream_game_json
+
+
+class Conflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'The game was changed by another request, try again.'
+    default_code = 'conflict'
+
+
+def apply_move(minesweeper_game, move):
+    """
+    Makes a move validated by MoveSerializer
+    """
+    if move['type'] == MoveSerializer.REVEAL:
+        minesweeper_game.reveal_cell_position(move['x_position'], move['y_position'])
+    elif move['type'] == MoveSerializer.CHORD:
+        minesweeper_game.chord_cell_position(move['x_position'], move['y_position'])
+    else:
+        minesweeper_game.set_flag_on_cell_position(move['x_position'], move['y_position'], move['is_flagged'])
 
 
 class MinesweeperGameViewSet(mixins.CreateModelMixin,
                              mixins.RetrieveModelMixin,
                              mixins.ListModelMixin,
                              viewsets.GenericViewSet):
-    queryset = Game.objects.all()
+    queryset = Game.objects.defer('board')
     serializer_class = GameSerializer
+    pagination_class = GameCursorPagination
 
-    @action(detail=True, methods=['post'])
-    def flag_cell(self, request, *args, **kwargs):
-        x_position = request.data.get('x_position')
-        y_position = request.data.get('y_position')
-        is_flagged = request.data.get('is_flagged')
-        if x_position is None or y_position is None or is_flagged is None:
-            raise ValidationError('x_position, y_position and is_flagged are required fields')
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            game_status = self.request.query_params.get('status')
+            if game_status is not None:
+                if game_status not in Game.STATUSES:
+                    raise ValidationError(f"status must be one of {', '.join(Game.STATUSES)}")
+                queryset = queryset.with_status(game_status)
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action == 'list' and self.request.query_params.get('include_board') != 'true':
+            return GameSummarySerializer
+        return super().get_serializer_class()
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action in ('reveal_cell', 'flag_cell', 'chord_cell'):
+            context['region'] = self._get_region()
+        return context
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Boards with more than MINESWEEPER_STREAMED_BOARD_CELLS cells are streamed column by column
+        """
         instance = self.get_object()
-        minesweeper_game = instance.to_minesweeper_game()
+        if instance.columns * instance.rows <= settings.MINESWEEPER_STREAMED_BOARD_CELLS:
+            return Response(self.get_serializer(instance).data)
+        return StreamingHttpResponse(stream_game_json(instance), content_type='application/json')
+
+    def _get_region(self):
+        """
+        Region of the board given by the x0, y0, w and h query params, if any
+        """
+        params = self.request.query_params
+        if not any(name in params for name in ('x0', 'y0', 'w', 'h')):
+            return None
         try:
-            minesweeper_game.set_flag_on_cell_position(x_position, y_position, is_flagged)
-        except MinesweeperException as e:
-            raise ValidationError(e)
+            region = tuple(int(params[name]) for name in ('x0', 'y0', 'w', 'h'))
+        except (KeyError, ValueError):
+            raise ValidationError('x0, y0, w and h must all be given as integers')
+        if region[0] < 0 or region[1] < 0 or region[2] <= 0 or region[3] <= 0:
+            raise ValidationError('x0 and y0 can not be negative and w and h must be positive')
+        return region
+
+    def _region_response(self, data, region):
+        if region is not None:
+            data = dict(data, region=dict(zip(('x0', 'y0', 'w', 'h'), region)))
+        return Response(data)
+
+    def _get_response_mode(self):
+        response_mode = self.request.query_params.get('response', 'game')
+        if response_mode not in ('game', 'changes'):
+            raise ValidationError('response must be game or changes')
+        return response_mode
+
+    def _get_move(self, move_type):
+        """
+        Move of the request body, validated by MoveSerializer
+        """
+        if not isinstance(self.request.data, dict):
+            raise ValidationError('The move must be given as an object')
+        move_serializer = MoveSerializer(data={**self.request.data, 'type': move_type})
+        move_serializer.is_valid(raise_exception=True)
+        return move_serializer.validated_data
+
+    def _make_move(self, instance, move):
+        try:
+            return instance.make_move(move, settings.MINESWEEPER_MOVE_RETRIES)
+        except GameVersionConflict:
+            raise Conflict()
+
+    def _make_single_move(self, move_type):
+        """
+        Makes the move of the request body and answers with _move_response
+        """
+        move = self._get_move(move_type)
+        response_mode = self._get_response_mode()
+        instance = self.get_object()
+
+        def make_move(minesweeper_game):
+            try:
+                apply_move(minesweeper_game, move)
+            except (MinesweeperException, IndexError) as e:
+                raise ValidationError(e)
+            return minesweeper_game.get_changed_cells()
+
+        changed_cells = self._make_move(instance, make_move)
+        return self._move_response(instance, changed_cells, response_mode)
 
-        instance.update_from_minesweeper_game(minesweeper_game)
+    def _move_response(self, instance, changed_cells, response_mode):
+        """
+        Answers with the game, or only with the cells changed by the move when
+        the `response=changes` query param is given
+        """
+        if response_mode == 'changes':
+            return Response(GameChangesSerializer(instance, context={'changed_cells': changed_cells}).data)
         serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        return self._region_response(serializer.data, serializer.context['region'])
+
+    @action(detail=True, methods=['get'])
+    def board_region(self, request, *args, **kwargs):
+        region = self._get_region()
+        if region is None:
+            raise ValidationError('x0, y0, w and h are required query params')
+        instance = self.get_object()
+        return self._region_response({'id': instance.id, 'board': instance.get_visible_region(*region)}, region)
+
+    @action(detail=False, methods=['get'])
+    def cache_stats(self, request, *args, **kwargs):
+        return Response(game_cache.stats())
+
+    @action(detail=False, methods=['get'])
+    def board_pool_stats(self, request, *args, **kwargs):
+        return Response(get_pool_stats())
+
+    @action(detail=True, methods=['get'])
+    def hint(self, request, *args, **kwargs):
+        """
+        Safe cells, mines and mine probabilities that can be told from the visible board.
+        The time_budget query param, in seconds, can lower MINESWEEPER_HINT_TIME_BUDGET.
+        """
+        time_budget = settings.MINESWEEPER_HINT_TIME_BUDGET
+        if 'time_budget' in request.query_params:
+            try:
+                requested_time_budget = float(request.query_params['time_budget'])
+            except ValueError:
+                raise ValidationError('time_budget must be a number')
+            if not requested_time_budget > 0:
+                raise ValidationError('time_budget must be positive')
+            time_budget = min(time_budget, requested_time_budget)
+
+        instance = self.get_object()
+        if instance.was_won or instance.was_lost:
+            raise ValidationError('Can not give a hint, the game is over.')
+        minesweeper_game = instance.load_minesweeper_game()
+        hint = solve_game(minesweeper_game, time_budget)
+        game_cache.put(instance.id, instance.version, minesweeper_game)
+        return Response(HintSerializer(hint).data)
+
+    @action(detail=True, methods=['post'])
+    def chord_cell(self, request, *args, **kwargs):
+        """
+        Reveals the hidden neighbours of a revealed cell that has as many flags around it as adjacent mines
+        """
+        return self._make_single_move(MoveSerializer.CHORD)
+
+    @action(detail=True, methods=['post'])
+    def flag_cell(self, request, *args, **kwargs):
+        return self._make_single_move(MoveSerializer.FLAG)
 
     @action(detail=True, methods=['post'])
     def reveal_cell(self, request, *args, **kwargs):
-        x_position = request.data.get('x_position')
-        y_position = request.data.get('y_position')
-        if x_position is None or y_position is None:
-            raise ValidationError('x_position and y_position are required fields')
+        return self._make_single_move(MoveSerializer.REVEAL)
+
+    @action(detail=True, methods=['post'])
+    def moves(self, request, *args, **kwargs):
+        """
+        Applies an ordered list of moves and saves the game once. Moves that can not be made
+        are reported with their error, and no more moves are made once the game is over.
+        """
+        moves_serializer = MovesSerializer(data=request.data)
+        moves_serializer.is_valid(raise_exception=True)
 
         instance = self.get_object()
-        minesweeper_game = instance.to_minesweeper_game()
-        try:
-            minesweeper_game.reveal_cell_position(x_position, y_position)
-        except MinesweeperException as e:
-            raise ValidationError(e)
 
-        instance.update_from_minesweeper_game(minesweeper_game)
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        def make_moves(minesweeper_game):
+            results = []
+            for move in moves_serializer.validated_data['moves']:
+                if minesweeper_game.is_over:
+                    break
+                result = dict(move)
+                try:
+                    apply_move(minesweeper_game, move)
+                except (MinesweeperException, IndexError) as e:
+                    result['error'] = str(e)
+                else:
+                    result['changed_cells'] = serialize_changed_cells(minesweeper_game.get_changed_cells())
+                results.append(result)
+            return results
+
+        results = self._make_move(instance, make_moves)
+        return Response(GameMovesSerializer(instance, context={'results': results}).data)
@@ -0,0 +1,55 @@
+"""
+ASGI websocket application that pushes the changes of a game to its subscribers.
+
+Clients connect to /ws/minesweeper/<game id>/ and get a JSON text message with the game status,
+its version and the changed cells (as in `response=changes` move responses) after every saved move.
+Messages sent by the clients are ignored.
+"""
+import asyncio
+import json
+import re
+
+from game.async_views import run_in_worker
+from game.models import Game
+from game.pubsub import pubsub, game_channel
+
+GAME_PATH = re.compile(r'^/ws/minesweeper/(?P<pk>\d+)/?$')
+
+# Close codes of the connections that are refused, in the 4000-4999 range left to applications
+NOT_FOUND = 4404
+
+
+async def application(scope, receive, send):
+    message = await receive()
+    if message['type'] != 'websocket.connect':
+        return
+    match = GAME_PATH.match(scope['path'])
+    if match is None or not await run_in_worker(Game.objects.filter(id=int(match['pk'])).exists):
+        await send({'type': 'websocket.close', 'code': NOT_FOUND})
+        return
+
+    channel = game_channel(int(match['pk']))
+    queue = pubsub.subscribe(channel)
+    try:
+        await send({'type': 'websocket.accept'})
+        await _push_changes(receive, send, queue)
+    finally:
+        pubsub.unsubscribe(channel, queue)
+
+
+async def _push_changes(receive, send, queue):
+    client_message = asyncio.ensure_future(receive())
+    changes = asyncio.ensure_future(queue.get())
+    try:
+        while True:
+            await asyncio.wait({client_message, changes}, return_when=asyncio.FIRST_COMPLETED)
+            if client_message.done():
+                if client_message.result()['type'] == 'websocket.disconnect':
+                    return
+                client_message = asyncio.ensure_future(receive())
+            if changes.done():
+                await send({'type': 'websocket.send', 'text': json.dumps(changes.result())})
+                changes = asyncio.ensure_future(queue.get())
+    finally:
+        client_message.cancel()
+        changes.cancel()
@@ -2,6 +2,7 @@
 ASGI config for minesweeper project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Websocket connections are served by game.websocket, everything else by Django.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/3.1/howto/deployment/asgi/
@@ -13,4 +14,14 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'minesweeper.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported once get_asgi_application has loaded the apps
+from game import websocket  # noqa: E402
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'websocket':
+        await websocket.application(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
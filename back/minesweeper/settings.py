@@ -39,7 +39,7 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'rest_framework',
     'corsheaders',
-    'game'
+    'game.apps.GameConfig',
 ]
 
 MIDDLEWARE = [
@@ -84,6 +84,10 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # A file instead of the default in-memory database, so tests can write from several threads
+        'TEST': {
+            'NAME': BASE_DIR / 'test_db.sqlite3',
+        },
     }
 }
 
@@ -125,3 +129,50 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/3.1/howto/static-files/
 
 STATIC_URL = '/static/'
+
+
+# Minesweeper
+
+# Class that plays the games, 'game.numpy_engine.NumpyMinesweeperGame' does the board work with NumPy
+# (needs the numpy package)
+MINESWEEPER_ENGINE = 'game.minesweeper.MinesweeperGame'
+
+# Moves are stored as deltas and the whole board is rewritten every this many moves
+MINESWEEPER_SNAPSHOT_INTERVAL = 50
+
+# Compression of the stored boards: None, 'zlib' or 'lz4' (needs the lz4 package)
+MINESWEEPER_BOARD_COMPRESSION = 'zlib'
+
+# Times a move is made again when another request changed the game first, before answering 409
+MINESWEEPER_MOVE_RETRIES = 3
+
+# Threads that run the queries and moves of the async endpoints served with ASGI
+MINESWEEPER_ASYNC_WORKERS = 8
+
+# Backend that delivers the changes of each move to the websocket subscribers of the game
+MINESWEEPER_PUBSUB_BACKEND = 'game.pubsub.InMemoryPubSub'
+
+# New games place their mines on the first reveal, which is always safe
+MINESWEEPER_LAZY_BOARDS = True
+
+# Games with more cells than this are sent column by column by the retrieve endpoint, without building
+# the whole board in memory
+MINESWEEPER_STREAMED_BOARD_CELLS = 250_000
+
+# Seconds the hint endpoint can spend solving a game, requests can ask for less with the time_budget param
+MINESWEEPER_HINT_TIME_BUDGET = 1.0
+
+# No-guess boards kept ready for new games of each (columns, rows, mines), filled by
+# `manage.py fill_board_pool` in WORKERS processes (the number of CPUs when None)
+MINESWEEPER_BOARD_POOL = {
+    'SIZES': [(9, 9, 10), (16, 16, 40), (30, 16, 99)],
+    'DEPTH': 100,
+    'WORKERS': None,
+    'MAX_ATTEMPTS': 1000,
+}
+
+# Hydrated games kept in memory by each process, bounded by their total number of cells
+MINESWEEPER_GAME_CACHE = {
+    'MAX_CELLS': 10_000_000,
+    'TTL': 300,
+}
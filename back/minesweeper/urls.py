@@ -3,6 +3,7 @@ from django.views.generic import TemplateView
 from rest_framework import routers
 from rest_framework.schemas import get_schema_view
 
+from game import async_views
 from game.views import MinesweeperGameViewSet
 
 router = routers.DefaultRouter()
@@ -10,6 +11,10 @@ router.register(r'minesweeper', MinesweeperGameViewSet, basename='minesweeper')
 
 urlpatterns = [
     path('api/', include(router.urls)),
+    path('api/async/minesweeper/', async_views.games),
+    path('api/async/minesweeper/<int:pk>/', async_views.game_detail),
+    path('api/async/minesweeper/<int:pk>/reveal_cell/', async_views.reveal_cell),
+    path('api/async/minesweeper/<int:pk>/flag_cell/', async_views.flag_cell),
     path('openapi/', get_schema_view(
         title="Your Project",
         description="API for all things …",
@@ -2,6 +2,7 @@ import axios from "axios";
 
 const base_url = 'http://localhost:8000/'
 const api_url = `${base_url}api/minesweeper/`
+const ws_url = `${base_url.replace(/^http/, 'ws')}ws/minesweeper/`
 
 export default {
     new_game(rows, columns, mines) {
@@ -10,7 +11,7 @@ export default {
     },
     list() {
       return axios.get(api_url)
-                  .then(response => response.data)
+                  .then(response => response.data.results)
     },
     retrieve(game_id) {
         return axios.get(`${api_url}${game_id}`)
@@ -24,4 +25,13 @@ export default {
         return axios.post(`${api_url}${game_id}/flag_cell/`, {x_position, y_position, is_flagged })
                     .then(response => response.data);
     },
+    chord_cell(game_id, x_position, y_position) {
+        return axios.post(`${api_url}${game_id}/chord_cell/`, {x_position, y_position })
+                    .then(response => response.data);
+    },
+    subscribe(game_id, on_changes) {
+        const socket = new WebSocket(`${ws_url}${game_id}/`);
+        socket.onmessage = event => on_changes(JSON.parse(event.data));
+        return socket;
+    },
 }